@@ -179,16 +179,26 @@ export default function WorkerForceGraph({
         const width = containerRef.current?.clientWidth || 800;
         const height = containerRef.current?.clientHeight || 600;
 
-        // 准备Worker数据
+        // 准备Worker数据：连接度优先用离线预计算的 metrics，缺失时一次遍历统计
+        let fallbackDegree: Map<number, number> | null = null;
+        const degreeOf = (node: Executive) => {
+          if (node.metrics) return node.metrics.degree.total;
+          if (!fallbackDegree) {
+            fallbackDegree = new Map();
+            for (const l of data.links) {
+              const sid = typeof l.source === "object" ? l.source.id : l.source;
+              const tid = typeof l.target === "object" ? l.target.id : l.target;
+              fallbackDegree.set(sid, (fallbackDegree.get(sid) || 0) + 1);
+              fallbackDegree.set(tid, (fallbackDegree.get(tid) || 0) + 1);
+            }
+          }
+          return fallbackDegree.get(node.id) || 0;
+        };
         const workerNodes: WorkerNode[] = nodes.map(node => ({
           id: node.id,
           x: Math.random() * width,
           y: Math.random() * height,
-          degree: data.links.filter(l => {
-            const sid = typeof l.source === "object" ? l.source.id : l.source;
-            const tid = typeof l.target === "object" ? l.target.id : l.target;
-            return sid === node.id || tid === node.id;
-          }).length
+          degree: degreeOf(node)
         }));
 
         const workerLinks: WorkerLink[] = links.map(link => ({
@@ -24,6 +24,13 @@ export interface BoardRole {
   is_current: boolean;
 }
 
+export interface GraphMetrics {
+  degree: { total: number } & Partial<Record<RelType, number>>;
+  component: number; // 连通分量编号，0 为最大分量
+  pagerank: number;  // 加权 PageRank × 节点数（均值为 1）
+  community: number; // 标签传播社区编号
+}
+
 export interface Executive {
   id: number;
   name: string;
@@ -32,6 +39,8 @@ export interface Executive {
   region: Region;
   website: string;
   bio: string;
+  // 同一人在多家公司的节点共用 person_id（scripts/resolve_persons.py）
+  person_id?: number | null;
   extracted: {
     schools: string[];
     former_companies: string[];
@@ -44,6 +53,8 @@ export interface Executive {
   qualifications?: string[];
   board_roles?: BoardRole[];
   industry_roles?: string[];
+  // 离线图指标（mine_relationships.py 计算，见 scripts/mining/analytics.py）
+  metrics?: GraphMetrics;
   // runtime fields added after data load
   degree?: number;
   x?: number;
@@ -62,6 +73,29 @@ export interface Relationship {
   label: string;
 }
 
+// 分组成员关系（超边，public/data/groups.json）：members 的两两配对即该分组的高管对
+export interface MembershipGroup {
+  id: number;
+  type: Exclude<RelType, "successor">;
+  label: string;
+  members: number[];
+}
+
+// 公司级聚合图（public/data/company_graph.json，scripts/mining/supergraph.py 生成）：
+// 先渲染公司节点，放大时按 members 展开为人员；边为稀疏 COO 三元组
+export interface SparseEdges {
+  src: number[];
+  dst: number[];
+  weight: number[];
+}
+
+export interface CompanyGraph {
+  companies: { name: string; region: Region | null; members: number[] }[];
+  talent_flow: SparseEdges; // 有向：src → dst 的人才流动人数
+  alumni: SparseEdges;      // 无向（src < dst）：同校高管对数
+  regulator: SparseEdges;   // 无向：同监管背景高管对数
+}
+
 export interface GraphData {
   nodes: Executive[];
   links: Relationship[];
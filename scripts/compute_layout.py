@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+compute_layout.py — 离线力导向布局（管道中 mine 之后的 layout 阶段）
+
+浏览器端从随机位置开始跑力导向模拟，低端设备上要几秒才稳定。这里离线算好坐标，
+前端可以此为初始位置渲染，只需短暂微调。读取 mine_relationships.py 的输出，生成：
+  - ../public/data/layout.json               全图布局
+  - ../public/data/regions/layout.{CN,HK,SG}.json  各地区子图（地区内的边）单独布局
+格式 {"ids": [...], "x": [...], "y": [...]}（紧凑 JSON，另有 .gz / .br 预压缩副本）。
+  - ../public/data/layout.manifest.json     上述各文件的大小、压缩后大小、sha256、节点数，
+                                             结构同 regions/manifest.json 的 files（键为相对 data 目录的路径）
+
+力模型（Fruchterman-Reingold）：
+  斥力   任意两点之间 k² / d
+  引力   每条边 strength × d² / k
+  向心力 -GRAVITY × 位置（避免不连通的分量飘散）
+每轮位移不超过当前「温度」，温度线性冷却。初始位置由固定种子生成，结果可复现。
+
+斥力用网格化的 Barnes-Hut 近似（全部 numpy 向量化）：
+  第 l 层把包围盒切成 2^l × 2^l 个格子，按 bincount 汇总每格质量和质心；
+  对每个点，父格相邻、自身格不相邻的格子（最多 27 个）按质心整体计算，
+  最细一层自身格及相邻格内的点逐对精确计算。每对点恰好被计入一次，
+  每轮 O(n log n)。
+
+坐标以原点为中心，缩放到中位边长 ≈ EDGE_LENGTH（与前端 forceLink 的 distance 一致）。
+
+使用：
+    python3 scripts/compute_layout.py [--seed 42] [--iterations 300]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖：pip install numpy
+    np = None
+
+from mining.artifacts import REGIONS, compact_json, split_by_region, write_precompressed
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR   = os.path.join(SCRIPT_DIR, "..", "public", "data")
+
+ITERATIONS = 300
+GRAVITY = 0.05
+LEAF_SIZE = 4          # 最细一层每格的目标点数
+MAX_LEAF = 32          # 最细一层单格点数上限（点分布不均时继续细分）
+MAX_LEVEL = 9
+EDGE_LENGTH = 80.0
+SEED = 42
+
+
+# 父格 3×3 邻域的子格相对于 2×父格坐标的偏移（-2..3），共 36 个
+_FAR_DX, _FAR_DY = (a.reshape(1, -1) for a in np.meshgrid(np.arange(-2, 4), np.arange(-2, 4), indexing="ij")) \
+    if np is not None else (None, None)
+
+
+def _cells(pos, origin, size, level):
+    side = 1 << level
+    c = np.floor((pos - origin) / size * side).astype(np.int64)
+    return np.clip(c, 0, side - 1)
+
+
+def _far_field(pos, origin, size, level, force):
+    """第 level 层：父格相邻、自身格不相邻的格子，按质心整体计算斥力（k = 1）。"""
+    side = 1 << level
+    cell = _cells(pos, origin, size, level)
+    flat = cell[:, 0] * side + cell[:, 1]
+    # 只为非空格子建表（深层格子数 4^l 远多于点数）
+    occupied, inverse = np.unique(flat, return_inverse=True)
+    mass = np.bincount(inverse).astype(np.float64)
+    com_x = np.bincount(inverse, weights=pos[:, 0]) / mass
+    com_y = np.bincount(inverse, weights=pos[:, 1]) / mass
+
+    parent = cell >> 1
+    tx = 2 * parent[:, :1] + _FAR_DX          # (n, 36)
+    ty = 2 * parent[:, 1:] + _FAR_DY
+    valid = ((tx >= 0) & (tx < side) & (ty >= 0) & (ty < side) &
+             ((np.abs(tx - cell[:, :1]) > 1) | (np.abs(ty - cell[:, 1:]) > 1)))
+    idx, k = np.nonzero(valid)
+    target = tx[idx, k] * side + ty[idx, k]
+    t = np.minimum(np.searchsorted(occupied, target), len(occupied) - 1)
+    has = occupied[t] == target
+    idx, t = idx[has], t[has]
+    m = mass[t]
+    dx = pos[idx, 0] - com_x[t]
+    dy = pos[idx, 1] - com_y[t]
+    w = m / np.maximum(dx * dx + dy * dy, 1e-9)
+    force[:, 0] += np.bincount(idx, weights=dx * w, minlength=len(pos))
+    force[:, 1] += np.bincount(idx, weights=dy * w, minlength=len(pos))
+
+
+def _near_field(pos, origin, size, level, force):
+    """最细一层：自身格及 8 个相邻格内的点逐对计算斥力。"""
+    n = len(pos)
+    side = 1 << level
+    cell = _cells(pos, origin, size, level)
+    flat = cell[:, 0] * side + cell[:, 1]
+    order = np.argsort(flat, kind="stable")
+    counts = np.bincount(flat, minlength=side * side)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            tx, ty = cell[:, 0] + dx, cell[:, 1] + dy
+            valid = (tx >= 0) & (tx < side) & (ty >= 0) & (ty < side)
+            t = np.where(valid, tx * side + ty, 0)
+            cnt = np.where(valid, counts[t], 0)
+            total = int(cnt.sum())
+            if not total:
+                continue
+            i = np.repeat(np.arange(n), cnt)
+            offset = np.arange(total) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+            j = order[np.repeat(starts[t], cnt) + offset]
+            keep = i != j
+            i, j = i[keep], j[keep]
+            delta = pos[i] - pos[j]
+            d2 = np.maximum((delta ** 2).sum(axis=1), 1e-9)
+            force[:, 0] += np.bincount(i, weights=delta[:, 0] / d2, minlength=n)
+            force[:, 1] += np.bincount(i, weights=delta[:, 1] / d2, minlength=n)
+
+
+def repulsion(pos):
+    n = len(pos)
+    force = np.zeros_like(pos)
+    if n < 2:
+        return force
+    origin = pos.min(axis=0)
+    size = max(float((pos.max(axis=0) - origin).max()), 1e-6) * (1 + 1e-9)
+    finest = int(np.clip(np.ceil(np.log(max(n / LEAF_SIZE, 1)) / np.log(4)), 2, MAX_LEVEL))
+    # 点聚集在少数格子时继续细分，避免最细一层逐对计算退化为 O(n²)
+    while finest < MAX_LEVEL:
+        cell = _cells(pos, origin, size, finest)
+        _, counts = np.unique(cell[:, 0] * (1 << finest) + cell[:, 1], return_counts=True)
+        if counts.max() <= MAX_LEAF:
+            break
+        finest += 1
+    for level in range(2, finest + 1):
+        _far_field(pos, origin, size, level, force)
+    _near_field(pos, origin, size, finest, force)
+    return force
+
+
+def force_layout(n: int, src, tgt, weight, iterations: int = ITERATIONS, seed: int = SEED):
+    """返回 (n, 2) 坐标数组。src / tgt 为节点下标，weight 为边的 strength。"""
+    rng = np.random.default_rng(seed)
+    pos = rng.normal(scale=np.sqrt(max(n, 1)), size=(n, 2))
+    if n < 2:
+        return pos * 0
+    temperature = np.sqrt(n)
+    for step in range(iterations):
+        force = repulsion(pos)
+        if len(src):
+            delta = pos[tgt] - pos[src]
+            dist = np.sqrt((delta ** 2).sum(axis=1))
+            pull = delta * (weight * dist)[:, None]
+            for axis in (0, 1):
+                force[:, axis] += np.bincount(src, weights=pull[:, axis], minlength=n)
+                force[:, axis] -= np.bincount(tgt, weights=pull[:, axis], minlength=n)
+        force -= GRAVITY * pos
+        length = np.maximum(np.sqrt((force ** 2).sum(axis=1)), 1e-9)
+        limit = temperature * (1 - step / iterations)
+        pos += force * (np.minimum(length, limit) / length)[:, None]
+
+    pos -= pos.mean(axis=0)
+    if len(src):
+        median = float(np.median(np.sqrt(((pos[tgt] - pos[src]) ** 2).sum(axis=1))))
+        if median > 0:
+            pos *= EDGE_LENGTH / median
+    return pos
+
+
+def compute_layout(executives: list[dict], relationships: list[dict],
+                   seed: int = SEED, iterations: int = ITERATIONS) -> dict:
+    """返回 {"ids", "x", "y"}（只用两端都在 executives 中的边）。"""
+    position = {e["id"]: i for i, e in enumerate(executives)}
+    edges = [r for r in relationships if r["source"] in position and r["target"] in position]
+    src = np.array([position[r["source"]] for r in edges], dtype=np.int64)
+    tgt = np.array([position[r["target"]] for r in edges], dtype=np.int64)
+    weight = np.array([r["strength"] for r in edges], dtype=np.float64)
+    pos = force_layout(len(executives), src, tgt, weight, iterations=iterations, seed=seed)
+    return {
+        "ids": [e["id"] for e in executives],
+        "x":   np.round(pos[:, 0], 1).tolist(),
+        "y":   np.round(pos[:, 1], 1).tolist(),
+    }
+
+
+def write_manifest(path: str, files: dict, **params) -> dict:
+    """各布局文件的 manifest；版本为文件哈希的哈希，未变化时保留旧文件（含 generated_at）。"""
+    version = hashlib.sha256(
+        "".join(files[n]["sha256"] for n in sorted(files)).encode("ascii")
+    ).hexdigest()[:16]
+    manifest = {
+        "version":      version,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "encodings":    ["br", "gz"] if all("br_bytes" in f for f in files.values()) else ["gz"],
+        **params,
+        "files":        files,
+    }
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            old = json.load(f)
+        if {**old, "generated_at": None} == {**manifest, "generated_at": None}:
+            return old
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线力导向布局")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="mine_relationships.py 的输出目录")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    args = parser.parse_args()
+
+    if np is None:
+        print("错误：布局计算需要 numpy：pip install numpy")
+        sys.exit(1)
+
+    with open(os.path.join(args.data_dir, "executives.json"), encoding="utf-8") as f:
+        executives = json.load(f)
+    with open(os.path.join(args.data_dir, "relationships.json"), encoding="utf-8") as f:
+        relationships = json.load(f)
+    print(f"加载: {len(executives)} 位高管，{len(relationships)} 条关系")
+
+    targets = [("全图", executives, relationships, os.path.join(args.data_dir, "layout.json"))]
+    execs_by_region, rels_by_region = split_by_region(executives, relationships)
+    for region in REGIONS:
+        targets.append((region, execs_by_region.get(region, []), rels_by_region.get(region, []),
+                        os.path.join(args.data_dir, "regions", f"layout.{region}.json")))
+
+    files = {}
+    for name, execs, rels, path in targets:
+        started = time.perf_counter()
+        layout = compute_layout(execs, rels, seed=args.seed, iterations=args.iterations)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        info = write_precompressed(path, compact_json(layout))
+        info["count"] = len(execs)
+        files[os.path.relpath(path, args.data_dir).replace(os.sep, "/")] = info
+        print(f"已写出: {path}  {name} {len(execs)} 个节点，{(time.perf_counter() - started):.1f}s，"
+              f"{info['bytes']/1024:.0f}KB → gz {info['gz_bytes']/1024:.0f}KB")
+
+    manifest_path = os.path.join(args.data_dir, "layout.manifest.json")
+    manifest = write_manifest(manifest_path, files, seed=args.seed, iterations=args.iterations)
+    print(f"已写出: {manifest_path}（布局版本 {manifest['version']}）")
+    print("\n完成！")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,10 @@ extract_career_llm.py
     export DEEPSEEK_API_KEY=sk-xxxx
     python3 scripts/extract_career_llm.py
 
-支持断点续跑：已处理的高管自动跳过。
+增量续跑：每条结果的输入哈希与 prompt 版本记录在
+career_path_overrides.meta.json，只重跑简介变化、prompt 过期或尚未处理的高管。
+    python3 scripts/extract_career_llm.py --report        # 只打印待重跑清单
+    python3 scripts/extract_career_llm.py --adopt-legacy  # 旧结果直接补记哈希
 并发处理（5 线程），速度约 2-3 分钟/百人。
 
 输出格式（career_path_overrides.json）：
@@ -22,6 +25,7 @@ extract_career_llm.py
 }
 """
 
+import argparse
 import json
 import os
 import sys
@@ -30,12 +34,17 @@ import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 
+from incremental import (content_hash, prompt_version, make_meta,
+                         stale_reason, load_meta, save_meta, StaleReport)
+
 # ── 路径配置 ──────────────────────────────────────────────
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SOURCE_FILE = os.path.join(
     SCRIPT_DIR, "..", "..", "Actuary60", "00_全部数据.json"
 )
 OVERRIDES_FILE = os.path.join(SCRIPT_DIR, "career_path_overrides.json")
+META_FILE      = os.path.join(SCRIPT_DIR, "career_path_overrides.meta.json")
+STALE_FILE     = os.path.join(SCRIPT_DIR, "career_path_overrides.stale.json")
 
 # ── 参数 ─────────────────────────────────────────────────
 MODEL        = "deepseek-chat"   # DeepSeek-V3
@@ -86,6 +95,18 @@ def build_prompt(name: str, company: str, title: str, bio: str) -> str:
 8. 只返回 JSON 数组，不要任何其他文字"""
 
 
+# prompt 或模型变化 → 版本号变化 → 全部结果过期
+PROMPT_VERSION = prompt_version(
+    SYSTEM_PROMPT, build_prompt("{name}", "{company}", "{title}", "{bio}"),
+    MODEL, MAX_BIO_LEN,
+)
+
+
+def bio_hash(exec_info: dict) -> str:
+    """输入哈希：prompt 中除姓名/公司（已在 key 中）外的全部输入。"""
+    return content_hash(exec_info["title"], exec_info["bio"][:MAX_BIO_LEN])
+
+
 def extract_career(client: OpenAI, name: str, company: str,
                    title: str, bio: str) -> list | None:
     prompt = build_prompt(name, company, title, bio)
@@ -164,31 +185,31 @@ def process_one(client: OpenAI, exec_info: dict, idx: int, total: int) -> tuple[
 
 
 def main():
-    api_key = os.environ.get("DEEPSEEK_API_KEY")
-    if not api_key:
-        print("错误：请设置 DEEPSEEK_API_KEY 环境变量")
-        print("  export DEEPSEEK_API_KEY=sk-xxxx")
-        sys.exit(1)
-
-    # 每个线程使用独立 client（OpenAI client 是线程安全的，但建议独立实例）
-    def make_client():
-        return OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--report", action="store_true",
+                        help="只输出待重跑清单，不调用 LLM")
+    parser.add_argument("--adopt-legacy", action="store_true",
+                        help="缺少哈希的旧结果视为最新，直接补记哈希而不重跑")
+    args = parser.parse_args()
 
     # ── 加载源数据 ────────────────────────────────────────
     with open(SOURCE_FILE, encoding="utf-8") as f:
         raw = json.load(f)
     print(f"加载源数据: {len(raw)} 家公司")
 
-    # ── 加载已有覆盖（断点续跑）───────────────────────────
+    # ── 加载已有覆盖及其哈希（增量续跑）─────────────────────
     if os.path.exists(OVERRIDES_FILE):
         with open(OVERRIDES_FILE, encoding="utf-8") as f:
             overrides: dict = json.load(f)
-        print(f"已有覆盖记录: {len(overrides)} 人（将跳过）")
+        print(f"已有覆盖记录: {len(overrides)} 人  prompt 版本: {PROMPT_VERSION}")
     else:
         overrides = {}
+    meta = load_meta(META_FILE)
 
-    # ── 收集待处理高管 ────────────────────────────────────
-    all_execs = []
+    # ── 比对哈希，收集待处理高管 ──────────────────────────
+    all_execs, report = [], StaleReport()
+    skipped = adopted = 0
+    seen_keys = set()
     for company in raw:
         for e in company.get("executives", []):
             bio  = (e.get("bio") or "").strip()
@@ -196,23 +217,53 @@ def main():
             if not name or not bio:
                 continue
             key = f"{name}|{company['name']}"
-            if key in overrides:
-                continue  # 已处理，跳过
-            all_execs.append({
+            if key in seen_keys:
+                continue  # 同一公司重名条目共用一条结果，以首条为准
+            seen_keys.add(key)
+            exec_info = {
                 "name":    name,
                 "company": company["name"],
                 "title":   (e.get("title") or "").strip(),
                 "bio":     bio,
-            })
+            }
+            exec_info["bio_hash"] = bio_hash(exec_info)
+            reason = stale_reason(meta.get(key), key in overrides,
+                                  exec_info["bio_hash"], PROMPT_VERSION)
+            if reason == "legacy" and args.adopt_legacy:
+                meta[key] = make_meta(exec_info["bio_hash"], PROMPT_VERSION)
+                adopted += 1
+                reason = None
+            if reason is None:
+                skipped += 1  # 已是最新，跳过
+                continue
+            report.add(reason, key)
+            all_execs.append(exec_info)
+    report.orphaned = [k for k in overrides if k not in seen_keys]
 
-    skipped = len(overrides)
     total_all = skipped + len(all_execs)
-    print(f"有简介高管: {total_all} 人  待处理: {len(all_execs)} 人  跳过: {skipped} 人\n")
+    report.print()
+    report.write(STALE_FILE)
+    print(f"有简介高管: {total_all} 人  待处理: {len(all_execs)} 人  "
+          f"跳过: {skipped} 人  补记哈希: {adopted} 人\n")
 
+    if args.report:
+        return
+    if adopted:
+        save_meta(META_FILE, meta)
     if not all_execs:
         print("全部已处理完毕！")
         return
 
+    api_key = os.environ.get("DEEPSEEK_API_KEY")
+    if not api_key:
+        print("错误：请设置 DEEPSEEK_API_KEY 环境变量")
+        print("  export DEEPSEEK_API_KEY=sk-xxxx")
+        sys.exit(1)
+
+    # 每个线程使用独立 client（OpenAI client 是线程安全的，但建议独立实例）
+    def make_client():
+        return OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+
     # ── 并发处理 ──────────────────────────────────────────
     lock = threading.Lock()
     processed = failed = 0
@@ -221,6 +272,7 @@ def main():
     def save():
         with open(OVERRIDES_FILE, "w", encoding="utf-8") as f:
             json.dump(overrides, f, ensure_ascii=False, indent=2)
+        save_meta(META_FILE, meta)
 
     total = len(all_execs)
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
@@ -233,6 +285,7 @@ def main():
             with lock:
                 if validated is not None:
                     overrides[key] = validated
+                    meta[key] = make_meta(futures[future]["bio_hash"], PROMPT_VERSION)
                     processed += 1
                 else:
                     failed += 1
@@ -243,7 +296,7 @@ def main():
 
     save()
     print(f"\n{'='*50}")
-    print(f"完成！新处理: {processed} 人  失败: {failed} 人  跳过(已有): {skipped} 人")
+    print(f"完成！新处理: {processed} 人  失败: {failed} 人  跳过(最新): {skipped} 人")
     print(f"总覆盖记录: {len(overrides)} 人")
     print(f"结果写入: {OVERRIDES_FILE}")
 
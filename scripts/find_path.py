@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+find_path.py — 查询「从我认识的人到 X」的最短关系路径（使用 mine_relationships.py 写出的 connections.bin）
+
+使用：
+    python3 scripts/find_path.py --known 12 34 --target 56
+    python3 scripts/find_path.py --known 12 --target 56 --data-dir public/data
+
+也可作为模块使用：
+    from mining.paths import ConnectionIndex
+    index = ConnectionIndex.load("public/data/connections.bin")
+    index.path({12, 34}, 56)   # → [12, ..., 56]（高管 id），不连通时为 None
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from mining.paths import ConnectionIndex
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR   = os.path.join(SCRIPT_DIR, "..", "public", "data")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="最短关系路径查询")
+    parser.add_argument("--known", type=int, nargs="+", required=True, help="已认识的高管 id")
+    parser.add_argument("--target", type=int, required=True, help="目标高管 id")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    index = ConnectionIndex.load(os.path.join(args.data_dir, "connections.bin"))
+    with open(os.path.join(args.data_dir, "executives.json"), encoding="utf-8") as f:
+        by_id = {e["id"]: e for e in json.load(f)}
+    with open(os.path.join(args.data_dir, "relationships.json"), encoding="utf-8") as f:
+        edge_of = {frozenset((r["source"], r["target"])): r for r in json.load(f)}
+
+    started = time.perf_counter()
+    path = index.path(args.known, args.target)
+    elapsed = (time.perf_counter() - started) * 1000
+    if path is None:
+        print(f"不连通（{elapsed:.2f}ms）")
+        sys.exit(1)
+
+    print(f"{len(path) - 1} 跳（{elapsed:.2f}ms）")
+    for i, exec_id in enumerate(path):
+        e = by_id.get(exec_id, {})
+        print(f"  {exec_id:>6}  {e.get('name', '?')}  {e.get('company', '')}")
+        if i + 1 < len(path):
+            r = edge_of.get(frozenset((exec_id, path[i + 1])), {})
+            print(f"          ↓ {r.get('type', '?')}：{r.get('label', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+incremental.py — LLM 解析结果的增量判定
+
+每条解析结果都记录两项元数据：
+  bio_hash        输入内容（简介 + 影响 prompt 的字段）的哈希
+  prompt_version  prompt 模板 + 模型的哈希
+
+再次运行时只重跑以下条目，其余直接复用：
+  new       尚无结果
+  changed   输入内容已变化
+  outdated  prompt 版本已过期
+  legacy    旧版结果，缺少哈希（可用 --adopt-legacy 直接补记，不重跑）
+
+供 parse_bios_llm.py / extract_career_llm.py / llm_extract_schools.py 共用。
+"""
+
+import hashlib
+import json
+import os
+from collections import defaultdict
+
+STALE_REASONS = {
+    "new":      "新增",
+    "changed":  "输入变化",
+    "outdated": "prompt 过期",
+    "legacy":   "缺少哈希",
+}
+
+
+def content_hash(*parts) -> str:
+    """对若干文本字段求稳定哈希（字段间用分隔符隔开，避免拼接歧义）。"""
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(("" if p is None else str(p)).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()[:16]
+
+
+def prompt_version(*prompts) -> str:
+    """prompt 模板 / 模型名任一变化 → 版本号变化 → 全部结果过期。"""
+    return content_hash(*prompts)[:8]
+
+
+def make_meta(bio_hash: str, version: str) -> dict:
+    return {"bio_hash": bio_hash, "prompt_version": version}
+
+
+def stale_reason(meta: dict | None, has_result: bool,
+                 bio_hash: str, version: str) -> str | None:
+    """返回需要重跑的原因（见 STALE_REASONS），无需重跑返回 None。"""
+    if not has_result:
+        return "new"
+    if not meta:
+        return "legacy"
+    if meta.get("bio_hash") != bio_hash:
+        return "changed"
+    if meta.get("prompt_version") != version:
+        return "outdated"
+    return None
+
+
+def load_meta(path: str) -> dict:
+    """读取旁路元数据文件（结果本身无法内嵌元数据时使用）。"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_meta(path: str, meta: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+class StaleReport:
+    """收集待重跑条目，按原因分组输出。"""
+
+    def __init__(self):
+        self.items: dict[str, list[str]] = defaultdict(list)
+        self.orphaned: list[str] = []
+
+    def add(self, reason: str, key: str):
+        self.items[reason].append(key)
+
+    def total(self, reasons=None) -> int:
+        reasons = reasons or STALE_REASONS.keys()
+        return sum(len(self.items.get(r, [])) for r in reasons)
+
+    def print(self, limit: int = 10):
+        print("── 待重跑条目 ──────────────────────────────")
+        for reason, label in STALE_REASONS.items():
+            keys = self.items.get(reason, [])
+            print(f"  {label:<10} {len(keys):>5} 条")
+            for k in keys[:limit]:
+                print(f"      · {k}")
+            if len(keys) > limit:
+                print(f"      … 另有 {len(keys) - limit} 条")
+        if self.orphaned:
+            print(f"  源数据已删除 {len(self.orphaned):>5} 条（保留结果，不重跑）")
+        print()
+
+    def write(self, path: str):
+        report = {reason: self.items.get(reason, []) for reason in STALE_REASONS}
+        report["orphaned"] = self.orphaned
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
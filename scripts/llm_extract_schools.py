@@ -9,6 +9,12 @@ llm_extract_schools.py
 
   # 全量运行并写回
   python3 llm_extract_schools.py
+
+  # 只打印待重跑清单
+  python3 llm_extract_schools.py --report
+
+增量续跑：每条结果的 bio 哈希与 prompt 版本记录在 school_overrides.meta.json，
+只重跑 bio 变化、prompt 过期或尚未处理的高管。
 """
 
 import json
@@ -18,8 +24,16 @@ import sys
 import argparse
 from openai import OpenAI
 
+from incremental import (content_hash, prompt_version, make_meta,
+                         stale_reason, load_meta, save_meta, StaleReport)
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 EXEC_FILE = os.path.join(SCRIPT_DIR, "..", "public", "data", "executives.json")
+SCHOOL_OVERRIDES_FILE = os.path.join(SCRIPT_DIR, "school_overrides.json")
+META_FILE  = os.path.join(SCRIPT_DIR, "school_overrides.meta.json")
+STALE_FILE = os.path.join(SCRIPT_DIR, "school_overrides.stale.json")
+
+MODEL = "deepseek-chat"
 
 client = OpenAI(
     api_key=os.environ.get("DEEPSEEK_API_KEY", ""),
@@ -43,12 +57,15 @@ SYSTEM_PROMPT = """你是一个精准的信息提取助手。从给定的保险
 严格返回 JSON：{"schools": ["学校1", "学校2"]}，无则 {"schools": []}
 只返回 JSON，不要任何解释文字"""
 
+# prompt 或模型变化 → 版本号变化 → 全部结果过期
+PROMPT_VERSION = prompt_version(SYSTEM_PROMPT, MODEL)
+
 
 def extract_schools_from_bio(bio: str) -> list[str] | None:
     """调用 Claude API 提取院校列表，失败返回 None。"""
     try:
         msg = client.chat.completions.create(
-            model="deepseek-chat",
+            model=MODEL,
             max_tokens=300,
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -72,6 +89,10 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--sample", type=int, default=0,
                         help="只处理前N条（样本验证模式，不写回文件）")
+    parser.add_argument("--report", action="store_true",
+                        help="只输出待重跑清单，不调用 LLM")
+    parser.add_argument("--adopt-legacy", action="store_true",
+                        help="缺少哈希的旧结果视为最新，直接补记哈希而不重跑")
     args = parser.parse_args()
 
     with open(EXEC_FILE, encoding="utf-8") as f:
@@ -79,22 +100,46 @@ def main():
 
     sample_mode = args.sample > 0
 
-    # 加载已有覆盖，跳过已处理的
+    # 加载已有覆盖及其哈希，跳过已是最新的
     existing_overrides = {}
-    if os.path.exists(SCHOOL_OVERRIDES_FILE := os.path.join(SCRIPT_DIR, "school_overrides.json")):
+    if os.path.exists(SCHOOL_OVERRIDES_FILE):
         with open(SCHOOL_OVERRIDES_FILE, encoding="utf-8") as f:
             existing_overrides = json.load(f)
+    meta = load_meta(META_FILE)
 
     all_targets = [e for e in executives if e.get("bio") and len(e.get("bio", "")) >= 10]
-    # 只处理尚未在 overrides 中的
-    targets = [e for e in all_targets if str(e["id"]) not in existing_overrides]
+    # 只处理无结果、bio 变化或 prompt 过期的
+    # （key 为高管 id，重新挖掘后 id 指向他人时 bio 哈希随之变化，同样会重跑）
+    targets, report, adopted = [], StaleReport(), 0
+    for e in all_targets:
+        key = str(e["id"])
+        bio_hash = content_hash(e["bio"])
+        reason = stale_reason(meta.get(key), key in existing_overrides,
+                              bio_hash, PROMPT_VERSION)
+        if reason == "legacy" and args.adopt_legacy:
+            meta[key] = make_meta(bio_hash, PROMPT_VERSION)
+            adopted += 1
+            continue
+        if reason is not None:
+            report.add(reason, f"{key} {e.get('name', '?')}|{e.get('company', '')}")
+            targets.append(e)
+    target_ids = {str(e["id"]) for e in all_targets}
+    report.orphaned = [k for k in existing_overrides if k not in target_ids]
+
+    report.print()
+    report.write(STALE_FILE)
+    if args.report:
+        return
+    if adopted and not sample_mode:
+        save_meta(META_FILE, meta)
+        print(f"补记哈希: {adopted} 人")
 
     if sample_mode:
         targets = targets[:args.sample]
         print(f"=== 样本模式：处理前 {len(targets)} 条（不写回）===\n")
     else:
         print(f"共 {len(executives)} 人，有bio {len(all_targets)} 人，"
-              f"已处理 {len(existing_overrides)} 人，待处理 {len(targets)} 人\n")
+              f"已是最新 {len(all_targets) - len(targets)} 人，待处理 {len(targets)} 人\n")
 
     updated = 0
     skipped_empty = len(executives) - len([e for e in executives if e.get("bio")])
@@ -128,6 +173,7 @@ def main():
                 print(f"      = {new_schools}")
         else:
             exec_obj["extracted"]["schools"] = new_schools
+            meta[str(exec_obj["id"])] = make_meta(content_hash(bio), PROMPT_VERSION)
 
         updated += 1
         time.sleep(0.35)  # ~2.8 req/s，安全范围内
@@ -138,10 +184,10 @@ def main():
         for e in executives:
             if e.get("bio") and len(e.get("bio", "")) >= 10:
                 overrides[str(e["id"])] = e["extracted"]["schools"]
-        overrides_file = os.path.join(SCRIPT_DIR, "school_overrides.json")
-        with open(overrides_file, "w", encoding="utf-8") as f:
+        with open(SCHOOL_OVERRIDES_FILE, "w", encoding="utf-8") as f:
             json.dump(overrides, f, ensure_ascii=False, indent=2)
-        print(f"已保存覆盖映射: {overrides_file} ({len(overrides)} 条)")
+        save_meta(META_FILE, meta)
+        print(f"已保存覆盖映射: {SCHOOL_OVERRIDES_FILE} ({len(overrides)} 条)")
 
         # 写回 executives.json
         with open(EXEC_FILE, "w", encoding="utf-8") as f:
@@ -4,262 +4,270 @@ mine_relationships.py
 从 bio_atoms.json（LLM 原子化数据库）和 00_全部数据.json 挖掘高管关系，生成：
   - ../public/data/executives.json
   - ../public/data/relationships.json
+  - ../public/data/relationships.bin  二进制边格式（见 mining/edge_binary.py）
+  - ../public/data/groups.json     分组成员关系（超边，不截断；见 mining/groups.py）
+  - ../public/data/regions/        按地区切分的紧凑预压缩版本 + manifest.json（见 mining/artifacts.py）
+  - ../public/data/relationships.backbone.{json,bin}  按边预算提取的骨干边集（--backbone-budget；见 mining/backbone.py）
+  - ../public/data/company_graph.json  公司级聚合图（人才流动 + 同校 / 同监管背景；见 mining/supergraph.py）
+  - ../public/data/connections.bin  连接索引（地标距离 + 父指针，最短路径查询；见 mining/paths.py）
+  - ../public/data/ego/            按 id 分桶的一跳邻域文件 + index.json（详情页按需加载；见 mining/ego.py）
+  - ../public/data/relationships.delta.json  增量模式下相对上次输出的变化（见 mining/delta.py）
+  - ../public/data/relationships.mode.json   产出上述文件的挖掘模式（engine / temporal / bio_scan）；
+                                              --incremental 时与本次不一致则改为全量重建
+
+使用：
+    python3 scripts/mine_relationships.py                 # 全量重建
+    python3 scripts/mine_relationships.py --incremental   # 只重算受变化影响的关系
+    python3 scripts/mine_relationships.py --incremental --changed "姓名|公司"
+    python3 scripts/mine_relationships.py --engine sparse  # 稀疏矩阵挖掘（需 numpy + scipy）
+    python3 scripts/mine_relationships.py --temporal       # colleague / former 只连任期重叠的
+    python3 scripts/mine_relationships.py --backbone-budget 5000  # 另写出 5000 条边的骨干边集
+    python3 scripts/mine_relationships.py --bio-scan report  # 简介原文实体扫描，与 LLM 提取结果对照
+    python3 scripts/mine_relationships.py --bio-scan recall  # 并把 LLM 漏提的院校 / 公司 / 监管机构补上
+
+同一人的多个「姓名|公司」节点（resolve_persons.py 写出的 person_ids.json）记录相同的 person_id，
+共用代表键的 atom，彼此之间不产生关系。
+
+也可作为模块导入：
+    from mine_relationships import load_inputs, RelationshipMiner
+    miner = RelationshipMiner(*load_inputs())
+    executives, relationships, successors = miner.mine()
 """
 
+import argparse
 import json
-import re
 import os
-from collections import defaultdict
-from itertools import combinations
+import sys
+import time
+from collections import Counter, defaultdict
+
+from mining.artifacts import write_region_shards, write_precompressed, compact_json
+from mining.edge_binary import encode_edges, decode_edges, TYPE_CODES
+from mining.delta import diff_executives, mine_delta
+from mining.edges import EdgeAccumulator
+from mining.titles import TitleNormalizer
+from mining.companies import CompanyResolver
+from mining.groups import build_groups, write_groups
+from mining.cooccurrence import mine_sparse
+from mining.temporal import mine_temporal, merge_interval, current_year
+from mining.roles import extract_key_roles, succession_links
+from mining.analytics import compute_metrics
+from mining.ego import write_ego_shards
+from mining.paths import ConnectionIndex
+from mining.supergraph import build_company_graph, write_company_graph
+from mining.backbone import extract_backbone, TOP_K
+from mining.entities import EntityScanner, EXTRACTED_FIELDS, crosscheck
+from mining.textkey import KeyedLookup
+from resolve_persons import PersonIndex, PERSONS_FILE
 
 # ── 路径配置 ──────────────────────────────────────────────
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR   = os.path.join(SCRIPT_DIR, "..", "public", "data")
 SOURCE_FILE = os.path.join(SCRIPT_DIR, "..", "..", "Actuary60", "00_全部数据.json")
 BIO_ATOMS_FILE = os.path.join(SCRIPT_DIR, "bio_atoms.json")
-
-os.makedirs(DATA_DIR, exist_ok=True)
-
-# ── 加载规范名称库 ─────────────────────────────────────────
 CANONICAL_FILE = os.path.join(SCRIPT_DIR, "canonical_names.json")
-_canonical_raw = {}
-if os.path.exists(CANONICAL_FILE):
-    with open(CANONICAL_FILE, encoding="utf-8") as f:
-        _canonical_raw = json.load(f)
-
-CANONICAL: dict[str, dict[str, str]] = {}
-for section, mapping in _canonical_raw.items():
-    if section.startswith("_"):
-        continue
-    CANONICAL[section] = {k: v for k, v in mapping.items() if k != "说明"}
-
-def apply_canonical(names: list[str], section: str) -> list[str]:
-    """将名称列表中的变体替换为规范名称，同时去重保序。"""
-    mapping = CANONICAL.get(section, {})
+CROSSCHECK_FILE = os.path.join(SCRIPT_DIR, "bio_entities.crosscheck.json")
+MODE_FILE = "relationships.mode.json"   # 相对输出目录
+
+
+# ── 加载输入 ──────────────────────────────────────────────
+def load_canonical(path: str = CANONICAL_FILE) -> dict[str, dict[str, str]]:
+    """规范名称库：{section: {变体: 规范名}}，去掉注释字段。"""
+    canonical_raw = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            canonical_raw = json.load(f)
+    canonical: dict[str, dict[str, str]] = {}
+    for section, mapping in canonical_raw.items():
+        if section.startswith("_"):
+            continue
+        canonical[section] = {k: v for k, v in mapping.items() if k != "说明"}
+    return canonical
+
+
+def load_inputs(source_file: str = SOURCE_FILE, atoms_file: str = BIO_ATOMS_FILE,
+                canonical_file: str = CANONICAL_FILE) -> tuple[list, dict, dict]:
+    """返回 (raw, bio_atoms, canonical)。"""
+    if not os.path.exists(atoms_file):
+        print(f"错误：未找到 bio_atoms.json，请先运行 parse_bios_llm.py")
+        sys.exit(1)
+    with open(atoms_file, encoding="utf-8") as f:
+        bio_atoms: dict = json.load(f)
+    print(f"加载 bio_atoms: {len(bio_atoms)} 人")
+
+    with open(source_file, encoding="utf-8") as f:
+        raw = json.load(f)
+    print(f"加载源数据: {len(raw)} 家公司")
+    return raw, bio_atoms, load_canonical(canonical_file)
+
+
+def apply_canonical(names: list[str], mapping: dict[str, str] | KeyedLookup) -> list[str]:
+    """
+    将名称列表中的变体替换为规范名称，同时去重保序；结果驻留（sys.intern），同名实体只存一份。
+    mapping 为 KeyedLookup 时按规范化键（繁简 / 全半角 / 大小写 / 标点折叠）查表。
+    """
     seen, result = set(), []
     for n in names:
-        canonical = mapping.get(n, n)
+        canonical = sys.intern(mapping.get(n, n))
         if canonical not in seen:
             seen.add(canonical)
             result.append(canonical)
     return result
 
-# ── 加载 bio_atoms（LLM 原子化数据库）────────────────────
-if not os.path.exists(BIO_ATOMS_FILE):
-    print(f"错误：未找到 bio_atoms.json，请先运行 parse_bios_llm.py")
-    import sys; sys.exit(1)
-
-with open(BIO_ATOMS_FILE, encoding="utf-8") as f:
-    bio_atoms: dict = json.load(f)
-print(f"加载 bio_atoms: {len(bio_atoms)} 人")
-
-# ── 加载原始数据 ──────────────────────────────────────────
-with open(SOURCE_FILE, encoding="utf-8") as f:
-    raw = json.load(f)
-print(f"加载源数据: {len(raw)} 家公司")
-
-# ── 规范公司名集合 ─────────────────────────────────────────
-company_names_set = {company["name"] for company in raw}
-
-# 合法机构全集 = 当前雇主 + canonical_names.json companies 的所有 value
-_canon_companies = CANONICAL.get("companies", {})
-all_canonical_companies: set[str] = set(company_names_set)
-for k, v in _canon_companies.items():
-    if not k.startswith("_") and k != "说明":
-        all_canonical_companies.add(v)
-_company_variant_map: dict[str, str] = {
-    k: v for k, v in _canon_companies.items()
-    if not k.startswith("_") and k != "说明"
-}
 
 # ── 地区映射 ──────────────────────────────────────────────
 REGION_MAP = {"中国大陆": "CN", "中国香港": "HK", "新加坡": "SG"}
 
-# ── 职位标准化 ────────────────────────────────────────────
-EN_TITLE_MAP = {
-    "Chief Executive Officer": "首席执行官",
-    "Group Chief Executive Officer": "集团首席执行官",
-    "Regional CEO": "区域首席执行官",
-    "Chief Financial Officer": "首席财务官",
-    "Group Chief Financial Officer": "集团首席财务官",
-    "Chief Risk Officer": "首席风险官",
-    "Chief Investment Officer": "首席投资官",
-    "Chief Information Officer": "首席信息官",
-    "Chief Operating Officer": "首席运营官",
-    "Chief Distribution Officer": "首席分销官",
-    "Chief Compliance Officer": "首席合规官",
-    "Managing Director": "董事总经理",
-    "MD": "董事总经理",
-    "Director": "董事",
-    "Independent Director": "独立董事",
-    "Independent Non-Executive Director": "独立非执行董事",
-    "Non-Executive Director": "非执行董事",
-    "Executive Director": "执行董事",
-    "Chairman": "董事长",
-    "Vice Chairman": "副董事长",
-    "President": "总裁",
-    "CEO": "首席执行官",
-    "CFO": "首席财务官",
-    "行政總裁": "首席执行官",
-    "首席財務總監": "首席财务总监",
-    "先生": "", "女士": "", "Singapore": "",
-}
-
-_APPROVAL_RE    = re.compile(r'（(?:批复文号|保监许可|[^\u4e00-\u9fa5（）]{0,4})[^）]*[号〕\d][^）]*）')
-_BIO_OVERFLOW_RE = re.compile(r'。[\u4e00-\u9fa5]{1,3}(?:先生|女士|曾任|拥有|毕业|持有|出生).+$')
-_INNER_SPACE_RE  = re.compile(r'([\u4e00-\u9fa5])\s+([\u4e00-\u9fa5])')
-_UNKNOWN_COMP_RE = re.compile(
-    r'^([\u4e00-\u9fa5]{2,12}'
-    r'(?:保险社|人寿|财产|保险|集团|银行|证券|资产|基金|再保险)'
-    r'(?:股份有限公司|有限公司|有限责任公司|股份公司)?)'
-    r'(.{2,})$'
-)
-_BRANCH_RE    = re.compile(r'^[\u4e00-\u9fa5]{1,6}(?:省|市|区|地区|自治区)?分公司')
-_MULTI_COMP_RE = re.compile(r'[，,][\u4e00-\u9fa5]{2,12}(?:保险|集团|公司|银行|资产|基金).+$')
-
-
-def normalize_title(raw_title: str, known_companies: set = None) -> str:
-    if not raw_title:
-        return ""
-    known_companies = known_companies or set()
-    t = raw_title.strip()
-    while _INNER_SPACE_RE.search(t):
-        t = _INNER_SPACE_RE.sub(r'\1\2', t)
-    if t in EN_TITLE_MAP:
-        return EN_TITLE_MAP[t]
-    t = _APPROVAL_RE.sub("", t)
-    t = _BIO_OVERFLOW_RE.sub("", t)
-    t = t.rstrip("。！？，., ").strip()
-    for pfx in ["现任本公司", "现任公司", "本公司", "现任"]:
-        if t.startswith(pfx):
-            t = t[len(pfx):].strip()
-            break
-    if t.startswith("兼任"):
-        t = t[2:].strip()
-    stripped = False
-    for comp in sorted(known_companies, key=len, reverse=True):
-        if t.startswith(comp):
-            rest = t[len(comp):].strip()
-            if len(rest) >= 2:
-                t = rest
-                stripped = True
-            break
-    if not stripped:
-        m = _UNKNOWN_COMP_RE.match(t)
-        if m and len(m.group(2)) >= 2:
-            t = m.group(2).strip()
-    for pfx in ["公司党委", "集团党委", "公司", "集团"]:
-        if t.startswith(pfx) and len(t) > len(pfx) + 1:
-            t = t[len(pfx):].strip()
-            break
-    t = _MULTI_COMP_RE.sub("", t)
-    m = _BRANCH_RE.match(t)
-    if m:
-        t = "分公司" + t[m.end():]
-    return t.rstrip("。！？，., ").strip()
-
-
-# ── 公司名匹配（用于 LLM 提取的历史公司 → 标准名）────────
-def normalize_company(name, known_set):
-    if name in known_set:
-        return name
-    if len(name) >= 8:
-        for known in known_set:
-            if name in known:
-                return known
-            if known in name and len(name) <= len(known) + 4:
-                return known
-    return None
-
-def match_company(raw_name: str) -> str | None:
-    """将 LLM 提取的公司名匹配到标准机构库"""
-    name = (raw_name or "").strip()
-    if not name or len(name) < 4:
-        return None
-    if name in _company_variant_map:
-        return _company_variant_map[name]
-    if name in all_canonical_companies:
-        return name
-    return normalize_company(name, all_canonical_companies)
-
-
-# ── 前后任相关 ────────────────────────────────────────────
-KEY_ROLES = [
-    "董事长", "总裁", "总经理", "联席总裁", "副董事长", "副总裁", "副总经理",
-    "监事长", "总精算师", "总会计师", "首席执行官", "首席风险官", "首席财务官",
-    "首席投资官", "CEO", "CFO", "CRO", "CIO", "董事总经理", "党委书记", "党委副书记"
+# ── 关系类型 ──────────────────────────────────────────────
+# 「共享同一实体」类关系：(类型, 强度, 每组参与配对的上限, 取组 key 的函数)
+# 顺序即优先级：同一对高管命中多种关系时保留强度最高（排在最前）的一种。
+RELATION_TYPES = [
+    ("colleague", 1.0, 30, lambda e: [e["company"]]),
+    ("alumni",    0.7, 50, lambda e: [s for s in e["extracted"]["schools"] if len(s) >= 4]),
+    ("former",    0.6, 50, lambda e: [c for c in e["extracted"]["former_companies"] if len(c) >= 4]),
+    ("regulator", 0.4, 50, lambda e: e["extracted"]["regulator_bg"]),
 ]
-ROLE_INVALID_SUFFIX = ("助理", "级", "助")
-ROLE_INVALID_PREFIX = {"部", "室", "组", "处"}
-
-
-def extract_key_roles(title_str):
-    found, remaining = [], title_str
-    for role in sorted(KEY_ROLES, key=len, reverse=True):
-        idx = remaining.find(role)
-        while idx >= 0:
-            next_chars = remaining[idx + len(role): idx + len(role) + 2]
-            if any(next_chars.startswith(s) for s in ROLE_INVALID_SUFFIX):
-                idx = remaining.find(role, idx + 1)
-                continue
-            if idx > 0 and any(c in ROLE_INVALID_PREFIX for c in remaining[max(0, idx - 2):idx]):
-                idx = remaining.find(role, idx + 1)
-                continue
-            found.append(role)
-            remaining = remaining[:idx] + "〇" * len(role) + remaining[idx + len(role):]
-            break
-    return found
-
 
-# ── 构建高管列表 ──────────────────────────────────────────
-executives = []
-exec_id    = 0
-company_to_execs = defaultdict(list)
 
-for company in raw:
-    company_name = company["name"]
-    region = REGION_MAP.get(company.get("region", "中国大陆"), "CN")
-    website = company.get("website", "")
+def group_members(executives: list[dict]) -> dict[str, dict[str, list[int]]]:
+    """
+    {关系类型: {组 key（公司/院校/监管机构）: [高管 id，按高管顺序]}}
+    同一 person_id 的多个节点在同一分组中只保留第一个，避免同一人与自己配对。
+    """
+    groups = {rel_type: defaultdict(list) for rel_type, *_ in RELATION_TYPES}
+    seen = set()
+    for e in executives:
+        person = e.get("person_id")
+        for rel_type, _, _, keys_of in RELATION_TYPES:
+            for key in keys_of(e):
+                if person is not None:
+                    if (rel_type, key, person) in seen:
+                        continue
+                    seen.add((rel_type, key, person))
+                groups[rel_type][key].append(e["id"])
+    return groups
+
+
+def mine_pairs(groups: dict[str, dict[str, list[int]]]) -> EdgeAccumulator:
+    """组内两两配对，按高管对去重（先出现的类型优先，即保留强度最高的关系）。"""
+    edges = EdgeAccumulator([t for t, *_ in RELATION_TYPES])
+    for type_code, (rel_type, strength, cap, _) in enumerate(RELATION_TYPES):
+        print(f"挖掘 {rel_type} 关系...")
+        pair_count = 0
+        for label, ids in groups[rel_type].items():
+            if len(ids) < 2:
+                continue
+            pair_count += edges.add_group(ids[:cap], type_code, strength, edges.label_code(label))
+        print(f"  {rel_type}: {pair_count} 对 (来自 {len(groups[rel_type])} 个分组)")
+    return edges
+
+
+# ── 挖掘引擎 ──────────────────────────────────────────────
+class RelationshipMiner:
+    """持有源数据与规范名称库，构建高管列表并挖掘关系。"""
+
+    def __init__(self, raw: list, bio_atoms: dict, canonical: dict, persons: PersonIndex | None = None,
+                 bio_scan: str | None = None):
+        """bio_scan：None / "report"（简介实体扫描与 LLM 结果对照）/ "recall"（并补入漏提的实体）"""
+        self.raw       = raw
+        self.bio_atoms = bio_atoms
+        self.canonical = canonical
+        self.persons   = persons or PersonIndex()
+        self.bio_scan  = bio_scan
+        self.recalled: dict[int, dict[str, list[str]]] = {}   # recall 补入的实体：{id: {字段: [规范名]}}
+        # 各 section 的变体表按规范化键预建索引（繁简 / 全半角 / 大小写 / 标点折叠后 O(1) 命中）
+        self.lookups = {section: KeyedLookup(mapping) for section, mapping in canonical.items()}
+
+        # 规范公司名集合
+        self.company_names_set = {company["name"] for company in raw}
+
+        # 合法机构全集 = 当前雇主 + canonical_names.json companies 的所有 value
+        canon_companies = canonical.get("companies", {})
+        self.company_variant_map: dict[str, str] = {
+            k: v for k, v in canon_companies.items()
+            if not k.startswith("_") and k != "说明"
+        }
+        self.all_canonical_companies: set[str] = set(self.company_names_set)
+        self.all_canonical_companies.update(self.company_variant_map.values())
+        self.companies = CompanyResolver(self.all_canonical_companies, self.company_variant_map)
+
+        # 职位标准化：公司名前缀树 + 按原始职位缓存
+        self.titles = TitleNormalizer(self.company_names_set)
+
+    def apply_canonical(self, names: list[str], section: str) -> list[str]:
+        return apply_canonical(names, self.lookups.get(section, {}))
+
+    def match_company(self, raw_name: str) -> str | None:
+        """将 LLM 提取的公司名匹配到标准机构库"""
+        return self.companies.match(raw_name)
+
+    def canonical_company(self, raw_name: str) -> str | None:
+        """match_company 之后再应用 canonical_names.json 的公司别名（与 former_companies 一致）。"""
+        company = self.match_company(raw_name)
+        return self.apply_canonical([company], "companies")[0] if company else None
+
+    def resolve_companies(self) -> dict[str, str | None]:
+        """一次性解析 bio_atoms 中所有历史公司名（career + board_roles），结果进入缓存。"""
+        raw_names = [
+            step.get("company", "")
+            for atom in self.bio_atoms.values()
+            for step in atom.get("career", []) + atom.get("board_roles", [])
+            if not step.get("is_current")
+        ]
+        resolved = self.companies.match_all(raw_names)
+        matched = sum(1 for v in resolved.values() if v)
+        print(f"历史公司名: {len(resolved)} 个不同名称，匹配到标准机构 {matched} 个，"
+              f"子串判断 {self.companies.checked} 次")
+        return resolved
+
+    def atom_of(self, key: str) -> dict:
+        """代表键的 atom；代表键尚未解析时退回本键自己的 atom。"""
+        return self.bio_atoms.get(self.persons.representative(key)) or self.bio_atoms.get(key, {})
+
+    # ── 构建高管列表 ──────────────────────────────────────
+    def build_executive(self, company: dict, e: dict, exec_id: int) -> dict | None:
+        company_name = sys.intern(company["name"])
+        region = REGION_MAP.get(company.get("region", "中国大陆"), "CN")
+        website = company.get("website", "")
 
-    for e in company.get("executives", []):
         name  = (e.get("name") or "").strip()
-        title = normalize_title(e.get("title") or "", known_companies=company_names_set)
+        title = self.titles.normalize(e.get("title") or "")
         bio   = (e.get("bio") or "").strip()
 
         if not name:
-            continue
+            return None
 
-        # ── 从 bio_atoms 读取原子字段 ─────────────────────
+        # ── 从 bio_atoms 读取原子字段（同一人的各节点共用代表键的 atom）──
         atom_key = f"{name}|{company_name}"
-        atom     = bio_atoms.get(atom_key, {})
+        atom     = self.atom_of(atom_key)
 
         # 院校：从 education[].school 提取，过滤空值，应用规范化
         schools_raw = [
             edu["school"] for edu in atom.get("education", [])
             if edu.get("school") and len(edu["school"]) >= 4
         ]
-        schools = apply_canonical(list(dict.fromkeys(schools_raw)), "schools")
+        schools = self.apply_canonical(list(dict.fromkeys(schools_raw)), "schools")
 
         # 曾任公司：career 中 is_current=False 的条目，匹配到标准机构库
         former_companies = []
         for step in atom.get("career", []):
             if step.get("is_current"):
                 continue
-            canonical = match_company(step.get("company", ""))
+            canonical = self.match_company(step.get("company", ""))
             if canonical and canonical != company_name:
                 former_companies.append(canonical)
         # board_roles 中也可能有曾经的（如果标注为 is_current=False）
         for br in atom.get("board_roles", []):
             if br.get("is_current"):
                 continue
-            canonical = match_company(br.get("company", ""))
+            canonical = self.match_company(br.get("company", ""))
             if canonical and canonical != company_name and canonical not in former_companies:
                 former_companies.append(canonical)
         former_companies = list(dict.fromkeys(former_companies))  # 去重保序
-        former_companies = apply_canonical(former_companies, "companies")
+        former_companies = self.apply_canonical(former_companies, "companies")
 
         # 监管背景
-        regulator_bg = apply_canonical(atom.get("regulator_bg", []), "regulators")
+        regulator_bg = self.apply_canonical(atom.get("regulator_bg", []), "regulators")
 
         # 职业轨迹 career_path：直接使用 LLM 结果
         career_path = atom.get("career", [
@@ -267,8 +275,9 @@ for company in raw:
              "start_year": None, "end_year": None, "is_current": True}
         ])
 
-        exec_obj = {
+        return {
             "id":      exec_id,
+            "person_id": self.persons.person_id(atom_key),
             "name":    name,
             "title":   title,
             "company": company_name,
@@ -288,120 +297,169 @@ for company in raw:
             "board_roles":    atom.get("board_roles", []),
             "industry_roles": atom.get("industry_roles", []),
         }
-        executives.append(exec_obj)
-        company_to_execs[company_name].append(exec_id)
-        exec_id += 1
-
-print(f"高管总数: {len(executives)}")
-bio_atoms_coverage = sum(1 for e in executives if f"{e['name']}|{e['company']}" in bio_atoms)
-print(f"bio_atoms 覆盖: {bio_atoms_coverage}/{len(executives)} 人")
-
-# ── 关系字典（去重用） ──────────────────────────────────────
-relationships_dict = {}
-
-def add_rel(id_a, id_b, rel_type, strength, label):
-    key = frozenset([id_a, id_b])
-    if key in relationships_dict:
-        if strength > relationships_dict[key]["strength"]:
-            relationships_dict[key] = {"source": id_a, "target": id_b,
-                                       "type": rel_type, "strength": strength, "label": label}
-    else:
-        relationships_dict[key] = {"source": id_a, "target": id_b,
-                                   "type": rel_type, "strength": strength, "label": label}
-
-# ── 1. colleague：同公司高管 ──────────────────────────────
-print("挖掘 colleague 关系...")
-colleague_count = 0
-for comp, ids in company_to_execs.items():
-    ids_limited = ids[:30]
-    for a, b in combinations(ids_limited, 2):
-        add_rel(a, b, "colleague", 1.0, comp)
-        colleague_count += 1
-print(f"  colleague: {colleague_count} 对")
-
-# ── 2. alumni：相同院校 ──────────────────────────────────
-print("挖掘 alumni 关系...")
-school_to_execs = defaultdict(list)
-for e in executives:
-    for school in e["extracted"]["schools"]:
-        if len(school) >= 4:
-            school_to_execs[school].append(e["id"])
-
-alumni_count = 0
-for school, ids in school_to_execs.items():
-    if len(ids) < 2:
-        continue
-    ids_limited = ids[:50]
-    for a, b in combinations(ids_limited, 2):
-        add_rel(a, b, "alumni", 0.7, school)
-        alumni_count += 1
-print(f"  alumni: {alumni_count} 对 (来自 {len(school_to_execs)} 所院校)")
-
-# ── 3. former：曾任同一公司 ───────────────────────────────
-print("挖掘 former 关系...")
-former_comp_to_execs = defaultdict(list)
-for e in executives:
-    for fc in e["extracted"]["former_companies"]:
-        if len(fc) >= 4:
-            former_comp_to_execs[fc].append(e["id"])
-
-former_count = 0
-for fc, ids in former_comp_to_execs.items():
-    if len(ids) < 2:
-        continue
-    ids_limited = ids[:50]
-    for a, b in combinations(ids_limited, 2):
-        add_rel(a, b, "former", 0.6, fc)
-        former_count += 1
-print(f"  former: {former_count} 对 (来自 {len(former_comp_to_execs)} 家历史公司)")
-
-# ── 4. regulator：共同监管机构背景 ───────────────────────
-print("挖掘 regulator 关系...")
-regulator_execs = defaultdict(list)
-for e in executives:
-    for kw in e["extracted"]["regulator_bg"]:
-        regulator_execs[kw].append(e["id"])
-
-regulator_count = 0
-for kw, ids in regulator_execs.items():
-    if len(ids) < 2:
-        continue
-    ids_limited = ids[:50]
-    for a, b in combinations(ids_limited, 2):
-        add_rel(a, b, "regulator", 0.4, kw)
-        regulator_count += 1
-print(f"  regulator: {regulator_count} 对")
-
-# ── 5. successor：同公司同职位前后任 ──────────────────────
-print("挖掘 successor 关系...")
-role_index = defaultdict(lambda: {"current": [], "former": []})
-seen_former_person = set()
-
-for e in executives:
-    current_roles = extract_key_roles(e["title"])
-    for role in current_roles:
-        role_index[(e["company"], role)]["current"].append(e["id"])
-    current_exec_roles = set(extract_key_roles(e["title"]))
-    for step in e.get("career_path", []):
-        if not step.get("is_current") and step.get("company") in company_names_set:
-            step_roles = extract_key_roles(step.get("title") or "")
-            for role in step_roles:
-                if e["company"] == step["company"] and role in current_exec_roles:
+
+    def build_executives(self, id_map: dict[str, list[int]] | None = None) -> list[dict]:
+        """
+        按源数据顺序构建高管列表。
+        id_map（"姓名|公司" → 上次输出中的 id 列表）给出时沿用旧 id，新增高管从最大 id 往后编号；
+        否则按顺序从 0 编号。
+        """
+        id_map = {k: list(v) for k, v in (id_map or {}).items()}
+        next_id = 1 + max((i for ids in id_map.values() for i in ids), default=-1)
+        self.resolve_companies()
+        executives = []
+        for company in self.raw:
+            for e in company.get("executives", []):
+                key = f"{(e.get('name') or '').strip()}|{company['name']}"
+                reused = id_map.get(key)
+                exec_id = reused[0] if reused else next_id
+                exec_obj = self.build_executive(company, e, exec_id)
+                if exec_obj is None:
                     continue
-                dedup_key = (e["name"], step["company"], role)
-                if dedup_key not in seen_former_person:
-                    seen_former_person.add(dedup_key)
-                    role_index[(step["company"], role)]["former"].append(e["id"])
-
-successor_dict = {}
-successor_count = 0
-for (comp, role), groups in role_index.items():
-    current_ids, former_ids = groups["current"], groups["former"]
-    if not current_ids or not former_ids:
-        continue
-    for curr_id in current_ids:
-        for form_id in former_ids:
-            if curr_id != form_id:
+                if reused:
+                    reused.pop(0)
+                else:
+                    next_id += 1
+                executives.append(exec_obj)
+
+        print(f"高管总数: {len(executives)}")
+        coverage = sum(1 for e in executives if self.atom_of(f"{e['name']}|{e['company']}"))
+        print(f"bio_atoms 覆盖: {coverage}/{len(executives)} 人")
+        if len(self.persons):
+            n_persons = len({e["person_id"] for e in executives if e["person_id"] is not None})
+            print(f"人员映射: {len(executives)} 个节点对应 {n_persons} 人")
+        ts = self.titles.stats()
+        print(f"职位标准化: {ts['calls']} 次，缓存命中 {ts['hits']}（{ts['hit_rate']:.0%}），"
+              f"前缀树 {ts['companies']} 家公司")
+        if self.bio_scan:
+            self.scan_bios(executives, recall=self.bio_scan == "recall")
+        return executives
+
+    # ── 简介实体扫描（--bio-scan）────────────────────────
+    def scan_bios(self, executives: list[dict], recall: bool = False,
+                  report_file: str = CROSSCHECK_FILE) -> dict[int, list]:
+        """
+        Aho-Corasick 一遍扫描全部简介（见 mining/entities.py），与 LLM 提取的字段对照并写出
+        bio_entities.crosscheck.json；recall=True 时把漏提的规范名补进 extracted（监管机构 / 公司
+        只补带任职线索的，见 crosscheck），补入的条目记在 self.recalled。返回 {id: 提及列表}。
+        """
+        started = time.perf_counter()
+        scanner = EntityScanner.from_canonical(self.canonical, self.company_names_set)
+        mentions = {e["id"]: scanner.scan(e["bio"]) for e in executives}
+        elapsed = time.perf_counter() - started
+
+        totals = {section: defaultdict(int) for section in EXTRACTED_FIELDS}
+        report = []
+        for e in executives:
+            check = crosscheck(e, mentions[e["id"]])
+            for section, field in EXTRACTED_FIELDS.items():
+                for kind in ("missed", "unseen", "recall"):
+                    totals[section][kind] += len(check[section][kind])
+                if recall and check[section]["recall"]:
+                    e["extracted"][field] = e["extracted"][field] + check[section]["recall"]
+                    self.recalled.setdefault(e["id"], {})[field] = check[section]["recall"]
+            if any(c["missed"] or c["unseen"] for c in check.values()):
+                report.append({"id": e["id"], "key": f"{e['name']}|{e['company']}", **check,
+                               "mentions": [m._asdict() for m in mentions[e["id"]]]})
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+
+        n_chars = sum(len(e["bio"]) for e in executives)
+        print(f"简介实体扫描: {len(scanner)} 个写法，{n_chars} 字，"
+              f"{sum(map(len, mentions.values()))} 处提及，{elapsed*1000:.0f}ms")
+        for section, field in EXTRACTED_FIELDS.items():
+            action = "已补入" if recall else "可补入"
+            print(f"  {field:<17} LLM 漏提 {totals[section]['missed']:>5}  {action} {totals[section]['recall']:>5}  "
+                  f"原文未出现 {totals[section]['unseen']:>5}")
+        print(f"  对照明细: {report_file}")
+        return mentions
+
+    def type_counts_without_recall(self, executives: list[dict], temporal: bool = False) -> dict[str, int]:
+        """撤销 recall 补入的实体后重新配对，返回各类关系的边数（与 recall 结果对比用）。"""
+        baseline = []
+        for e in executives:
+            added = self.recalled.get(e["id"])
+            if added:
+                e = {**e, "extracted": {**e["extracted"], **{
+                    field: [c for c in e["extracted"][field] if c not in names]
+                    for field, names in added.items()}}}
+            baseline.append(e)
+        groups = group_members(baseline)
+        if temporal:
+            edges = mine_temporal(RELATION_TYPES, groups, self.build_tenures(baseline))
+        else:
+            edges = mine_pairs(groups)
+        return dict(Counter(r["type"] for r in edges.to_list()))
+
+    # ── 任期区间（--temporal）─────────────────────────────
+    def build_tenures(self, executives: list[dict]) -> dict[str, dict[str, dict[int, tuple]]]:
+        """
+        {"colleague": {现任公司: {id: (开始年, 结束年)}}, "former": {曾任公司: {...}}}
+        只收录年份可确定的任期：现任需有开始年（结束年取今年），曾任需开始、结束年都有。
+        """
+        this_year = current_year()
+        tenures = {"colleague": defaultdict(dict), "former": defaultdict(dict)}
+        for e in executives:
+            former_set = set(e["extracted"]["former_companies"])
+            for step in e.get("career_path", []):
+                start, end = step.get("start_year"), step.get("end_year")
+                if not isinstance(start, int):
+                    continue
+                if step.get("is_current"):
+                    company = self.match_company(step.get("company", ""))
+                    if company != e["company"] and step.get("company") != e["company"]:
+                        continue
+                    rel_type, label, end = "colleague", e["company"], this_year
+                else:
+                    label = self.canonical_company(step.get("company", ""))
+                    if label is None or not isinstance(end, int):
+                        continue
+                    if label not in former_set:
+                        continue
+                    rel_type = "former"
+                if end < start:
+                    continue
+                group = tenures[rel_type][label]
+                group[e["id"]] = merge_interval(group.get(e["id"]), start, end)
+        n_known = sum(len(m) for t in tenures.values() for m in t.values())
+        print(f"任期区间: {n_known} 段年份可确定")
+        return tenures
+
+    # ── successor：同公司同职位前后任 ─────────────────────
+    def mine_successors(self, executives: list[dict]) -> dict[tuple, dict]:
+        """按 (公司, 职位) 汇总现任与前任的任期，只连时间线上相邻的前任 → 后任。"""
+        print("挖掘 successor 关系...")
+        role_index = defaultdict(list)
+        seen_former_person = set()
+
+        for order, e in enumerate(executives):
+            current_exec_roles = extract_key_roles(e["title"])
+            current_start = min(
+                (s["start_year"] for s in e.get("career_path", [])
+                 if s.get("is_current") and isinstance(s.get("start_year"), int)),
+                default=None,
+            )
+            for role in current_exec_roles:
+                role_index[(e["company"], role)].append(
+                    {"id": e["id"], "current": True, "start": current_start, "end": None, "order": order})
+            for step in e.get("career_path", []):
+                if not step.get("is_current") and step.get("company") in self.company_names_set:
+                    step_roles = extract_key_roles(step.get("title") or "")
+                    for role in step_roles:
+                        if e["company"] == step["company"] and role in current_exec_roles:
+                            continue
+                        dedup_key = (e["name"], step["company"], role)
+                        if dedup_key not in seen_former_person:
+                            seen_former_person.add(dedup_key)
+                            role_index[(step["company"], role)].append(
+                                {"id": e["id"], "current": False, "order": order,
+                                 "start": step.get("start_year"), "end": step.get("end_year")})
+
+        successor_dict = {}
+        n_holders = 0
+        for (comp, role), holders in role_index.items():
+            n_holders += len(holders)
+            for form_id, curr_id in succession_links(holders):
                 key = (form_id, curr_id)
                 if key not in successor_dict:
                     successor_dict[key] = {
@@ -409,29 +467,286 @@ for (comp, role), groups in role_index.items():
                         "type": "successor", "strength": 0.8,
                         "label": f"{comp[:8]}·{role}",
                     }
-                    successor_count += 1
-print(f"  successor: {successor_count} 条")
-
-# ── 输出 ──────────────────────────────────────────────────
-relationships = list(relationships_dict.values())
-print(f"\n关系总数（去重后）: {len(relationships)}")
-
-type_count = defaultdict(int)
-for r in relationships:
-    type_count[r["type"]] += 1
-for t, c in sorted(type_count.items()):
-    print(f"  {t}: {c}")
-
-# 写出文件
-out_exec = os.path.join(DATA_DIR, "executives.json")
-out_rel  = os.path.join(DATA_DIR, "relationships.json")
+        print(f"  successor: {len(successor_dict)} 条（{len(role_index)} 个职位，{n_holders} 人次任职）")
+        return successor_dict
+
+    # ── 全量挖掘 ──────────────────────────────────────────
+    def mine(self, engine: str = "python", temporal: bool = False) -> tuple[list[dict], list[dict], list[dict]]:
+        """
+        返回 (executives, relationships, successors)。
+        engine="sparse" 时用稀疏矩阵 A·Aᵀ 挖掘（见 mining/cooccurrence.py），高管对与默认实现相同，
+        strength 随共享分组数增加。
+        temporal=True 时 colleague / former 只连任期重叠的高管对（见 mining/temporal.py）。
+        """
+        executives = self.build_executives()
+        groups = group_members(executives)
+        if temporal:
+            edges = mine_temporal(RELATION_TYPES, groups, self.build_tenures(executives))
+            successors = self.mine_successors(executives)
+            return executives, edges.to_list(), list(successors.values())
+        if engine == "sparse":
+            print("稀疏矩阵挖掘共享实体关系...")
+            relationships = mine_sparse(RELATION_TYPES, groups, executives)
+            successors = self.mine_successors(executives)
+            return executives, relationships, list(successors.values())
+        edges = mine_pairs(groups)
+        # 前后任单独返回，不并入 relationships.json
+        successors = self.mine_successors(executives)
+        return executives, edges.to_list(), list(successors.values())
+
+    # ── 增量挖掘 ──────────────────────────────────────────
+    def mine_incremental(self, prev_executives: list[dict], prev_relationships: list[dict],
+                         changed_keys: set[str] | None = None):
+        """
+        基于上次输出，只重算受变化高管影响的分组内的高管对。
+        changed_keys 给出时只把这些 "姓名|公司" 视为变化，否则逐条比对自动发现。
+        返回 (executives, relationships, delta)；源数据顺序变化等无法增量的情况返回 None。
+        """
+        id_map = defaultdict(list)
+        for e in prev_executives:
+            id_map[f"{e['name']}|{e['company']}"].append(e["id"])
+        executives = self.build_executives(id_map)
+
+        changes = diff_executives(prev_executives, executives, changed_keys)
+        if changes is None:
+            return None
+        relationships, delta = mine_delta(
+            RELATION_TYPES, group_members(prev_executives), group_members(executives),
+            prev_relationships, changes,
+        )
+        return executives, relationships, delta
 
-with open(out_exec, "w", encoding="utf-8") as f:
-    json.dump(executives, f, ensure_ascii=False, indent=2)
-print(f"\n已写出: {out_exec}")
 
-with open(out_rel, "w", encoding="utf-8") as f:
-    json.dump(relationships, f, ensure_ascii=False, indent=2)
-print(f"已写出: {out_rel}")
-
-print("\n完成！")
+# ── 输出 ──────────────────────────────────────────────────
+def print_type_counts(relationships: list[dict], before: dict[str, int] | None = None):
+    """before：对比基准（--bio-scan recall 补入前的各类边数），给出时同时打印变化。"""
+    print(f"\n关系总数（去重后）: {len(relationships)}")
+    type_count = defaultdict(int)
+    for r in relationships:
+        type_count[r["type"]] += 1
+    if before is not None:
+        print(f"  （recall 补入前 {sum(before.values())}）")
+    for t in sorted(type_count.keys() | (before or {}).keys()):
+        c = type_count[t]
+        if before is None:
+            print(f"  {t}: {c}")
+        else:
+            print(f"  {t}: {before.get(t, 0)} → {c}（{c - before.get(t, 0):+d}）")
+
+
+def attach_metrics(executives: list[dict], relationships: list[dict]):
+    """离线图指标（连接度 / 连通分量 / PageRank / 社区）写入每位高管的 "metrics" 字段。"""
+    started = time.perf_counter()
+    metrics = compute_metrics(executives, relationships, TYPE_CODES)
+    if metrics is None:
+        print("未安装 numpy / scipy，跳过图指标计算")
+        return
+    for e in executives:
+        e["metrics"] = metrics[e["id"]]
+    print(f"图指标耗时: {(time.perf_counter() - started)*1000:.0f}ms")
+
+
+def write_outputs(executives: list[dict], relationships: list[dict], data_dir: str = DATA_DIR,
+                  resolve_company=None, backbone_budget: int | None = None, backbone_k: int = TOP_K):
+    """
+    resolve_company：career_path 原始公司名 → 标准名（RelationshipMiner.canonical_company），用于公司级图。
+    backbone_budget：给出时另写出该边数的骨干边集。
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    out_exec = os.path.join(data_dir, "executives.json")
+    out_rel  = os.path.join(data_dir, "relationships.json")
+
+    with open(out_exec, "w", encoding="utf-8") as f:
+        json.dump(executives, f, ensure_ascii=False, indent=2)
+    print(f"\n已写出: {out_exec}")
+
+    with open(out_rel, "w", encoding="utf-8") as f:
+        json.dump(relationships, f, ensure_ascii=False, indent=2)
+    print(f"已写出: {out_rel}")
+
+    # 二进制边文件：与 JSON 对比体积和解析耗时
+    out_bin = os.path.join(data_dir, "relationships.bin")
+    bin_data = encode_edges(relationships)
+    bin_info = write_precompressed(out_bin, bin_data)
+    with open(out_rel, "rb") as f:
+        json_data = f.read()
+    t0 = time.perf_counter(); json.loads(json_data)
+    t_json = time.perf_counter() - t0
+    t0 = time.perf_counter(); decode_edges(bin_data)
+    t_bin = time.perf_counter() - t0
+    print(f"已写出: {out_bin}  {len(json_data)/1024:.0f}KB → {len(bin_data)/1024:.0f}KB"
+          f"（gz {bin_info['gz_bytes']/1024:.0f}KB），解析 {t_json*1000:.1f}ms → {t_bin*1000:.2f}ms")
+
+    # 分组成员关系（超边）：完整成员列表，按需展开为高管对
+    out_groups = os.path.join(data_dir, "groups.json")
+    groups = group_members(executives)
+    g_info = write_groups(build_groups(RELATION_TYPES, groups), out_groups)
+    print(f"已写出: {out_groups}  {g_info['groups']} 个分组 / {g_info['memberships']} 条成员关系"
+          f"（完整展开 {g_info['pairs_full']} 对），{g_info['bytes']/1024:.0f}KB → gz {g_info['gz_bytes']/1024:.0f}KB")
+
+    # 分区紧凑文件（前端首屏只加载所选地区）
+    regions_dir = os.path.join(data_dir, "regions")
+    manifest = write_region_shards(executives, relationships, regions_dir)
+    print(f"已写出: {regions_dir}/（数据版本 {manifest['version']}）")
+    for name, info in manifest["files"].items():
+        sizes = f"{info['bytes']/1024:.0f}KB → gz {info['gz_bytes']/1024:.0f}KB"
+        if "br_bytes" in info:
+            sizes += f" / br {info['br_bytes']/1024:.0f}KB"
+        print(f"  {name:<30} {info['count']:>6} 条  {sizes}")
+
+    # 骨干边集（渲染预算）：完整边集仍在 relationships.json
+    if backbone_budget is not None:
+        group_sizes = {(rel_type, label): min(len(ids), cap)
+                       for rel_type, _, cap, _ in RELATION_TYPES
+                       for label, ids in groups[rel_type].items()}
+        result = extract_backbone(executives, relationships, group_sizes, backbone_budget, backbone_k)
+        if result is None:
+            print("跳过骨干边集：需要 numpy（pip install numpy）")
+        else:
+            backbone, stats = result
+            out_bb = os.path.join(data_dir, "relationships.backbone.json")
+            bb_info = write_precompressed(out_bb, compact_json(backbone))
+            write_precompressed(os.path.join(data_dir, "relationships.backbone.bin"), encode_edges(backbone))
+            counts = defaultdict(int)
+            for r in backbone:
+                counts[r["type"]] += 1
+            if stats["sparsified"]:
+                cutoff = f"，α ≤ {stats['alpha_cutoff']:.3g}" if stats["alpha_cutoff"] is not None else ""
+                how = f"top-{backbone_k} {stats['top_k']}，disparity {stats['disparity']}{cutoff}"
+            else:
+                how = "未超出预算，全部保留，未做筛选"
+            print(f"已写出: {out_bb}  {len(backbone)}/{len(relationships)} 条（{how}），"
+                  f"{bb_info['bytes']/1024:.0f}KB → gz {bb_info['gz_bytes']/1024:.0f}KB")
+            print("  " + "  ".join(f"{t}: {counts[t]}" for t, *_ in RELATION_TYPES))
+
+    # 公司级聚合图（前端先渲染公司，放大再展开为人员）
+    company_graph = build_company_graph(executives, RELATION_TYPES, resolve_company)
+    if company_graph is None:
+        print("跳过公司级图：需要 numpy 和 scipy（pip install numpy scipy）")
+    else:
+        out_cg = os.path.join(data_dir, "company_graph.json")
+        cg_info = write_company_graph(company_graph, out_cg)
+        edges = "，".join(f"{k} {v}" for k, v in cg_info["edges"].items())
+        print(f"已写出: {out_cg}  {cg_info['companies']} 家公司，{edges} 条边，"
+              f"{cg_info['bytes']/1024:.0f}KB → gz {cg_info['gz_bytes']/1024:.0f}KB")
+
+    # 连接索引（「从我认识的人到 X 的最短路径」）
+    started = time.perf_counter()
+    conn_index = ConnectionIndex.build(executives, relationships)
+    if conn_index is None:
+        print("跳过连接索引：需要 numpy 和 scipy（pip install numpy scipy）")
+    else:
+        out_conn = os.path.join(data_dir, "connections.bin")
+        c_info = write_precompressed(out_conn, conn_index.to_bytes())
+        stats = conn_index.stats()
+        print(f"已写出: {out_conn}  {stats['landmarks']} 个地标覆盖 {stats['covered']}/{stats['nodes']} 人，"
+              f"{c_info['bytes']/1024:.0f}KB → gz {c_info['gz_bytes']/1024:.0f}KB，"
+              f"{(time.perf_counter() - started)*1000:.0f}ms")
+
+    # 一跳邻域分桶文件（详情页按需加载）
+    ego_dir = os.path.join(data_dir, "ego")
+    index = write_ego_shards(executives, relationships, [t for t, _, _, _ in RELATION_TYPES], ego_dir)
+    shard_sizes = sorted(b["gz_bytes"] for b in index["buckets"].values())
+    if shard_sizes:
+        print(f"已写出: {ego_dir}/  {len(shard_sizes)} 个桶（每桶 {index['bucket_size']} 个 id），"
+              f"gz 中位 {shard_sizes[len(shard_sizes)//2]/1024:.1f}KB / 最大 {shard_sizes[-1]/1024:.1f}KB")
+
+
+def write_mode(data_dir: str, mode: dict):
+    with open(os.path.join(data_dir, MODE_FILE), "w", encoding="utf-8") as f:
+        json.dump(mode, f, ensure_ascii=False, indent=2)
+
+
+def load_previous(data_dir: str, mode: dict) -> tuple[list, list] | str:
+    """上次的 (executives, relationships)；无法在其基础上增量时返回原因。"""
+    out_exec = os.path.join(data_dir, "executives.json")
+    out_rel  = os.path.join(data_dir, "relationships.json")
+    out_mode = os.path.join(data_dir, MODE_FILE)
+    if not (os.path.exists(out_exec) and os.path.exists(out_rel)):
+        return "未找到上次输出"
+    if not os.path.exists(out_mode):
+        return f"上次输出缺少 {MODE_FILE}，挖掘模式未知"
+    with open(out_mode, encoding="utf-8") as f:
+        prev_mode = json.load(f)
+    if prev_mode != mode:
+        diff = "，".join(f"{k} {prev_mode.get(k)} → {v}" for k, v in mode.items() if prev_mode.get(k) != v)
+        return f"挖掘模式与上次输出不同（{diff}）"
+    with open(out_exec, encoding="utf-8") as f:
+        prev_executives = json.load(f)
+    with open(out_rel, encoding="utf-8") as f:
+        prev_relationships = json.load(f)
+    return prev_executives, prev_relationships
+
+
+def main():
+    parser = argparse.ArgumentParser(description="挖掘高管关系")
+    parser.add_argument("--source", default=SOURCE_FILE, help="源数据 00_全部数据.json")
+    parser.add_argument("--atoms", default=BIO_ATOMS_FILE, help="bio_atoms.json")
+    parser.add_argument("--canonical", default=CANONICAL_FILE, help="canonical_names.json")
+    parser.add_argument("--bio-scan", choices=["report", "recall"],
+                        help="简介原文实体扫描：report 只与 LLM 结果对照；recall 并补入漏提的实体")
+    parser.add_argument("--persons", default=PERSONS_FILE, help="person_ids.json（resolve_persons.py 输出，可缺省）")
+    parser.add_argument("--out-dir", default=DATA_DIR, help="输出目录（默认 public/data）")
+    parser.add_argument("--incremental", action="store_true",
+                        help="基于输出目录中的上次结果，只重算受变化影响的关系，并写出 relationships.delta.json")
+    parser.add_argument("--changed", action="append", metavar="姓名|公司",
+                        help="增量模式下只把这些高管视为变化（可重复；默认自动比对）")
+    parser.add_argument("--engine", choices=["python", "sparse"], default="python",
+                        help="sparse：numpy/scipy 稀疏矩阵挖掘，strength 随共享分组数增加（不支持 --incremental）")
+    parser.add_argument("--temporal", action="store_true",
+                        help="colleague / former 只连任期重叠的高管对，strength 随重叠年数增加（不支持 --incremental）")
+    parser.add_argument("--backbone-budget", type=int, metavar="N",
+                        help="另写出 N 条边的骨干边集 relationships.backbone.json（top-k + disparity filter）")
+    parser.add_argument("--backbone-k", type=int, default=TOP_K, help=f"骨干边集中每人保留的最强边数（默认 {TOP_K}）")
+    args = parser.parse_args()
+    if args.backbone_budget is not None and args.backbone_budget < 1:
+        parser.error("--backbone-budget 必须为正整数")
+    if args.engine == "sparse" and args.incremental:
+        parser.error("--engine sparse 不支持 --incremental")
+    if args.temporal and (args.incremental or args.engine == "sparse"):
+        parser.error("--temporal 不能与 --incremental 或 --engine sparse 同时使用")
+
+    miner = RelationshipMiner(*load_inputs(args.source, args.atoms, args.canonical),
+                              persons=PersonIndex.load(args.persons), bio_scan=args.bio_scan)
+    started = time.perf_counter()
+
+    # 增量结果沿用上次输出的关系，规则必须与上次一致
+    mode = {"engine": args.engine, "temporal": args.temporal, "bio_scan": args.bio_scan}
+    result = None
+    if args.incremental:
+        previous = load_previous(args.out_dir, mode)
+        if isinstance(previous, str):
+            print(f"{previous}，改为全量重建")
+        else:
+            result = miner.mine_incremental(*previous, changed_keys=set(args.changed or []) or None)
+            if result is None:
+                print("源数据顺序已变化，无法增量，改为全量重建")
+
+    if result is not None:
+        executives, relationships, delta = result
+        out_delta = os.path.join(args.out_dir, "relationships.delta.json")
+        with open(out_delta, "w", encoding="utf-8") as f:
+            json.dump(delta, f, ensure_ascii=False, indent=2)
+        s = delta["summary"]
+        print(f"\n增量: 高管 +{s['executives_added']} -{s['executives_removed']} ~{s['executives_changed']}  "
+              f"影响分组 {s['affected_groups']}  重算高管对 {s['recomputed_pairs']}")
+        print(f"      关系 +{s['relationships_added']} -{s['relationships_removed']} "
+              f"~{s['relationships_changed']}  → {out_delta}")
+    else:
+        executives, relationships, _successors = miner.mine(args.engine, temporal=args.temporal)
+    print(f"挖掘耗时: {(time.perf_counter() - started)*1000:.0f}ms")
+
+    before = None
+    if miner.recalled:
+        print("\n对比 recall 补入前的关系...")
+        before = miner.type_counts_without_recall(executives, temporal=args.temporal)
+    print_type_counts(relationships, before)
+    attach_metrics(executives, relationships)
+    write_outputs(executives, relationships, args.out_dir, resolve_company=miner.canonical_company,
+                  backbone_budget=args.backbone_budget, backbone_k=args.backbone_k)
+    write_mode(args.out_dir, mode)
+    print("\n完成！")
+
+
+if __name__ == "__main__":
+    main()
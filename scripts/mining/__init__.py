@@ -0,0 +1,6 @@
+"""
+mining — mine_relationships.py 的输出与挖掘组件
+
+mine_relationships.py 负责从 bio_atoms 构建高管与关系，本包提供其挖掘组件
+（职位标准化、增量挖掘等）与下游产物（分区数据文件等）的生成逻辑，便于单独导入与测试。
+"""
@@ -0,0 +1,150 @@
+"""
+analytics.py — 离线图指标（mine_relationships.py 写出前附加到每位高管的 "metrics" 字段）
+
+前端每次加载都要遍历全部关系来算连接度等结构信息；这里在挖掘阶段一次算好：
+
+  metrics = {
+    "degree":    {"total": 12, "colleague": 9, "alumni": 3, ...},   # 各类型连接度
+    "component": 0,        # 连通分量编号（按分量大小降序编号，0 为最大分量）
+    "pagerank":  1.8342,   # 加权 PageRank × 节点数（均值为 1，便于直接映射节点大小）
+    "community": 3,        # 标签传播社区编号（按社区大小降序编号）
+  }
+
+全部基于 scipy.sparse 的 CSR 邻接矩阵（权重为 strength）做向量化计算，
+10 万节点、百万级边在数秒内完成。依赖 numpy + scipy（可选依赖：未安装时跳过本步骤）。
+"""
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # 可选依赖：pip install numpy scipy
+    np = sp = None
+
+DAMPING = 0.85
+PAGERANK_TOL = 1e-10
+PAGERANK_MAX_ITER = 100
+LPA_MAX_ITER = 50
+LPA_MIN_CHANGE = 1e-3   # 一轮内改变标签的节点占比低于此值即视为收敛
+LPA_SEED = 42
+
+
+def adjacency(n: int, src, tgt, weight):
+    """对称加权邻接矩阵（CSR），重复边权重相加。"""
+    rows = np.concatenate([src, tgt])
+    cols = np.concatenate([tgt, src])
+    data = np.concatenate([weight, weight]).astype(np.float64)
+    a = sp.csr_matrix((data, (rows, cols)), shape=(n, n))
+    a.sum_duplicates()
+    return a
+
+
+def degree_by_type(n: int, src, tgt, type_codes, types: list[str]) -> dict[str, "np.ndarray"]:
+    degrees = {"total": np.bincount(src, minlength=n) + np.bincount(tgt, minlength=n)}
+    for code, name in enumerate(types):
+        mask = type_codes == code
+        if mask.any():
+            degrees[name] = (np.bincount(src[mask], minlength=n) +
+                             np.bincount(tgt[mask], minlength=n))
+    return degrees
+
+
+def relabel_by_size(labels):
+    """把任意编号改为按组大小降序的 0..k-1（大小相同按原编号），返回 (新编号, 各组大小)。"""
+    uniq, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    order = np.lexsort((uniq, -counts))
+    rank = np.empty(len(uniq), dtype=np.int64)
+    rank[order] = np.arange(len(uniq))
+    return rank[inverse], counts[order]
+
+
+def pagerank(a, damping: float = DAMPING):
+    """加权 PageRank（幂迭代）；孤立节点的权重均匀分给所有节点。"""
+    n = a.shape[0]
+    out_weight = np.asarray(a.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv = np.zeros(n)
+    inv[~dangling] = 1.0 / out_weight[~dangling]
+    transition = sp.diags(inv) @ a          # 行归一化
+    transition_t = transition.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(PAGERANK_MAX_ITER):
+        spread = damping * (transition_t @ rank)
+        spread += (damping * rank[dangling].sum() + 1 - damping) / n
+        delta = np.abs(spread - rank).sum()
+        rank = spread
+        if delta < PAGERANK_TOL:
+            break
+    return rank
+
+
+def row_argmax(m):
+    """CSR 矩阵每行最大值所在列（并列取列号最小的）；要求每行至少一个非零元。"""
+    m.sort_indices()
+    counts = np.diff(m.indptr)
+    rows = np.repeat(np.arange(m.shape[0]), counts)
+    row_max = np.maximum.reduceat(m.data, m.indptr[:-1])
+    hits = np.flatnonzero(m.data == row_max[rows])
+    hit_rows = rows[hits]
+    first = hits[np.r_[True, hit_rows[1:] != hit_rows[:-1]]]
+    return m.indices[first]
+
+
+def label_propagation(a, seed: int = LPA_SEED):
+    """
+    加权标签传播（半同步）：每轮随机选一半节点，取邻居中权重和最大的标签
+    （含自身当前标签，避免两两交替震荡；并列取编号最小的），直到几乎没有节点再改变标签。
+    固定种子，结果可复现。
+    """
+    n = a.shape[0]
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n)
+    a_self = (a + sp.identity(n, format="csr") * 1e-9).tocsr()
+    for _ in range(LPA_MAX_ITER):
+        onehot = sp.csr_matrix((np.ones(n), (np.arange(n), labels)), shape=(n, n))
+        score = (a_self @ onehot).tocsr()
+        best = row_argmax(score)
+        update = rng.random(n) < 0.5
+        if (best != labels).sum() <= n * LPA_MIN_CHANGE:
+            break
+        labels = np.where(update, best, labels)
+    return labels
+
+
+def compute_metrics(executives: list[dict], relationships: list[dict],
+                    types: list[str]) -> dict[int, dict] | None:
+    """返回 {高管 id: metrics}；未安装 numpy / scipy 时返回 None。"""
+    if sp is None:
+        return None
+    n = len(executives)
+    if n == 0:
+        return {}
+    position = {e["id"]: i for i, e in enumerate(executives)}
+    type_index = {t: i for i, t in enumerate(types)}
+    edges = [r for r in relationships if r["source"] in position and r["target"] in position]
+    src = np.fromiter((position[r["source"]] for r in edges), dtype=np.int64, count=len(edges))
+    tgt = np.fromiter((position[r["target"]] for r in edges), dtype=np.int64, count=len(edges))
+    weight = np.fromiter((r["strength"] for r in edges), dtype=np.float64, count=len(edges))
+    codes = np.fromiter((type_index.get(r["type"], -1) for r in edges), dtype=np.int64, count=len(edges))
+
+    a = adjacency(n, src, tgt, weight)
+    degrees = degree_by_type(n, src, tgt, codes, types)
+    _, comp_raw = connected_components(a, directed=False)
+    components, comp_sizes = relabel_by_size(comp_raw)
+    ranks = pagerank(a) * n
+    communities, comm_sizes = relabel_by_size(label_propagation(a))
+
+    print(f"图指标: {len(comp_sizes)} 个连通分量（最大 {comp_sizes[0] if n else 0} 人），"
+          f"{len(comm_sizes)} 个社区（最大 {comm_sizes[0] if n else 0} 人）")
+
+    deg_lists = {k: v.tolist() for k, v in degrees.items()}
+    comp_list, rank_list, comm_list = components.tolist(), ranks.tolist(), communities.tolist()
+    return {
+        e["id"]: {
+            "degree":    {k: v[i] for k, v in deg_lists.items() if v[i] or k == "total"},
+            "component": comp_list[i],
+            "pagerank":  round(rank_list[i], 4),
+            "community": comm_list[i],
+        }
+        for i, e in enumerate(executives)
+    }
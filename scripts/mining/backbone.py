@@ -0,0 +1,95 @@
+"""
+backbone.py — 关系骨干提取（mine_relationships.py --backbone-budget）
+
+relationships.json 中 colleague 等大分组的组内全配对占了绝大多数边，信息量却很低。
+本模块按边预算挑出骨干边集，写出 relationships.backbone.json（完整边集仍在 relationships.json）：
+
+  边权   w = strength / (分组规模 - 1)，即二分图投影的 Newman 权重：
+         每人在一个分组里的「关注度」平均分给组内其他人，大分组的边权小
+  top-k  每个节点按 w 降序的前 k 条边（保证每人都留有最强的连接）
+  disparity filter（Serrano et al. 2009）：在每种关系类型的子图上，节点 i 的边 p = w / s_i，
+         α = (1 - p)^(k_i - 1) 是「均匀分配下出现这么大 p」的概率；α 越小边越显著，
+         边的 α 取两端较小者
+
+选边顺序：先按 top-k 名次（两端较好者）取名次 < k 的边，再按 α 升序取其余边，
+直到达到预算；名次 / α 相同时保持 relationships.json 中的顺序。输出保持原顺序。
+
+依赖 numpy（可选依赖：未安装时跳过本步骤）。
+"""
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖：pip install numpy
+    np = None
+
+TOP_K = 2
+
+
+def newman_weights(relationships: list[dict], group_sizes: dict[tuple[str, str], int]):
+    """每条边的 w；分组规模取 (类型, label) 对应的参与配对人数，未知时按 2 人计。"""
+    return np.array([r["strength"] / max(1, group_sizes.get((r["type"], r["label"]), 2) - 1)
+                     for r in relationships], dtype=np.float64)
+
+
+def endpoint_ranks(n: int, src, tgt, w):
+    """每条边在两端节点各自的边列表（按 w 降序、原顺序）中的名次，返回两端较好者。"""
+    m = len(src)
+    node = np.concatenate([src, tgt])
+    edge = np.concatenate([np.arange(m), np.arange(m)])
+    order = np.lexsort((edge, -np.concatenate([w, w]), node))
+    sorted_node = node[order]
+    starts = np.searchsorted(sorted_node, np.arange(n))
+    rank = np.empty(2 * m, dtype=np.int64)
+    rank[order] = np.arange(2 * m) - starts[sorted_node]
+    return np.minimum(rank[:m], rank[m:])
+
+
+def disparity_alpha(n: int, src, tgt, w, type_codes):
+    """每条边在其类型子图上的 disparity α（两端较小者）；端点度为 1 时该端 α 记 1。"""
+    alpha = np.ones(len(src))
+    for code in np.unique(type_codes):
+        mask = type_codes == code
+        s, t, ww = src[mask], tgt[mask], w[mask]
+        strength = np.bincount(s, ww, minlength=n) + np.bincount(t, ww, minlength=n)
+        degree = np.bincount(s, minlength=n) + np.bincount(t, minlength=n)
+
+        def side(v):
+            return np.where(degree[v] > 1, (1 - ww / strength[v]) ** (degree[v] - 1), 1.0)
+        alpha[mask] = np.minimum(side(s), side(t))
+    return alpha
+
+
+def extract_backbone(executives: list[dict], relationships: list[dict],
+                     group_sizes: dict[tuple[str, str], int], budget: int,
+                     top_k: int = TOP_K) -> tuple[list[dict], dict] | None:
+    """
+    返回 (骨干边列表（原顺序）, 统计)；未安装 numpy 时返回 None。
+    边数不超过预算时原样返回全部边，统计中 sparsified 为 False（没有做 top-k / disparity 筛选）。
+    """
+    if np is None:
+        return None
+    position = {e["id"]: i for i, e in enumerate(executives)}
+    rows = [r for r in relationships if r["source"] in position and r["target"] in position]
+    if len(rows) <= budget:
+        return rows, {"sparsified": False, "top_k": 0, "disparity": 0, "alpha_cutoff": None}
+
+    src = np.fromiter((position[r["source"]] for r in rows), dtype=np.int64, count=len(rows))
+    tgt = np.fromiter((position[r["target"]] for r in rows), dtype=np.int64, count=len(rows))
+    types = {t: i for i, t in enumerate(dict.fromkeys(r["type"] for r in rows))}
+    codes = np.fromiter((types[r["type"]] for r in rows), dtype=np.int64, count=len(rows))
+    w = newman_weights(rows, group_sizes)
+
+    rank = endpoint_ranks(len(executives), src, tgt, w)
+    alpha = disparity_alpha(len(executives), src, tgt, w, codes)
+    in_top = rank < top_k
+    order = np.lexsort((np.arange(len(rows)), alpha, np.where(in_top, rank, top_k)))
+    chosen = np.sort(order[:budget])
+
+    n_top = int(in_top[chosen].sum())
+    stats = {
+        "sparsified":   True,
+        "top_k":        n_top,
+        "disparity":    len(chosen) - n_top,
+        "alpha_cutoff": float(alpha[order[budget - 1]]) if len(chosen) > n_top else None,
+    }
+    return [rows[i] for i in chosen.tolist()], stats
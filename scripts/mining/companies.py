@@ -0,0 +1,112 @@
+"""
+companies.py — 历史公司名 → 标准机构名（mine_relationships.py 处理 career / board_roles 时调用）
+
+匹配规则与原 normalize_company 相同：
+  1. 变体表（canonical_names.json companies）命中 → 规范名
+  2. 本身就是标准机构名 → 原样返回
+  （1、2 原样未命中时按规范化键再查一次：繁简、全半角、大小写、标点折叠，见 textkey.py）
+  3. 长度 ≥ 8 时做包含匹配：name 是某标准名的子串，
+     或某标准名是 name 的子串且 name 最多比它长 4 个字
+
+原实现第 3 步对每个未命中的名字遍历全部标准名做子串判断。CompanyResolver 对标准名
+建字符二元组（bigram）倒排索引，子串关系要求短的一方的每个 bigram 都出现在长的一方中：
+  - name ⊂ 标准名：候选只取 name 最稀有的 bigram 的倒排表
+  - 标准名 ⊂ name：每个标准名按其最稀有的 bigram 登记一次，候选只取 name 的各 bigram 下登记的标准名
+「保险」「公司」这类几乎每个标准名都有的 bigram 因此不会产生大批候选。结果按原始名字缓存。
+
+多个标准名同时满足包含条件时，原实现取决于集合遍历顺序（随 PYTHONHASHSEED 变化）；
+这里固定取长度最接近 name 的一个，长度相同按字典序。
+"""
+
+from collections import defaultdict
+
+from mining.textkey import KeyedLookup
+
+MIN_LEN = 4          # 短于此长度的名字不匹配
+MIN_FUZZY_LEN = 8    # 短于此长度的名字只做精确匹配
+MAX_EXTRA_CHARS = 4  # 标准名是 name 的子串时，name 最多多出的字数
+
+
+def bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class CompanyResolver:
+    """标准机构库 + bigram 倒排索引 + 结果缓存。"""
+
+    def __init__(self, known, variant_map: dict[str, str] | None = None):
+        self.known = set(known)
+        self.variant_map = dict(variant_map or {})
+        # 变体表优先于标准名（与原来的查找顺序一致）
+        self.lookup = KeyedLookup(self.variant_map)
+        for name in sorted(self.known):
+            self.lookup.add(name, name)
+        # bigram → 含该 bigram 的标准名
+        self.index: dict[str, list[str]] = defaultdict(list)
+        for name in sorted(self.known):
+            for g in bigrams(name):
+                self.index[g].append(name)
+        # 最稀有 bigram → 以它登记的标准名
+        self.by_rarest: dict[str, list[str]] = defaultdict(list)
+        for name in sorted(self.known):
+            grams = bigrams(name)
+            if grams:
+                self.by_rarest[self._rarest(grams)].append(name)
+        self.cache: dict[str, str | None] = {}
+        self.calls = 0
+        self.hits  = 0
+        self.checked = 0   # 实际做子串判断的候选数
+
+    def match(self, raw_name: str) -> str | None:
+        """将 LLM 提取的公司名匹配到标准机构库，无法匹配时返回 None。"""
+        self.calls += 1
+        name = (raw_name or "").strip()
+        if name in self.cache:
+            self.hits += 1
+            return self.cache[name]
+        result = self._match(name)
+        self.cache[name] = result
+        return result
+
+    def match_all(self, raw_names) -> dict[str, str | None]:
+        """批量匹配：对去重后的名字各解析一次，返回 {原始名: 标准名或 None}。"""
+        return {raw: self.match(raw) for raw in dict.fromkeys(raw_names)}
+
+    def stats(self) -> dict:
+        return {
+            "calls":    self.calls,
+            "hits":     self.hits,
+            "hit_rate": self.hits / self.calls if self.calls else 0.0,
+            "checked":  self.checked,
+            "known":    len(self.known),
+        }
+
+    def _rarest(self, grams: set[str]) -> str:
+        return min(grams, key=lambda g: (len(self.index.get(g, ())), g))
+
+    def _match(self, name: str) -> str | None:
+        if not name or len(name) < MIN_LEN:
+            return None
+        exact = self.lookup.get(name)
+        if exact is not None:
+            return exact
+        if len(name) < MIN_FUZZY_LEN:
+            return None
+
+        grams = bigrams(name)
+        matches = []
+        # name ⊂ known
+        for known in self.index.get(self._rarest(grams), ()):
+            self.checked += 1
+            if name in known:
+                matches.append(known)
+        # known ⊂ name
+        for g in grams:
+            for known in self.by_rarest.get(g, ()):
+                if len(name) <= len(known) + MAX_EXTRA_CHARS and known not in matches:
+                    self.checked += 1
+                    if known in name:
+                        matches.append(known)
+        if not matches:
+            return None
+        return min(matches, key=lambda k: (abs(len(k) - len(name)), k))
@@ -0,0 +1,161 @@
+"""
+delta.py — 关系挖掘的增量模式（mine_relationships.py --incremental）
+
+全量挖掘对每个分组（公司 / 院校 / 历史公司 / 监管机构）做组内两两配对；
+少数高管变化时，只有包含这些高管的分组会变，其余高管对的最优关系不变：
+
+  1. diff_executives：沿用旧 id 构建新高管列表后，比对出新增 / 删除 / 变化的高管
+  2. 受影响分组 = 变化高管在旧、新数据中所属的分组
+  3. 受影响高管对 = 受影响分组（旧、新两侧）在配对上限内的所有高管对
+  4. 逐对重算最优关系：按 RELATION_TYPES 顺序取第一个命中的类型，
+     同类型内取最先出现的分组；source 为该分组中位置靠前的一方
+  5. 其余关系沿用上次输出，最后按全量挖掘的首次出现顺序排序
+
+未增删高管时输出与全量重建逐字节一致；有增删时 id 沿用旧值（新增从最大 id 往后编号）。
+"""
+
+from collections import defaultdict
+from itertools import combinations
+
+from mining.edges import pack_pair, unpack_pair
+
+
+# 写出前才附加的派生字段（图指标等），比对高管是否变化时忽略
+DERIVED_KEYS = ("metrics",)
+
+
+def _key(e: dict) -> str:
+    return f"{e['name']}|{e['company']}"
+
+
+def _core(e: dict) -> dict:
+    return {k: v for k, v in e.items() if k not in DERIVED_KEYS}
+
+
+def diff_executives(prev: list[dict], new: list[dict],
+                    changed_keys: set[str] | None = None) -> dict | None:
+    """
+    返回 {"added", "removed", "changed"}（均为 id 列表）。
+    未变化高管的相对顺序改变时返回 None（分组内顺序和配对上限都会变，需全量重建）。
+    """
+    prev_by_id = {e["id"]: e for e in prev}
+    new_by_id  = {e["id"]: e for e in new}
+
+    common_prev = [e["id"] for e in prev if e["id"] in new_by_id]
+    common_new  = [e["id"] for e in new if e["id"] in prev_by_id]
+    if common_prev != common_new:
+        return None
+
+    if changed_keys is None:
+        changed = [i for i in common_new if _core(prev_by_id[i]) != _core(new_by_id[i])]
+    else:
+        changed = [i for i in common_new if _key(new_by_id[i]) in changed_keys]
+    return {
+        "added":   [e["id"] for e in new if e["id"] not in prev_by_id],
+        "removed": [e["id"] for e in prev if e["id"] not in new_by_id],
+        "changed": changed,
+    }
+
+
+def _affected_pairs(relation_types, groups: dict, touched: set[int]) -> tuple[set, int]:
+    """受影响分组内、配对上限以内的所有高管对（pack_pair 键）。"""
+    pairs, n_groups = set(), 0
+    for rel_type, _, cap, _ in relation_types:
+        for ids in groups[rel_type].values():
+            if touched.isdisjoint(ids):
+                continue
+            n_groups += 1
+            pairs.update(pack_pair(a, b) for a, b in combinations(ids[:cap], 2))
+    return pairs, n_groups
+
+
+class _BestEdge:
+    """按新分组计算任意高管对的最优关系（与全量挖掘的去重规则一致）。"""
+
+    def __init__(self, relation_types, groups: dict):
+        self.relation_types = relation_types
+        self.type_index = {t: i for i, (t, *_) in enumerate(relation_types)}
+        # id → {(类型序号, 分组序号): 组内位置}，只记录配对上限以内的位置
+        self.member_of = defaultdict(dict)
+        # 类型 → {分组 key: 分组序号}，类型 → [分组 key]
+        self.rank, self.labels = {}, {}
+        for t_idx, (rel_type, _, cap, _) in enumerate(relation_types):
+            self.rank[rel_type] = {}
+            self.labels[rel_type] = list(groups[rel_type])
+            for g_idx, (label, ids) in enumerate(groups[rel_type].items()):
+                self.rank[rel_type][label] = g_idx
+                for pos, i in enumerate(ids[:cap]):
+                    self.member_of[i][(t_idx, g_idx)] = pos
+
+    def edge(self, pair: int) -> dict | None:
+        a, b = unpack_pair(pair)
+        if a == b:
+            return None
+        ma, mb = self.member_of.get(a), self.member_of.get(b)
+        if not ma or not mb:
+            return None
+        shared = ma.keys() & mb.keys()
+        if not shared:
+            return None
+        t_idx, g_idx = min(shared)
+        rel_type, strength, _, _ = self.relation_types[t_idx]
+        label = self.labels[rel_type][g_idx]
+        src, tgt = (a, b) if ma[(t_idx, g_idx)] < mb[(t_idx, g_idx)] else (b, a)
+        return {"source": src, "target": tgt,
+                "type": rel_type, "strength": strength, "label": label}
+
+    def order_key(self, r: dict) -> tuple:
+        """全量挖掘中该高管对首次出现的顺序：(类型, 分组, 组内位置)。"""
+        t_idx = self.type_index[r["type"]]
+        g_idx = self.rank[r["type"]].get(r["label"], len(self.rank[r["type"]]))
+        pos = self.member_of.get(r["source"], {}).get((t_idx, g_idx), 0)
+        pos_t = self.member_of.get(r["target"], {}).get((t_idx, g_idx), 0)
+        return t_idx, g_idx, pos, pos_t
+
+
+def mine_delta(relation_types, old_groups: dict, new_groups: dict,
+               prev_relationships: list[dict], changes: dict) -> tuple[list[dict], dict]:
+    """返回 (新的关系列表, delta)。"""
+    touched = set(changes["added"]) | set(changes["removed"]) | set(changes["changed"])
+
+    old_pairs, n_old = _affected_pairs(relation_types, old_groups, touched)
+    new_pairs, n_new = _affected_pairs(relation_types, new_groups, touched)
+    pairs = old_pairs | new_pairs
+
+    edges = {pack_pair(r["source"], r["target"]): r for r in prev_relationships}
+    best = _BestEdge(relation_types, new_groups)
+
+    added, removed, changed = [], [], []
+    for pair in pairs:
+        old = edges.get(pair)
+        new = best.edge(pair)
+        if new is None:
+            if old is not None:
+                del edges[pair]
+                removed.append([old["source"], old["target"]])
+        elif old is None:
+            edges[pair] = new
+            added.append(new)
+        elif old != new:
+            edges[pair] = new
+            changed.append(new)
+
+    relationships = sorted(edges.values(), key=best.order_key)
+    for rows in (added, changed, removed):
+        rows.sort(key=lambda r: (r["source"], r["target"]) if isinstance(r, dict) else tuple(r))
+
+    delta = {
+        "executives": {k: sorted(v) for k, v in changes.items()},
+        "relationships": {"added": added, "removed": removed, "changed": changed},
+        "summary": {
+            "executives_added":      len(changes["added"]),
+            "executives_removed":    len(changes["removed"]),
+            "executives_changed":    len(changes["changed"]),
+            "affected_groups":       max(n_old, n_new),
+            "recomputed_pairs":      len(pairs),
+            "relationships_added":   len(added),
+            "relationships_removed": len(removed),
+            "relationships_changed": len(changed),
+        },
+    }
+    return relationships, delta
@@ -0,0 +1,161 @@
+"""
+edge_binary.py — 关系边的二进制格式（relationships.bin）
+
+relationships.json 每条边都重复 "type" / "strength" 和完整公司名 label；
+二进制格式把各字段存成连续的定长数组，浏览器端可直接包成 TypedArray，
+Python 端可直接 numpy.frombuffer，均无需逐条解析。
+
+布局（小端序，所有数组起点 4 字节对齐）：
+
+  偏移            类型              内容
+  0               char[4]           magic "A60E"
+  4               uint16            版本（FORMAT_VERSION）
+  6               uint16            保留
+  8               uint32            边数 n
+  12              uint32            字符串表偏移
+  16              uint32            字符串表字节数
+  20..31          —                 保留
+  32              Int32[n]          source
+  32 + 4n         Int32[n]          target
+  32 + 8n         Float32[n]        strength
+  32 + 12n        Uint16[n]         label 下标（指向字符串表 labels）
+  32 + 14n        Uint8[n]          type 代码（指向字符串表 types）
+  字符串表偏移     UTF-8 JSON        {"types": [...], "labels": [...]}
+
+Python 端读取见 decode_edges()；浏览器端按上表直接在 ArrayBuffer 上建 TypedArray 视图即可。
+"""
+
+import json
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖：无 numpy 时用 memoryview 零拷贝视图
+    np = None
+
+MAGIC = b"A60E"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIII12x")   # 32 字节
+HEADER_SIZE = HEADER.size
+
+# 固定的类型代码顺序；新类型追加在末尾，已有代码不变
+TYPE_CODES = ["colleague", "alumni", "former", "regulator", "successor"]
+
+
+def _section_offsets(n: int) -> dict:
+    return {
+        "source":   HEADER_SIZE,
+        "target":   HEADER_SIZE + 4 * n,
+        "strength": HEADER_SIZE + 8 * n,
+        "label":    HEADER_SIZE + 12 * n,
+        "type":     HEADER_SIZE + 14 * n,
+        "end":      HEADER_SIZE + 15 * n,
+    }
+
+
+def encode_edges(relationships: list[dict]) -> bytes:
+    """relationships.json 的列表 → 二进制格式。"""
+    types = list(TYPE_CODES)
+    type_index = {t: i for i, t in enumerate(types)}
+    labels: list[str] = []
+    label_index: dict[str, int] = {}
+
+    n = len(relationships)
+    source, target = array("i"), array("i")
+    strength, label, rtype = array("f"), array("H"), array("B")
+    for r in relationships:
+        t = r["type"]
+        if t not in type_index:
+            type_index[t] = len(types)
+            types.append(t)
+        lb = r.get("label") or ""
+        if lb not in label_index:
+            if len(labels) > 0xFFFF:
+                raise ValueError(f"label 数超出 Uint16 范围（{0xFFFF + 1}）")
+            label_index[lb] = len(labels)
+            labels.append(lb)
+        source.append(r["source"])
+        target.append(r["target"])
+        strength.append(r["strength"])
+        label.append(label_index[lb])
+        rtype.append(type_index[t])
+
+    if sys.byteorder != "little":
+        for arr in (source, target, strength, label):
+            arr.byteswap()
+
+    offsets = _section_offsets(n)
+    strings_offset = (offsets["end"] + 3) & ~3
+    strings = json.dumps({"types": types, "labels": labels},
+                         ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION, 0, n, strings_offset, len(strings)),
+        source.tobytes(), target.tobytes(), strength.tobytes(),
+        label.tobytes(), rtype.tobytes(),
+        b"\0" * (strings_offset - offsets["end"]),
+        strings,
+    ]
+    return b"".join(parts)
+
+
+def decode_edges(buf) -> dict:
+    """
+    二进制格式 → {"source", "target", "strength", "label", "type", "types", "labels"}。
+    数组均为 buf 上的零拷贝视图：有 numpy 时为 ndarray，否则为 memoryview。
+    """
+    magic, version, _, n, strings_offset, strings_len = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("不是 relationships.bin 格式")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"不支持的版本 {version}")
+    off = _section_offsets(n)
+    strings = json.loads(bytes(buf[strings_offset:strings_offset + strings_len]).decode("utf-8"))
+
+    if np is not None:
+        def view(name, dtype):
+            return np.frombuffer(buf, dtype=dtype, count=n, offset=off[name])
+        arrays = {
+            "source":   view("source", "<i4"),
+            "target":   view("target", "<i4"),
+            "strength": view("strength", "<f4"),
+            "label":    view("label", "<u2"),
+            "type":     view("type", "u1"),
+        }
+    else:
+        if sys.byteorder != "little":
+            raise RuntimeError("大端平台请安装 numpy")
+        mv = memoryview(buf)
+        arrays = {
+            "source":   mv[off["source"]:off["target"]].cast("i"),
+            "target":   mv[off["target"]:off["strength"]].cast("i"),
+            "strength": mv[off["strength"]:off["label"]].cast("f"),
+            "label":    mv[off["label"]:off["type"]].cast("H"),
+            "type":     mv[off["type"]:off["end"]],
+        }
+    return {**arrays, "types": strings["types"], "labels": strings["labels"]}
+
+
+def to_relationships(decoded: dict) -> list[dict]:
+    """解码结果 → relationships.json 的列表形式（strength 还原为 6 位小数）。"""
+    types, labels = decoded["types"], decoded["labels"]
+    return [
+        {"source": int(s), "target": int(t), "type": types[ty],
+         "strength": round(float(w), 6), "label": labels[lb]}
+        for s, t, w, lb, ty in zip(decoded["source"], decoded["target"],
+                                   decoded["strength"], decoded["label"], decoded["type"])
+    ]
+
+
+def write_edges(relationships: list[dict], path: str) -> int:
+    data = encode_edges(relationships)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def read_edges(path: str) -> dict:
+    with open(path, "rb") as f:
+        return decode_edges(f.read())
@@ -0,0 +1,105 @@
+"""
+edges.py — 按高管对去重的边累加器（mine_pairs / mine_temporal / 增量模式共用）
+
+原实现每个候选高管对都要新建 frozenset 作键、再为每条边建一个结果 dict。这里：
+
+  键     pack_pair(a, b) = (min << 32) | max，一个 int，无需额外对象
+  存储   各字段按列存入 array（source / target / 类型代码 / strength / label 下标），
+         label 驻留为下标，每条边只占一个 dict 槽位 + 约 20 字节
+  输出   to_list() 时才一次性生成 relationships.json 需要的 dict
+
+去重规则：同一对先写入的类型优先（调用方按 RELATION_TYPES 顺序写入）；
+同一类型内 strength 更高的替换旧边，相同时保留先出现的。输出按首次出现的顺序。
+"""
+
+from array import array
+from itertools import combinations
+
+PAIR_SHIFT = 32
+PAIR_MASK = (1 << PAIR_SHIFT) - 1
+
+
+def pack_pair(a: int, b: int) -> int:
+    """无序高管对 → 整数键（id 须为 0 ≤ id < 2³²）。"""
+    return (a << PAIR_SHIFT) | b if a < b else (b << PAIR_SHIFT) | a
+
+
+def unpack_pair(key: int) -> tuple[int, int]:
+    return key >> PAIR_SHIFT, key & PAIR_MASK
+
+
+class EdgeAccumulator:
+    """按 pack_pair 键去重的边集合，字段按列存放。"""
+
+    __slots__ = ("types", "labels", "_label_index", "_row", "_src", "_tgt", "_type", "_strength", "_label")
+
+    def __init__(self, types: list[str]):
+        self.types = list(types)
+        self.labels: list[str] = []
+        self._label_index: dict[str, int] = {}
+        self._row: dict[int, int] = {}        # pack_pair 键 → 行号
+        self._src = array("q")
+        self._tgt = array("q")
+        self._type = array("b")
+        self._strength = array("d")
+        self._label = array("l")
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._row
+
+    def label_code(self, label: str) -> int:
+        code = self._label_index.get(label)
+        if code is None:
+            code = self._label_index[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def add(self, a: int, b: int, type_code: int, strength: float, label_code: int) -> bool:
+        """写入一条边（source = a），返回是否新增了高管对。"""
+        key = (a << PAIR_SHIFT) | b if a < b else (b << PAIR_SHIFT) | a
+        row = self._row.get(key)
+        if row is None:
+            self._row[key] = len(self._src)
+            self._src.append(a)
+            self._tgt.append(b)
+            self._type.append(type_code)
+            self._strength.append(strength)
+            self._label.append(label_code)
+            return True
+        if self._type[row] == type_code and strength > self._strength[row]:
+            self._src[row], self._tgt[row] = a, b
+            self._strength[row] = strength
+            self._label[row] = label_code
+        return False
+
+    def add_group(self, members: list[int], type_code: int, strength: float, label_code: int) -> int:
+        """组内两两配对（a 在 members 中位置靠前）；热路径，局部变量展开 add()。返回配对数。"""
+        rows, src, tgt = self._row, self._src, self._tgt
+        types, strengths, labels = self._type, self._strength, self._label
+        count = 0
+        for a, b in combinations(members, 2):
+            count += 1
+            key = (a << PAIR_SHIFT) | b if a < b else (b << PAIR_SHIFT) | a
+            row = rows.get(key)
+            if row is None:
+                rows[key] = len(src)
+                src.append(a)
+                tgt.append(b)
+                types.append(type_code)
+                strengths.append(strength)
+                labels.append(label_code)
+            elif types[row] == type_code and strength > strengths[row]:
+                src[row], tgt[row] = a, b
+                strengths[row] = strength
+                labels[row] = label_code
+        return count
+
+    def to_list(self) -> list[dict]:
+        types, labels = self.types, self.labels
+        return [
+            {"source": s, "target": t, "type": types[c], "strength": w, "label": labels[lb]}
+            for s, t, c, w, lb in zip(self._src, self._tgt, self._type, self._strength, self._label)
+        ]
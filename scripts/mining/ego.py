@@ -0,0 +1,90 @@
+"""
+ego.py — 按高管 id 分桶的一跳邻域文件（侧边栏按需加载）
+
+打开一位高管的详情原本要求完整的 executives.json / relationships.json 都已在内存中。
+这里为每位高管预先整理好详情页需要的全部内容，按 id 区间分桶写出，
+详情页只需下载该高管所在的一个桶（几十 KB，gzip 后更小）：
+
+  public/data/ego/
+    index.json          {"version", "bucket_size", "count", "buckets": {桶号: 文件条目}}
+    ego.{桶号}.json      {"高管 id": {"exec": {...完整高管记录...}, "neighbors": [...]}, ...}
+    *.gz / *.br         预压缩副本
+
+  neighbors: [{"id", "name", "title", "company", "region", "type", "strength", "label"}, ...]
+  按关系类型（RELATION_TYPES 顺序）、strength 降序、relationships.json 中的顺序排列。
+
+桶号 = id // bucket_size。增量挖掘沿用旧 id，未受影响的桶内容不变、文件不重写，
+可直接用 sha256 作缓存键。
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+
+from mining.artifacts import compact_json, write_precompressed
+
+BUCKET_SIZE = 16
+SUMMARY_KEYS = ("name", "title", "company", "region")
+_SHARD_RE = re.compile(r"^ego\.(\d+)\.json(\.gz|\.br)?$")
+
+
+def build_ego(executives: list[dict], relationships: list[dict],
+              type_order: list[str]) -> dict[int, dict]:
+    """返回 {高管 id: {"exec", "neighbors"}}；两端不都在 executives 中的关系忽略。"""
+    by_id = {e["id"]: e for e in executives}
+    rank = {t: i for i, t in enumerate(type_order)}
+    adjacent = defaultdict(list)   # id → [(排序键, 邻居 id, 关系)]
+    for order, r in enumerate(relationships):
+        a, b = r["source"], r["target"]
+        if a not in by_id or b not in by_id:
+            continue
+        key = (rank.get(r["type"], len(rank)), -r["strength"], order)
+        adjacent[a].append((key, b, r))
+        adjacent[b].append((key, a, r))
+
+    ego = {}
+    for e in executives:
+        neighbors = []
+        for _, other_id, r in sorted(adjacent.get(e["id"], []), key=lambda x: x[0]):
+            other = by_id[other_id]
+            neighbors.append({"id": other_id, **{k: other.get(k) for k in SUMMARY_KEYS},
+                              "type": r["type"], "strength": r["strength"], "label": r["label"]})
+        ego[e["id"]] = {"exec": e, "neighbors": neighbors}
+    return ego
+
+
+def write_ego_shards(executives: list[dict], relationships: list[dict], type_order: list[str],
+                     out_dir: str, bucket_size: int = BUCKET_SIZE) -> dict:
+    """写出各桶文件与 index.json，删除已不存在的桶，返回 index。"""
+    os.makedirs(out_dir, exist_ok=True)
+    buckets = defaultdict(dict)
+    for exec_id, entry in build_ego(executives, relationships, type_order).items():
+        buckets[exec_id // bucket_size][str(exec_id)] = entry
+
+    files = {}
+    for bucket in sorted(buckets):
+        name = f"ego.{bucket}.json"
+        files[str(bucket)] = {"file": name, "count": len(buckets[bucket]),
+                              **write_precompressed(os.path.join(out_dir, name),
+                                                    compact_json(buckets[bucket]))}
+
+    # 高管减少（或 bucket_size 改变）后残留的旧桶
+    for fname in os.listdir(out_dir):
+        m = _SHARD_RE.match(fname)
+        if m and m.group(1) not in files:
+            os.remove(os.path.join(out_dir, fname))
+
+    version = hashlib.sha256(
+        "".join(files[b]["sha256"] for b in sorted(files, key=int)).encode("ascii")
+    ).hexdigest()[:16]
+    index = {
+        "version":     version,
+        "bucket_size": bucket_size,
+        "count":       len(executives),
+        "buckets":     files,
+    }
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return index
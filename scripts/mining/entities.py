@@ -0,0 +1,168 @@
+"""
+entities.py — 简介原文的规范实体扫描（Aho-Corasick 多模式匹配）
+
+canonical_names.json 原本只在 LLM 提取之后做精确查表（apply_canonical）。这里把三类实体
+的全部写法编译成一个 Aho-Corasick 自动机，每篇简介线性扫描一遍，得到带偏移的实体提及：
+
+  模式   canonical_names.json 各 section 的 key 与 value + 源数据中的公司名
+  结果   Mention(start, end, text, section, canonical)，同一位置取最长、互不重叠（leftmost-longest）
+
+模式与简介都先逐字符折叠（繁简、全半角、大小写，见 textkey.py；长度不变，偏移仍对应原文），
+繁体简介也能命中简体写法。拉丁字母要求前后不是字母数字（避免 "AIA" 命中 "MALAYSIA"）。
+短于 MIN_PATTERN_LEN 的写法不参与（如 "人保" 会命中「个人保险」）。
+
+用途（mine_relationships.py --bio-scan）：
+  report  与 LLM 提取的 schools / former_companies / regulator_bg 对照，统计漏提与未在原文出现的条目
+  recall  把扫描到、LLM 漏提的实体补进上述字段；监管机构和公司只补入其后紧跟任职线索的提及
+          （ROLE_CUE_RE，见 roles.py：「财政部条法司副司长」补入，「财政部财政科学研究所」不补）
+"""
+
+from collections import deque
+from typing import NamedTuple
+
+from mining.roles import ROLE_CUE_RE
+from mining.textkey import fold_text
+
+SECTIONS = ("regulators", "schools", "companies")   # 同一写法出现在多个 section 时取靠前的
+MIN_PATTERN_LEN = {"regulators": 3, "schools": 4, "companies": 4}
+CUE_SECTIONS = ("regulators", "companies")          # recall 时要求任职线索的 section
+
+
+class Mention(NamedTuple):
+    start: int
+    end: int
+    text: str
+    section: str
+    canonical: str
+
+
+def _is_word(c: str) -> bool:
+    return c.isascii() and c.isalnum()
+
+
+class EntityScanner:
+    """Aho-Corasick 自动机：状态转移表 + 失败指针 + 输出链。"""
+
+    def __init__(self, patterns: dict[str, tuple[str, str]]):
+        """patterns：{写法: (section, 规范名)}"""
+        self.entries: list[tuple[str, str, str]] = []   # (写法, section, 规范名)
+        self.goto: list[dict[str, int]] = [{}]
+        self.out: list[int] = [-1]       # 以该状态结尾的最长模式
+        self.fail: list[int] = [0]
+        self.dict_link: list[int] = [0]  # 沿失败链的下一个有输出的状态
+        for pattern, (section, canonical) in patterns.items():
+            self._insert(fold_text(pattern), len(self.entries))
+            self.entries.append((pattern, section, canonical))
+        self._link()
+
+    @classmethod
+    def from_canonical(cls, canonical: dict[str, dict[str, str]], company_names=()) -> "EntityScanner":
+        """canonical：load_canonical() 的结果；company_names：源数据中的公司名（规范名按 companies 变体表）。"""
+        patterns: dict[str, tuple[str, str]] = {}
+
+        def add(pattern: str, section: str, target: str):
+            if pattern.startswith("_") or len(pattern) < MIN_PATTERN_LEN[section]:
+                return
+            patterns.setdefault(pattern, (section, target))
+
+        for section in SECTIONS:
+            mapping = canonical.get(section, {})
+            if section == "companies":
+                for name in company_names:
+                    add(name, section, mapping.get(name, name))
+            for variant, target in mapping.items():
+                add(variant, section, target)
+                add(target, section, target)
+        return cls(patterns)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _insert(self, pattern: str, idx: int):
+        node = 0
+        for c in pattern:
+            nxt = self.goto[node].get(c)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][c] = nxt
+                self.goto.append({})
+                self.out.append(-1)
+                self.fail.append(0)
+                self.dict_link.append(0)
+            node = nxt
+        self.out[node] = idx
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, nxt in self.goto[node].items():
+                f = self.fail[node]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(c, 0)
+                link = self.fail[nxt]
+                self.dict_link[nxt] = link if self.out[link] >= 0 else self.dict_link[link]
+                queue.append(nxt)
+
+    def matches(self, text: str):
+        """所有（可重叠的）命中：(起点, 终点, 模式下标)。"""
+        goto, fail, out, dict_link, entries = self.goto, self.fail, self.out, self.dict_link, self.entries
+        node = 0
+        for i, c in enumerate(fold_text(text)):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            hit = node if out[node] >= 0 else dict_link[node]
+            while hit:
+                idx = out[hit]
+                yield i + 1 - len(entries[idx][0]), i + 1, idx
+                hit = dict_link[hit]
+
+    def scan(self, text: str) -> list[Mention]:
+        """leftmost-longest、互不重叠的实体提及，按出现顺序。"""
+        candidates = []
+        for start, end, idx in self.matches(text):
+            pattern = self.entries[idx][0]
+            if pattern[0].isascii() and start > 0 and _is_word(text[start - 1]):
+                continue
+            if pattern[-1].isascii() and end < len(text) and _is_word(text[end]):
+                continue
+            candidates.append((start, -end, idx))
+        candidates.sort()
+        mentions, last_end = [], 0
+        for start, neg_end, idx in candidates:
+            if start < last_end:
+                continue
+            _, section, canonical = self.entries[idx]
+            mentions.append(Mention(start, -neg_end, text[start:-neg_end], section, canonical))
+            last_end = -neg_end
+        return mentions
+
+
+# executives.json extracted 字段 ↔ section
+EXTRACTED_FIELDS = {"schools": "schools", "companies": "former_companies", "regulators": "regulator_bg"}
+
+
+def crosscheck(executive: dict, mentions: list[Mention]) -> dict[str, dict[str, list[str]]]:
+    """
+    {section: {"missed": 简介中出现、LLM 未提取的规范名, "unseen": LLM 提取、简介中未出现的条目,
+               "recall": missed 中可补入的（CUE_SECTIONS 须至少一处提及后紧跟任职线索）}}
+    companies 不计现任公司。
+    """
+    bio = fold_text(executive["bio"])
+    result = {}
+    for section, field in EXTRACTED_FIELDS.items():
+        found = list(dict.fromkeys(m.canonical for m in mentions if m.section == section))
+        if section == "companies":
+            found = [c for c in found if c != executive["company"]]
+        cued = {m.canonical for m in mentions if m.section == section
+                and (section not in CUE_SECTIONS or ROLE_CUE_RE.match(bio, m.end))}
+        extracted = executive["extracted"][field]
+        missed = [c for c in found if c not in extracted]
+        result[section] = {
+            "missed": missed,
+            "unseen": [c for c in extracted if c not in found],
+            "recall": [c for c in missed if c in cued],
+        }
+    return result
@@ -0,0 +1,50 @@
+"""
+groups.py — 分组成员关系（超边）输出：public/data/groups.json
+
+relationships.json 的 colleague / alumni / former / regulator 关系都来自「同属一个分组」
+（公司 / 院校 / 历史公司 / 监管机构）的组内两两配对，大组按上限截断（30 / 50 人），
+超出上限的成员没有这类关系。groups.json 直接记录每个分组的完整成员列表，
+体积与成员关系总数成正比，不截断；需要高管对时由使用方按需展开（expand_pairs）。
+
+格式（紧凑 JSON，另有 .gz / .br 预压缩副本）：
+  {
+    "types":  {"colleague": {"strength": 1.0, "pair_cap": 30}, ...},
+    "groups": [{"id": 0, "type": "colleague", "label": "公司名", "members": [高管 id, ...]}, ...]
+  }
+
+分组按类型（RELATION_TYPES 顺序）、再按首次出现的顺序排列，members 按高管顺序排列，
+因此 members[:pair_cap] 的两两配对恰好是 relationships.json 中该分组参与去重的高管对。
+"""
+
+from itertools import combinations
+
+from mining.artifacts import compact_json, write_precompressed
+
+
+def build_groups(relation_types, groups: dict[str, dict[str, list[int]]]) -> dict:
+    """group_members() 的结果 → groups.json 的内容。"""
+    rows = []
+    for rel_type, _, _, _ in relation_types:
+        for label, members in groups[rel_type].items():
+            rows.append({"id": len(rows), "type": rel_type, "label": label, "members": members})
+    return {
+        "types": {rel_type: {"strength": strength, "pair_cap": cap}
+                  for rel_type, strength, cap, _ in relation_types},
+        "groups": rows,
+    }
+
+
+def expand_pairs(group: dict, cap: int | None = None):
+    """展开分组内的高管对 (a, b)，a 在成员列表中位置靠前；cap 给出时只取前 cap 名成员。"""
+    members = group["members"] if cap is None else group["members"][:cap]
+    return combinations(members, 2)
+
+
+def write_groups(doc: dict, path: str) -> dict:
+    """写出 groups.json 及预压缩副本，返回 write_precompressed 的条目（附成员关系统计）。"""
+    info = write_precompressed(path, compact_json(doc))
+    sizes = [len(g["members"]) for g in doc["groups"]]
+    info["groups"] = len(sizes)
+    info["memberships"] = sum(sizes)
+    info["pairs_full"] = sum(n * (n - 1) // 2 for n in sizes)
+    return info
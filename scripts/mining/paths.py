@@ -0,0 +1,281 @@
+"""
+paths.py — 「我怎么认识 TA」的连接索引：地标 BFS 距离 + 父指针（public/data/connections.bin）
+
+user_known 表记录了用户认识哪些高管；要回答「从我认识的人到 X 的最短路径」，
+原本只能在客户端对全图做 BFS。这里离线选出 L 个地标（连接度最高的高管），
+从每个地标做一次无权 BFS，记录所有节点到该地标的跳数和 BFS 树上的父节点：
+
+  上界   d(s, t) ≤ min_l d(s, l) + d(l, t)
+  下界   d(s, t) ≥ max_l |d(s, l) - d(l, t)|
+
+查询时对已知集合 S 和目标 t 取上界最小的若干 (s, l)，沿父指针拼出 s → l → t，
+两段在 BFS 树上的公共祖先处截断（不必绕到地标本身）。拼出的路径长度是上界，
+path() 再以它为深度上限做一次双向 BFS 找更短的路：代价取决于上界深度内展开的前沿大小，
+而不是全图——地标覆盖的高连接度节点附近上界通常很小，前沿也很小，但并非与图规模无关。
+
+没有地标的连通分量（都是小分量，见 choose_landmarks）在查询时直接做 BFS。
+
+二进制格式（小端序，数组起点 4 字节对齐，布局风格同 mining/edge_binary.py）：
+
+  偏移            类型              内容
+  0               char[4]           magic "A60P"
+  4               uint16            版本（FORMAT_VERSION）
+  6               uint16            保留
+  8               uint32            节点数 n
+  12              uint32            地标数 L
+  16              uint32            邻接表长度 m2（= 2 × 边数）
+  20..31          —                 保留
+  32              Int32[n]          高管 id（节点下标 → id）
+                  Int32[n]          连通分量编号
+                  Int32[L]          地标节点下标
+                  Int32[n + 1]      邻接表 indptr（CSR）
+                  Int32[m2]         邻接表 indices
+                  Int32[L × n]      父节点下标（地标自身及不可达为 -1）
+                  Uint8[L × n]      到地标的跳数（UNREACHABLE 为不可达）
+
+构建依赖 numpy + scipy，查询只依赖 numpy（可选依赖：未安装时跳过本步骤）。
+"""
+
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖：pip install numpy scipy
+    np = None
+try:
+    import scipy.sparse as sp
+    from scipy.sparse.csgraph import connected_components, shortest_path
+except ImportError:
+    sp = None
+
+MAGIC = b"A60P"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIII12x")   # 32 字节
+NUM_LANDMARKS = 16
+UNREACHABLE = 255
+SMALL_COMPONENT = 2000   # 大于此规模的连通分量保证至少有一个地标
+CANDIDATES = 4           # 查询时对上界最小的前几个 (s, l) 做公共祖先截断
+
+
+def choose_landmarks(degree, component, num_landmarks: int = NUM_LANDMARKS) -> list[int]:
+    """连接度最高的 num_landmarks 个节点，另外保证每个大连通分量都有地标（取分量内连接度最高者）。"""
+    order = np.lexsort((np.arange(len(degree)), -degree))
+    landmarks = [int(i) for i in order[:num_landmarks] if degree[i] > 0]
+    covered = {int(component[i]) for i in landmarks}
+    sizes = np.bincount(component)
+    for i in order:
+        c = int(component[i])
+        if c not in covered and sizes[c] > SMALL_COMPONENT:
+            landmarks.append(int(i))
+            covered.add(c)
+    return landmarks
+
+
+class ConnectionIndex:
+    """地标距离索引。节点以下标存储，对外接口一律使用高管 id。"""
+
+    def __init__(self, ids, component, landmarks, indptr, indices, parent, dist):
+        self.ids = ids
+        self.component = component
+        self.landmarks = landmarks
+        self.indptr = indptr
+        self.indices = indices
+        self.parent = parent          # (L, n)
+        self.dist = dist              # (L, n)
+        self.position = {int(i): p for p, i in enumerate(ids.tolist())}
+
+    # ── 构建 ──
+
+    @classmethod
+    def build(cls, executives: list[dict], relationships: list[dict],
+              num_landmarks: int = NUM_LANDMARKS) -> "ConnectionIndex | None":
+        """未安装 numpy / scipy 时返回 None。"""
+        if sp is None or np is None:
+            return None
+        n = len(executives)
+        position = {e["id"]: i for i, e in enumerate(executives)}
+        edges = [(position[r["source"]], position[r["target"]]) for r in relationships
+                 if r["source"] in position and r["target"] in position]
+        src = np.array([a for a, _ in edges], dtype=np.int32)
+        tgt = np.array([b for _, b in edges], dtype=np.int32)
+        a = sp.csr_matrix((np.ones(2 * len(edges), dtype=np.int8),
+                           (np.concatenate([src, tgt]), np.concatenate([tgt, src]))), shape=(n, n))
+        a.sum_duplicates()
+        a.sort_indices()
+
+        _, component = connected_components(a, directed=False)
+        degree = np.diff(a.indptr)
+        landmarks = choose_landmarks(degree, component, num_landmarks)
+
+        if landmarks:
+            dist, parent = shortest_path(a, method="D", unweighted=True,
+                                         indices=landmarks, return_predecessors=True)
+            unreachable = ~np.isfinite(dist)
+            if dist[~unreachable].max(initial=0) >= UNREACHABLE:
+                raise ValueError(f"图直径超过 {UNREACHABLE - 1} 跳，无法用 uint8 存储距离")
+            dist[unreachable] = UNREACHABLE
+            parent[parent < 0] = -1
+        else:
+            dist = np.empty((0, n))
+            parent = np.empty((0, n))
+
+        return cls(
+            ids=np.array([e["id"] for e in executives], dtype=np.int32),
+            component=component.astype(np.int32),
+            landmarks=np.array(landmarks, dtype=np.int32),
+            indptr=a.indptr.astype(np.int32),
+            indices=a.indices.astype(np.int32),
+            parent=parent.astype(np.int32),
+            dist=dist.astype(np.uint8),
+        )
+
+    # ── 序列化 ──
+
+    def to_bytes(self) -> bytes:
+        n, num = len(self.ids), len(self.landmarks)
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, 0, n, num, len(self.indices)),
+                 self.ids.astype("<i4").tobytes(), self.component.astype("<i4").tobytes(),
+                 self.landmarks.astype("<i4").tobytes(), self.indptr.astype("<i4").tobytes(),
+                 self.indices.astype("<i4").tobytes(), self.parent.astype("<i4").tobytes(),
+                 self.dist.astype(np.uint8).tobytes()]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ConnectionIndex":
+        magic, version, _, n, num, m2 = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("不是 connections.bin 格式")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"不支持的版本 {version}")
+        offset = HEADER.size
+
+        def take(dtype, count, shape=None):
+            nonlocal offset
+            arr = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+            offset += arr.nbytes
+            return arr.reshape(shape) if shape else arr
+
+        return cls(ids=take("<i4", n), component=take("<i4", n), landmarks=take("<i4", num),
+                   indptr=take("<i4", n + 1), indices=take("<i4", m2),
+                   parent=take("<i4", num * n, (num, n)), dist=take(np.uint8, num * n, (num, n)))
+
+    @classmethod
+    def load(cls, path: str) -> "ConnectionIndex":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    # ── 查询 ──
+
+    def _to_landmark(self, row: int, node: int) -> list[int]:
+        """node → 第 row 个地标的 BFS 树路径（含两端，节点下标）。"""
+        path = [node]
+        parent = self.parent[row]
+        while node != self.landmarks[row]:
+            node = int(parent[node])
+            path.append(node)
+        return path
+
+    def _expand(self, frontier, parent):
+        """BFS 的一层（向量化）：返回 frontier 中未访问的邻居，并在 parent 中记下来源。"""
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        nbrs = self.indices[np.repeat(starts, counts) + offsets]
+        origin = np.repeat(frontier, counts)
+        fresh = parent[nbrs] == -2
+        nbrs, first = np.unique(nbrs[fresh], return_index=True)
+        parent[nbrs] = origin[fresh][first]
+        return nbrs
+
+    def _bidirectional(self, sources: list[int], target: int, limit: float) -> list[int] | None:
+        """
+        双向 BFS，只找长度不超过 limit 的路径（limit 取地标上界 - 1，上界通常只有 3–5 跳），
+        每次扩展较小的一侧。返回节点下标路径，不存在时返回 None。
+        """
+        n = len(self.ids)
+        fwd, bwd = np.full(n, -2, dtype=np.int64), np.full(n, -2, dtype=np.int64)
+        f_front = np.array(sources, dtype=np.int64)
+        b_front = np.array([target], dtype=np.int64)
+        fwd[f_front], bwd[b_front] = -1, -1
+        depth = 0
+        while depth < limit and len(f_front) and len(b_front):
+            if len(f_front) <= len(b_front):
+                f_front = self._expand(f_front, fwd)
+                meet = f_front[bwd[f_front] != -2]
+            else:
+                b_front = self._expand(b_front, bwd)
+                meet = b_front[fwd[b_front] != -2]
+            depth += 1
+            if len(meet):
+                node = int(meet[0])
+                path = [node]
+                while fwd[path[0]] >= 0:
+                    path.insert(0, int(fwd[path[0]]))
+                while bwd[path[-1]] >= 0:
+                    path.append(int(bwd[path[-1]]))
+                return path
+        return None
+
+    def _resolve(self, known, target: int):
+        t = self.position.get(target)
+        sources = sorted({self.position[k] for k in known if k in self.position})
+        if t is None or not sources:
+            return None, None
+        same = [s for s in sources if self.component[s] == self.component[t]]
+        return same, t
+
+    def distance_bounds(self, known, target: int) -> tuple[int, int] | None:
+        """(下界, 上界) 跳数；不连通时返回 None。所在分量没有地标时做 BFS，上下界相等。"""
+        sources, t = self._resolve(known, target)
+        if not sources:
+            return None
+        if t in sources:
+            return 0, 0
+        d_s = self.dist[:, sources].astype(np.int32)          # (L, k)
+        d_t = self.dist[:, t].astype(np.int32)[:, None]
+        ok = (d_s < UNREACHABLE) & (d_t < UNREACHABLE)
+        if not ok.any():
+            found = self._bidirectional(sources, t, float("inf"))
+            return (len(found) - 1,) * 2 if found else None
+        upper = int(np.where(ok, d_s + d_t, np.iinfo(np.int32).max).min())
+        per_source = np.where(ok.any(axis=0), np.where(ok, np.abs(d_s - d_t), 0).max(axis=0), 1)
+        return max(1, int(per_source.min())), upper
+
+    def path(self, known, target: int) -> list[int] | None:
+        """
+        从 known（高管 id 集合）中任一人到 target 的路径（高管 id 列表，首个元素属于 known），
+        不连通时返回 None。路径经地标 BFS 树拼接，长度不超过地标上界。
+        """
+        sources, t = self._resolve(known, target)
+        if not sources:
+            return None
+        if t in sources:
+            return [target]
+
+        d_s = self.dist[:, sources].astype(np.int32)
+        d_t = self.dist[:, t].astype(np.int32)[:, None]
+        total = np.where((d_s < UNREACHABLE) & (d_t < UNREACHABLE), d_s + d_t, np.iinfo(np.int32).max)
+
+        best = None
+        for flat in np.argsort(total, axis=None, kind="stable")[:CANDIDATES].tolist():
+            row, col = divmod(flat, len(sources))
+            if total[row, col] == np.iinfo(np.int32).max:
+                break
+            up = self._to_landmark(row, sources[col])
+            down = self._to_landmark(row, t)
+            # 两段在 BFS 树上的最低公共祖先处截断
+            on_down = {node: i for i, node in enumerate(down)}
+            cut = next(i for i, node in enumerate(up) if node in on_down)
+            candidate = up[:cut + 1] + down[:on_down[up[cut]]][::-1]
+            if best is None or len(candidate) < len(best):
+                best = candidate
+
+        # 地标路径是上界：只需再找更短的；该分量没有地标时不设上限
+        limit = len(best) - 2 if best else float("inf")
+        shorter = self._bidirectional(sources, t, limit)
+        best = shorter or best
+        return [int(self.ids[p]) for p in best] if best else None
+
+    def stats(self) -> dict:
+        return {"nodes": len(self.ids), "landmarks": len(self.landmarks),
+                "covered": int((self.dist < UNREACHABLE).any(axis=0).sum()) if len(self.landmarks) else 0}
@@ -0,0 +1,72 @@
+"""
+roles.py — 关键职位识别与前后任链（mine_relationships.py 的 successor 关系）
+
+extract_key_roles：原实现每次调用都把 KEY_ROLES 按长度排序，再对每个职位反复 str.find。
+这里把全部职位编译成一个正则：候选按长度降序排列（同一位置优先匹配最长的职位），
+后缀排除（助理 / 级 / 助）用否定前瞻，前缀排除（前两个字含 部 / 室 / 组 / 处）用否定后顾。
+每个职位最多出现一次，按长度降序排列。与原实现的唯一差别：原实现只屏蔽较长职位的第一次出现，
+「副总经理、副总经理」会在第二处额外识别出「总经理」；这里较长职位的每次出现都不再拆出较短职位。
+
+ROLE_CUE_RE：机构名之后紧跟的任职线索（mine_relationships.py --bio-scan recall 用，见 mining/entities.py）。
+
+succession_links：同一 (公司, 职位) 的任职者按时间线排序，只连相邻的前任 → 后任，
+不再对所有现任 × 所有前任做笛卡尔积，边数与任职者数量成线性关系。
+"""
+
+import re
+
+KEY_ROLES = [
+    "董事长", "总裁", "总经理", "联席总裁", "副董事长", "副总裁", "副总经理",
+    "监事长", "总精算师", "总会计师", "首席执行官", "首席风险官", "首席财务官",
+    "首席投资官", "CEO", "CFO", "CRO", "CIO", "董事总经理", "党委书记", "党委副书记"
+]
+ROLE_INVALID_SUFFIX = ("助理", "级", "助")
+ROLE_INVALID_PREFIX = {"部", "室", "组", "处"}
+
+_ROLES_BY_LEN = sorted(KEY_ROLES, key=len, reverse=True)
+_ROLE_RANK = {role: i for i, role in enumerate(_ROLES_BY_LEN)}
+_PREFIX_CLASS = "[" + "".join(sorted(ROLE_INVALID_PREFIX)) + "]"
+ROLE_RE = re.compile(
+    f"(?<!{_PREFIX_CLASS})(?<!{_PREFIX_CLASS}.)"
+    f"(?:{'|'.join(map(re.escape, _ROLES_BY_LEN))})"
+    f"(?!{'|'.join(map(re.escape, ROLE_INVALID_SUFFIX))})"
+)
+
+# 简介中机构名之后的任职线索：可选的下属部门 / 分支机构，接（「任」+）职位或「担任 / 任职 / 工作」。
+# 「财政部财政科学研究所（学位）」「财政部内部控制标准委员会咨询专家」这类提及不算任职。
+CUE_ROLES = KEY_ROLES + [
+    "董事", "监事", "经理", "总监", "主任", "主席", "行长", "秘书长", "司长", "局长", "处长", "科长",
+    "巡视员", "调研员", "专员", "科员", "精算师", "负责人", "担任", "任职", "工作",
+]
+CUE_UNITS = ("公司", "分行", "支行", "办公室", "中心", "司", "局", "厅", "部", "处", "科", "室", "组")
+ROLE_CUE_RE = re.compile(
+    f"(?:[\u4e00-\u9fff]{{0,8}}?(?:{'|'.join(CUE_UNITS)}))?"
+    f"(?:担任|出任|任)?(?:副|常务副|高级)?(?:{'|'.join(map(re.escape, sorted(CUE_ROLES, key=len, reverse=True)))})"
+)
+
+
+def extract_key_roles(title_str):
+    found = {m.group() for m in ROLE_RE.finditer(title_str or "")}
+    return sorted(found, key=_ROLE_RANK.__getitem__)
+
+
+def _timeline_key(holder: dict) -> tuple:
+    """前任在前、现任在后；各自按年份排序，年份未知的排在同组最前，再按高管顺序。"""
+    year = holder["end"] if not holder["current"] and holder["end"] is not None else holder["start"]
+    return holder["current"], year is not None, year or 0, holder["order"]
+
+
+def succession_links(holders: list[dict]) -> list[tuple[int, int]]:
+    """
+    holders: [{"id", "current", "start", "end", "order"}]，同一 (公司, 职位) 的全部任职者。
+    前任按时间线两两相邻相连，最后一位前任连向每一位现任（同一职位可有多名现任，如副总裁）。
+    返回 [(前任 id, 后任 id)]，不含自环。
+    """
+    timeline = sorted(holders, key=_timeline_key)
+    former = [h["id"] for h in timeline if not h["current"]]
+    current = [h["id"] for h in timeline if h["current"]]
+    if not former or not current:
+        return []
+    links = [(a, b) for a, b in zip(former, former[1:]) if a != b]
+    links += [(former[-1], c) for c in current if c != former[-1]]
+    return links
@@ -0,0 +1,104 @@
+"""
+supergraph.py — 公司级聚合图（public/data/company_graph.json）
+
+人员级图首屏就要布局全部高管；公司级图只有几百个节点，前端可先渲染公司，
+放大时再按 members 展开为人员。三层边（均为稀疏 COO 三元组，按 (src, dst) 排序）：
+
+  talent_flow  有向：人才流动 a → b 的人数。来源
+                 - extracted.former_companies → 现任公司
+                 - career_path 中年份已知的任职按开始年排序后，相邻两段的公司变化
+               同一人对同一 (a, b) 只计一次
+  alumni       无向（src < dst）：两家公司（现任）之间同校高管对数 Σ_校 n(a) × n(b)
+  regulator    无向：同上，按监管机构背景
+
+格式（紧凑 JSON，另有 .gz / .br 预压缩副本）：
+  {
+    "companies":   [{"name", "region", "members": [现任高管 id]}, ...],   # 下标即公司编号
+    "talent_flow": {"src": [...], "dst": [...], "weight": [...]},
+    "alumni":      {...},
+    "regulator":   {...}
+  }
+
+公司顺序：现任公司按首次出现的顺序在前，只作为历史公司出现的在后（region 为 null、members 为空）。
+alumni / regulator 由公司 × 院校（监管机构）计数矩阵 M 计算 triu(M·Mᵀ, 1)，
+依赖 numpy + scipy（可选依赖：未安装时跳过本步骤）。
+"""
+
+from collections import Counter
+from typing import Callable
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:  # 可选依赖：pip install numpy scipy
+    np = sp = None
+
+from mining.artifacts import compact_json, write_precompressed
+
+SHARED_TYPES = ("alumni", "regulator")
+
+
+def career_transitions(e: dict, resolve: Callable[[str], str | None] | None = None) -> set[tuple[str, str]]:
+    """一位高管的公司变化 {(原公司, 新公司)}；resolve 把 career_path 中的原始公司名映射到标准名。"""
+    pairs = {(f, e["company"]) for f in e["extracted"]["former_companies"]}
+    if resolve is not None:
+        dated = sorted(
+            (step["start_year"], i, e["company"] if step.get("is_current") else resolve(step.get("company", "")))
+            for i, step in enumerate(e.get("career_path", []))
+            if isinstance(step.get("start_year"), int)
+        )
+        companies = [c for _, _, c in dated if c]
+        pairs.update(zip(companies, companies[1:]))
+    return {(a, b) for a, b in pairs if a != b}
+
+
+def _coo(matrix) -> dict:
+    m = matrix.tocoo()
+    order = np.lexsort((m.col, m.row))
+    return {"src": m.row[order].tolist(), "dst": m.col[order].tolist(), "weight": m.data[order].tolist()}
+
+
+def build_company_graph(executives: list[dict], relation_types,
+                        resolve: Callable[[str], str | None] | None = None) -> dict | None:
+    """未安装 numpy / scipy 时返回 None。"""
+    if sp is None:
+        return None
+    transitions = [career_transitions(e, resolve) for e in executives]
+
+    names = list(dict.fromkeys(
+        [e["company"] for e in executives] + [c for pairs in transitions for pair in pairs for c in pair]
+    ))
+    index = {name: i for i, name in enumerate(names)}
+    companies = [{"name": name, "region": None, "members": []} for name in names]
+    for e in executives:
+        node = companies[index[e["company"]]]
+        node["region"] = node["region"] or e["region"]
+        node["members"].append(e["id"])
+
+    n = len(names)
+    flow = Counter((index[a], index[b]) for pairs in transitions for a, b in pairs)
+    graph = {
+        "companies":   companies,
+        "talent_flow": _coo(sp.coo_matrix(
+            (list(flow.values()), ([a for a, _ in flow], [b for _, b in flow])), shape=(n, n), dtype=np.int64)),
+    }
+
+    keys_of = {rel_type: fn for rel_type, _, _, fn in relation_types}
+    for rel_type in SHARED_TYPES:
+        key_index: dict[str, int] = {}
+        rows, cols = [], []
+        for e in executives:
+            for key in dict.fromkeys(keys_of[rel_type](e)):
+                rows.append(index[e["company"]])
+                cols.append(key_index.setdefault(key, len(key_index)))
+        m = sp.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(n, len(key_index)))
+        graph[rel_type] = _coo(sp.triu(m @ m.T, k=1))
+    return graph
+
+
+def write_company_graph(graph: dict, path: str) -> dict:
+    """写出 company_graph.json 及预压缩副本，返回 write_precompressed 的条目（附节点 / 边数）。"""
+    info = write_precompressed(path, compact_json(graph))
+    info["companies"] = len(graph["companies"])
+    info["edges"] = {layer: len(graph[layer]["src"]) for layer in ("talent_flow", *SHARED_TYPES)}
+    return info
@@ -0,0 +1,92 @@
+"""
+temporal.py — 按任职时间重叠挖掘 colleague / former 关系（mine_relationships.py --temporal）
+
+默认实现里同一公司（现任 / 曾任）的任意两人都会相连，哪怕任期相隔几十年。
+career_path 带有 start_year / end_year，这里对每个分组的任期区间做排序扫描：
+
+  按开始年份排序，维护「仍在任」的最小堆（按结束年份）；处理每个区间时先弹出已结束的，
+  再与堆中剩余区间逐一配对 —— 每个分组 O(n log n + k)，k 为实际重叠的对数。
+
+strength = 基础强度 × min(1, 重叠年数 / FULL_OVERLAP_YEARS)，重叠年数按首尾年份都计入。
+
+任期年份缺失很常见（LLM 只能从简历里提取到部分年份），此时无法判断是否重叠：
+区间未知的成员仍按默认实现与组内前 pair_cap 名成员配对（基础强度），
+只有两人区间都已知且不重叠时才不连边。
+"""
+
+import heapq
+from datetime import datetime
+from itertools import combinations
+
+from mining.edges import EdgeAccumulator
+
+FULL_OVERLAP_YEARS = 5
+TEMPORAL_TYPES = ("colleague", "former")
+
+
+def current_year() -> int:
+    return datetime.now().year
+
+
+def merge_interval(old: tuple | None, start: int, end: int) -> tuple:
+    """同一人在同一分组有多段任期时取整体跨度。"""
+    if old is None:
+        return start, end
+    return min(old[0], start), max(old[1], end)
+
+
+def overlapping_pairs(intervals: dict[int, tuple[int, int]]):
+    """排序扫描：产出 (id_a, id_b, 重叠年数)，两段区间 [start, end] 有交集才产出。"""
+    heap = []   # (end, id)
+    for exec_id, (start, end) in sorted(intervals.items(), key=lambda kv: (kv[1][0], kv[0])):
+        while heap and heap[0][0] < start:
+            heapq.heappop(heap)
+        for other_end, other_id in heap:
+            yield other_id, exec_id, min(end, other_end) - start + 1
+        heapq.heappush(heap, (end, exec_id))
+
+
+def overlap_strength(base: float, years: int) -> float:
+    return round(base * min(1.0, years / FULL_OVERLAP_YEARS), 4)
+
+
+def mine_temporal(relation_types, groups: dict[str, dict[str, list[int]]],
+                  tenures: dict[str, dict[str, dict[int, tuple[int, int]]]]) -> EdgeAccumulator:
+    """
+    tenures: {类型: {分组 key: {高管 id: (开始年, 结束年)}}}，只含区间已知的成员。
+    返回与 mine_pairs 相同的边累加器。同一对命中多种类型时按 RELATION_TYPES 顺序取第一种，
+    同类型内取重叠最长（strength 最高）的分组，相同时取先出现的。
+    """
+    edges = EdgeAccumulator([t for t, *_ in relation_types])
+
+    for type_code, (rel_type, strength, cap, _) in enumerate(relation_types):
+        print(f"挖掘 {rel_type} 关系...")
+        pair_count = known_total = overlapped = 0
+        for label, ids in groups[rel_type].items():
+            if len(ids) < 2:
+                continue
+            label_code = edges.label_code(label)
+            if rel_type not in TEMPORAL_TYPES:
+                pair_count += edges.add_group(ids[:cap], type_code, strength, label_code)
+                continue
+
+            position = {i: pos for pos, i in enumerate(ids)}
+            # 只取分组内的成员（同一人的其他节点不在分组中，见 group_members）
+            known = {i: span for i, span in tenures.get(rel_type, {}).get(label, {}).items() if i in position}
+            # 区间已知的成员之间：只连任期重叠的
+            known_total += len(known) * (len(known) - 1) // 2
+            for a, b, years in overlapping_pairs(known):
+                if position[a] > position[b]:
+                    a, b = b, a
+                edges.add(a, b, type_code, overlap_strength(strength, years), label_code)
+                overlapped += 1
+                pair_count += 1
+            # 区间未知的成员：沿用默认的组内配对
+            for a, b in combinations(ids[:cap], 2):
+                if a in known and b in known:
+                    continue
+                edges.add(a, b, type_code, strength, label_code)
+                pair_count += 1
+        extra = f"；任期均已知的 {known_total} 对中重叠 {overlapped} 对" if rel_type in TEMPORAL_TYPES else ""
+        print(f"  {rel_type}: {pair_count} 对 (来自 {len(groups[rel_type])} 个分组{extra})")
+    return edges
@@ -0,0 +1,124 @@
+"""
+textkey.py — 名称的规范化键（繁简、全半角、大小写、标点折叠）
+
+canonical_names.json、EN_TITLE_MAP、公司库都是按原样写法查表，「行政總裁 / 行政总裁」
+「ＡＩＡ / AIA」「中國人壽 / 中国人寿」这类写法差异都会查不到，要么拆成两个实体，
+要么掉进慢的模糊匹配。这里提供两层折叠：
+
+  fold_text(text)      逐字符折叠：繁体 → 简体（内置常用字表）、全角 ASCII → 半角、拉丁字母小写。
+                       长度不变，偏移可直接对应原文（前缀树、Aho-Corasick 扫描用）
+  normalize_key(text)  fold_text + NFKC + casefold，再去掉空白、标点和符号；查表用
+
+KeyedLookup 在构造时预先算好每个写法的键：原样命中优先，其次按键命中，都是 O(1)。
+两个写法折叠成同一个键而值不同时取先出现的，并记入 conflicts。
+
+装有 opencc（pip install opencc）时 normalize_key 改用其 t2s 词语级转换，覆盖内置字表之外的字。
+"""
+
+import unicodedata
+from functools import lru_cache
+
+try:
+    from opencc import OpenCC
+    _T2S = OpenCC("t2s")
+except ImportError:  # 可选依赖：只用内置字表
+    _T2S = None
+
+# 繁体 → 简体常用字表（公司 / 院校 / 职位 / 人名中常见的字，逐字一一对应）
+_TRAD = (
+    "險壽產團財務總監執長會銀證資學國際華東亞聯經濟師員職業營運風與為於後發開關係處區"
+    "廣場權機構體設計劃規範議書記黨歷曆擔審稅貨幣託顧問諮詢醫療衛養災傷賠償額責債負獲"
+    "頒獎級專畢碩課講協屆歲現間創辦們個來時實點當對將應從進選舉優勢質齊門號廳縣鎮島灣"
+    "臺環鐵電網絡訊報紙輸車陸龍鳳麗傑偉軍強剛鋒鋼陳張劉趙黃楊吳鄭孫馬許鄧蕭葉盧譚鍾馮"
+    "蔣韓錢賴鄒蘇嚴謝羅麥溫歐陽鄺餘滙匯彙豐恆興達滿榮貴禮靈義聖愛樂萬億兩價買賣購貸帳"
+    "賬戶虧損約續統結織組紀綜線綫練維縮繼蘭藝藥檢驗測評論語誠說請調談讓變認識護譯讀販"
+    "貿費賓賽贊讚趨軟較輕載輔轉農邊遠遞適遺郵鄉釋錄鏈鎖閣閱隊階隨隱難雙雜雲靜頁項順須"
+    "預領頭題顯飛飯館髮鬥魯鳥鹽麼擬據擴攝數斷無舊條極標樣樹橋檔歡殘氣沒減滬漢濱熱獨獻"
+    "畫盡盤眾衆確礎禦離種稱穩窮競筆節築簡糧紅納紐細終絕給絲緊緣編績罰習聞聲聽肅腦臨艦"
+    "莊萊蓋蔭補裝複復見視覽觀訂討訓訴診詞試詩話該詳誤誰諾謀譜豬貝貢賀賢跡踐輪辭邏鄰釐"
+    "針銷鋪錦鍵閉閒闊陣雞頂頓頻飲驅驚魚鴻鵬齡佈併並倫側備傳傭僅儀儲兒內冊淨凈凱劍劑勁"
+    "動勝勞勵勸卻厲參叢啟單圍園圓圖堅塊壓壞壯夢夥奪奮婦寧寫寬寶尋導層屬岡嶺巖帥帶幫幹"
+    "幾庫廈廠彈徑徵憂懷態慶憑戰戲擁擇擊擺攜敗敘晉暢暫曉桿楓槍樓橫櫃欄歸殺毀漲滅潔潤澤"
+    "濃烏煙爐爭爾牆狀猶瑪畝異盜碼磚禪積穀籌簽籃糾純紛紹綁綠綱綿緒締緩繩繪罷翹聰脅脈腳"
+    "膽臉艱藍蘋虛蝦術衝製襲觸訪誇誌誕諒謙譽豈貓貞貧貫貯貶貼賈賞賤賦贈趕躍軌軒輝輩輯轄"
+    "轎迴這連週遊過違遙遜遲遷遼邁還釀鈔鉅銅銘銳錫錯鍊鍋鏡鐘鑑鑒閃閥閩闡陝陰隸雖霧韋響"
+    "頑頗頸顏願類颱飢飽飾餅饒饋駐駕驛驟髒鬆鬧鮮鳴鷹鹹麵齒龜準裏裡廢鑄纖嶼剝啓晝濤瀋灃"
+    "燁煒璽瓊瑩璣禎禕穎緯縉翺艷蘊詠謹贇鈞銓錚鍇閔闆陞雋韻頌頤顥飆駿騰驥鵑鶴儉凜勳嘯嬌"
+    "嫻嵐廬曄濰瀾灝熾爍犖琺瑋璉瓏皚祿緻繹罈羨翬腸蒞蓮蕪薈藹蘆蟬袞覺誼諭謐譁賡贏軼輿鄔"
+    "釗鈺銖錕鍔鎧鏞鐸鑾閻陘隴霽靚頎顓颯餞驊鬱鯤鴿鵠鸞"
+)
+_SIMP = (
+    "险寿产团财务总监执长会银证资学国际华东亚联经济师员职业营运风与为于后发开关系处区"
+    "广场权机构体设计划规范议书记党历历担审税货币托顾问咨询医疗卫养灾伤赔偿额责债负获"
+    "颁奖级专毕硕课讲协届岁现间创办们个来时实点当对将应从进选举优势质齐门号厅县镇岛湾"
+    "台环铁电网络讯报纸输车陆龙凤丽杰伟军强刚锋钢陈张刘赵黄杨吴郑孙马许邓萧叶卢谭钟冯"
+    "蒋韩钱赖邹苏严谢罗麦温欧阳邝余汇汇汇丰恒兴达满荣贵礼灵义圣爱乐万亿两价买卖购贷账"
+    "账户亏损约续统结织组纪综线线练维缩继兰艺药检验测评论语诚说请调谈让变认识护译读贩"
+    "贸费宾赛赞赞趋软较轻载辅转农边远递适遗邮乡释录链锁阁阅队阶随隐难双杂云静页项顺须"
+    "预领头题显飞饭馆发斗鲁鸟盐么拟据扩摄数断无旧条极标样树桥档欢残气没减沪汉滨热独献"
+    "画尽盘众众确础御离种称稳穷竞笔节筑简粮红纳纽细终绝给丝紧缘编绩罚习闻声听肃脑临舰"
+    "庄莱盖荫补装复复见视览观订讨训诉诊词试诗话该详误谁诺谋谱猪贝贡贺贤迹践轮辞逻邻厘"
+    "针销铺锦键闭闲阔阵鸡顶顿频饮驱惊鱼鸿鹏龄布并并伦侧备传佣仅仪储儿内册净净凯剑剂劲"
+    "动胜劳励劝却厉参丛启单围园圆图坚块压坏壮梦伙夺奋妇宁写宽宝寻导层属冈岭岩帅带帮干"
+    "几库厦厂弹径征忧怀态庆凭战戏拥择击摆携败叙晋畅暂晓杆枫枪楼横柜栏归杀毁涨灭洁润泽"
+    "浓乌烟炉争尔墙状犹玛亩异盗码砖禅积谷筹签篮纠纯纷绍绑绿纲绵绪缔缓绳绘罢翘聪胁脉脚"
+    "胆脸艰蓝苹虚虾术冲制袭触访夸志诞谅谦誉岂猫贞贫贯贮贬贴贾赏贱赋赠赶跃轨轩辉辈辑辖"
+    "轿回这连周游过违遥逊迟迁辽迈还酿钞钜铜铭锐锡错炼锅镜钟鉴鉴闪阀闽阐陕阴隶虽雾韦响"
+    "顽颇颈颜愿类台饥饱饰饼饶馈驻驾驿骤脏松闹鲜鸣鹰咸面齿龟准里里废铸纤屿剥启昼涛沈沣"
+    "烨炜玺琼莹玑祯祎颖纬缙翱艳蕴咏谨赟钧铨铮锴闵板升隽韵颂颐颢飙骏腾骥鹃鹤俭凛勋啸娇"
+    "娴岚庐晔潍澜灏炽烁荦珐玮琏珑皑禄致绎坛羡翚肠莅莲芜荟蔼芦蝉衮觉谊谕谧哗赓赢轶舆邬"
+    "钊钰铢锟锷铠镛铎銮阎陉陇霁靓颀颛飒饯骅郁鲲鸽鹄鸾"
+)
+
+_FOLD = {ord(t): s for t, s in zip(_TRAD, _SIMP)}
+_FOLD.update({ord(c): c.lower() for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"})
+_FOLD.update({cp: chr(cp - 0xFEE0).lower() for cp in range(0xFF01, 0xFF5F)})   # 全角 ASCII
+_FOLD[0x3000] = " "                                                           # 全角空格
+
+_DROP_CATEGORIES = ("P", "Z", "S", "C")   # 标点、空白、符号、控制字符
+
+
+def fold_text(text: str) -> str:
+    """逐字符折叠（繁简、全半角、大小写），长度不变。"""
+    return text.translate(_FOLD)
+
+
+@lru_cache(maxsize=1 << 16)
+def normalize_key(text: str) -> str:
+    """查表用的规范化键。"""
+    text = fold_text(text or "")
+    if _T2S is not None:
+        text = _T2S.convert(text)
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return "".join(c for c in text if not unicodedata.category(c).startswith(_DROP_CATEGORIES))
+
+
+class KeyedLookup:
+    """{写法: 值} 的查表：原样命中优先，其次按 normalize_key 命中。"""
+
+    def __init__(self, mapping=None):
+        self.exact: dict[str, object] = {}
+        self.by_key: dict[str, object] = {}
+        self.conflicts: list[tuple[str, object, object]] = []   # (键, 保留的值, 丢弃的值)
+        for name, value in (mapping or {}).items():
+            self.add(name, value)
+
+    def add(self, name: str, value):
+        self.exact.setdefault(name, value)
+        key = normalize_key(name)
+        if not key:
+            return
+        kept = self.by_key.setdefault(key, value)
+        if kept != value:
+            self.conflicts.append((key, kept, value))
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def get(self, name: str, default=None):
+        if name in self.exact:
+            return self.exact[name]
+        return self.by_key.get(normalize_key(name), default)
@@ -0,0 +1,166 @@
+"""
+titles.py — 职位标准化（mine_relationships.py 构建高管时调用）
+
+原实现每次调用都把已知公司名按长度排序再逐个 startswith，且相同原始职位反复计算。
+TitleNormalizer 在构造时把公司名编译成前缀树（最长前缀匹配，与「按长度降序取第一个
+命中」等价），并按原始职位缓存结果：
+
+    titles = TitleNormalizer(company_names)
+    titles.normalize("现任本公司总精算师")   # → "总精算师"
+    titles.stats()                           # {"calls", "hits", "hit_rate", "companies"}
+
+EN_TITLE_MAP 与公司名前缀都按折叠后的写法匹配（繁简、全半角、大小写，见 textkey.py），
+「行政總裁」「CHIEF EXECUTIVE OFFICER」「友邦保險…」都能命中简体 / 标准写法的条目。
+"""
+
+import re
+
+from mining.textkey import KeyedLookup, fold_text
+
+EN_TITLE_MAP = {
+    "Chief Executive Officer": "首席执行官",
+    "Group Chief Executive Officer": "集团首席执行官",
+    "Regional CEO": "区域首席执行官",
+    "Chief Financial Officer": "首席财务官",
+    "Group Chief Financial Officer": "集团首席财务官",
+    "Chief Risk Officer": "首席风险官",
+    "Chief Investment Officer": "首席投资官",
+    "Chief Information Officer": "首席信息官",
+    "Chief Operating Officer": "首席运营官",
+    "Chief Distribution Officer": "首席分销官",
+    "Chief Compliance Officer": "首席合规官",
+    "Managing Director": "董事总经理",
+    "MD": "董事总经理",
+    "Director": "董事",
+    "Independent Director": "独立董事",
+    "Independent Non-Executive Director": "独立非执行董事",
+    "Non-Executive Director": "非执行董事",
+    "Executive Director": "执行董事",
+    "Chairman": "董事长",
+    "Vice Chairman": "副董事长",
+    "President": "总裁",
+    "CEO": "首席执行官",
+    "CFO": "首席财务官",
+    "行政总裁": "首席执行官",
+    "首席财务总监": "首席财务总监",
+    "先生": "", "女士": "", "Singapore": "",
+}
+_EN_TITLES = KeyedLookup(EN_TITLE_MAP)
+
+_APPROVAL_RE    = re.compile(r'（(?:批复文号|保监许可|[^\u4e00-\u9fa5（）]{0,4})[^）]*[号〕\d][^）]*）')
+_BIO_OVERFLOW_RE = re.compile(r'。[\u4e00-\u9fa5]{1,3}(?:先生|女士|曾任|拥有|毕业|持有|出生).+$')
+# 汉字之间的空白（前后断言，一次替换即可去净，无需循环）
+_INNER_SPACE_RE  = re.compile(r'(?<=[\u4e00-\u9fa5])\s+(?=[\u4e00-\u9fa5])')
+_UNKNOWN_COMP_RE = re.compile(
+    r'^([\u4e00-\u9fa5]{2,12}'
+    r'(?:保险社|人寿|财产|保险|集团|银行|证券|资产|基金|再保险)'
+    r'(?:股份有限公司|有限公司|有限责任公司|股份公司)?)'
+    r'(.{2,})$'
+)
+_BRANCH_RE    = re.compile(r'^[\u4e00-\u9fa5]{1,6}(?:省|市|区|地区|自治区)?分公司')
+_MULTI_COMP_RE = re.compile(r'[，,][\u4e00-\u9fa5]{2,12}(?:保险|集团|公司|银行|资产|基金).+$')
+
+
+_END = ""   # 前缀树结点中标记「此处为完整公司名」的键（空串不会与单个字符冲突）
+
+
+class CompanyPrefixTrie:
+    """公司名前缀树：longest_prefix(t) 返回 t 开头的最长公司名。"""
+
+    def __init__(self, names=()):
+        self.root: dict = {}
+        self.size = 0
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str):
+        if not name:
+            return
+        node = self.root
+        for ch in name:
+            node = node.setdefault(ch, {})
+        if _END not in node:
+            node[_END] = name
+            self.size += 1
+
+    def longest_prefix(self, text: str) -> str | None:
+        node, found = self.root, None
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            if _END in node:
+                found = node[_END]
+        return found
+
+
+class TitleNormalizer:
+    """绑定一组已知公司名的职位标准化器，带结果缓存与命中统计。"""
+
+    def __init__(self, known_companies=()):
+        # 前缀树存折叠后的公司名，匹配时也折叠职位（fold_text 长度不变，前缀长度可直接用于原文）
+        self.trie  = CompanyPrefixTrie(fold_text(c) for c in known_companies)
+        self.cache: dict[str, str] = {}
+        self.calls = 0
+        self.hits  = 0
+
+    def normalize(self, raw_title: str) -> str:
+        self.calls += 1
+        cached = self.cache.get(raw_title)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        result = self._normalize(raw_title)
+        self.cache[raw_title] = result
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "calls":     self.calls,
+            "hits":      self.hits,
+            "hit_rate":  self.hits / self.calls if self.calls else 0.0,
+            "companies": self.trie.size,
+        }
+
+    def _normalize(self, raw_title: str) -> str:
+        if not raw_title:
+            return ""
+        t = _INNER_SPACE_RE.sub("", raw_title.strip())
+        mapped = _EN_TITLES.get(t)
+        if mapped is not None:
+            return mapped
+        t = _APPROVAL_RE.sub("", t)
+        t = _BIO_OVERFLOW_RE.sub("", t)
+        t = t.rstrip("。！？，., ").strip()
+        for pfx in ["现任本公司", "现任公司", "本公司", "现任"]:
+            if t.startswith(pfx):
+                t = t[len(pfx):].strip()
+                break
+        if t.startswith("兼任"):
+            t = t[2:].strip()
+        # 只看最长的公司名前缀；剩余部分过短时不剥离，也不再尝试更短的公司名
+        stripped = False
+        comp = self.trie.longest_prefix(fold_text(t))
+        if comp:
+            rest = t[len(comp):].strip()
+            if len(rest) >= 2:
+                t = rest
+                stripped = True
+        if not stripped:
+            m = _UNKNOWN_COMP_RE.match(t)
+            if m and len(m.group(2)) >= 2:
+                t = m.group(2).strip()
+        for pfx in ["公司党委", "集团党委", "公司", "集团"]:
+            if t.startswith(pfx) and len(t) > len(pfx) + 1:
+                t = t[len(pfx):].strip()
+                break
+        t = _MULTI_COMP_RE.sub("", t)
+        m = _BRANCH_RE.match(t)
+        if m:
+            t = "分公司" + t[m.end():]
+        return t.rstrip("。！？，., ").strip()
+
+
+def normalize_title(raw_title: str, known_companies: set = None) -> str:
+    """单次调用版本；批量处理请复用同一个 TitleNormalizer。"""
+    return TitleNormalizer(known_companies or ()).normalize(raw_title)
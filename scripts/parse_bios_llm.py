@@ -9,18 +9,27 @@ bio_atoms.json 是所有下游分析（关系挖掘、图谱、侧边栏）的
     export DEEPSEEK_API_KEY=sk-xxxx
     python3 scripts/parse_bios_llm.py
 
-支持断点续跑：已处理的高管自动跳过。
+增量续跑：每条 atom 记录输入哈希与 prompt 版本（_meta），
+只重跑简介变化、prompt 过期或尚未处理的高管。
+    python3 scripts/parse_bios_llm.py --report        # 只打印待重跑清单
+    python3 scripts/parse_bios_llm.py --adopt-legacy  # 旧版 atom 直接补记哈希
+同一人的多个「姓名|公司」（见 resolve_persons.py 的 person_ids.json）只解析代表键。
 并发处理（5 线程）。
 """
 
-import json, os, sys, time, threading
+import argparse, json, os, sys, time, threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 
+from incremental import (content_hash, prompt_version, make_meta,
+                         stale_reason, StaleReport)
+from resolve_persons import PersonIndex, PERSONS_FILE
+
 # ── 路径配置 ──────────────────────────────────────────────
 SCRIPT_DIR  = os.path.dirname(os.path.abspath(__file__))
 SOURCE_FILE = os.path.join(SCRIPT_DIR, "..", "..", "Actuary60", "00_全部数据.json")
 OUTPUT_FILE = os.path.join(SCRIPT_DIR, "bio_atoms.json")
+STALE_FILE  = os.path.join(SCRIPT_DIR, "bio_atoms.stale.json")
 
 REGION_MAP = {"中国大陆": "CN", "中国香港": "HK", "新加坡": "SG"}
 
@@ -99,6 +108,14 @@ USER_PROMPT = """从以下高管简介中提取信息，按给定 schema 返回
 - regulator_bg：曾任职的监管机构名称列表，如["中国银保监会","证监会"]
 - experience_years：简介中明确提及的从业年数（整数），未提及则 null"""
 
+# prompt 或模型变化 → 版本号变化 → 全部 atom 过期
+PROMPT_VERSION = prompt_version(SYSTEM_PROMPT, USER_PROMPT, MODEL, MAX_BIO_LEN)
+
+
+def bio_hash(entry: dict) -> str:
+    """atom 的输入哈希：prompt 中除姓名/公司（已在 key 中）外的全部输入。"""
+    return content_hash(entry["region"], entry["title"], entry["bio"][:MAX_BIO_LEN])
+
 
 def call_llm(client: OpenAI, entry: dict) -> dict | None:
     prompt = USER_PROMPT.format(
@@ -196,6 +213,7 @@ def process_one(client: OpenAI, entry: dict, idx: int, total: int) -> tuple[str,
     result = call_llm(client, entry)
     if result is not None:
         atom = normalize(result, entry["company"], entry["title"])
+        atom["_meta"] = make_meta(entry["bio_hash"], PROMPT_VERSION)
         n_career = len(atom["career"])
         n_edu    = len(atom["education"])
         print(f"  [{idx}/{total}] {entry['name']:<8} @ {entry['company'][:16]}  "
@@ -207,29 +225,32 @@ def process_one(client: OpenAI, entry: dict, idx: int, total: int) -> tuple[str,
 
 
 def main():
-    api_key = os.environ.get("DEEPSEEK_API_KEY")
-    if not api_key:
-        print("错误：请设置 DEEPSEEK_API_KEY 环境变量")
-        sys.exit(1)
-
-    def make_client():
-        return OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--report", action="store_true",
+                        help="只输出待重跑清单（bio_atoms.stale.json），不调用 LLM")
+    parser.add_argument("--adopt-legacy", action="store_true",
+                        help="缺少哈希的旧 atom 视为最新，直接补记哈希而不重跑")
+    args = parser.parse_args()
 
     # ── 加载源数据 ────────────────────────────────────────
     with open(SOURCE_FILE, encoding="utf-8") as f:
         raw = json.load(f)
     print(f"加载源数据: {len(raw)} 家公司")
 
-    # ── 加载已有结果（断点续跑）──────────────────────────
+    # ── 加载已有结果（增量续跑）──────────────────────────
     if os.path.exists(OUTPUT_FILE):
         with open(OUTPUT_FILE, encoding="utf-8") as f:
             atoms: dict = json.load(f)
-        print(f"已有记录: {len(atoms)} 人（将跳过）")
+        print(f"已有记录: {len(atoms)} 人  prompt 版本: {PROMPT_VERSION}")
     else:
         atoms = {}
+    persons = PersonIndex.load(PERSONS_FILE)
+    if len(persons):
+        print(f"人员映射: {len(persons)} 人（{PERSONS_FILE}）")
 
-    # ── 收集待处理高管 ────────────────────────────────────
-    pending = []
+    # ── 比对哈希，收集待处理高管 ──────────────────────────
+    pending, report, adopted, skipped, aliased = [], StaleReport(), 0, 0, 0
+    seen_keys = set()
     for company in raw:
         region = REGION_MAP.get(company.get("region", "中国大陆"), "CN")
         for e in company.get("executives", []):
@@ -238,32 +259,64 @@ def main():
             if not name:
                 continue
             key = f"{name}|{company['name']}"
-            if key in atoms:
-                continue
-            pending.append({
+            if key in seen_keys:
+                continue  # 同一公司重名条目共用一条结果，以首条为准
+            seen_keys.add(key)
+            if persons.is_alias(key):
+                aliased += 1
+                continue  # 同一人的其他节点，共用代表键的 atom
+            entry = {
                 "name":    name,
                 "company": company["name"],
                 "title":   (e.get("title") or "").strip(),
                 "region":  region,
                 "bio":     bio,
-            })
+            }
+            entry["bio_hash"] = bio_hash(entry)
+            atom   = atoms.get(key)
+            reason = stale_reason(atom.get("_meta") if atom else None,
+                                  atom is not None, entry["bio_hash"], PROMPT_VERSION)
+            if reason == "legacy" and args.adopt_legacy:
+                atom["_meta"] = make_meta(entry["bio_hash"], PROMPT_VERSION)
+                adopted += 1
+                reason = None
+            if reason is None:
+                skipped += 1
+                continue
+            report.add(reason, key)
+            pending.append(entry)
+    report.orphaned = [k for k in atoms if k not in seen_keys]
+
+    total = len(pending)
+    report.print()
+    report.write(STALE_FILE)
+    print(f"待处理: {total} 人  已跳过: {skipped} 人  补记哈希: {adopted} 人  同一人合并: {aliased} 个键")
+    print(f"待重跑清单: {STALE_FILE}\n")
 
-    skipped = len(atoms)
-    total   = len(pending)
-    print(f"待处理: {total} 人  已跳过: {skipped} 人\n")
+    def save():
+        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(atoms, f, ensure_ascii=False, indent=2)
 
+    if args.report:
+        return
+    if adopted:
+        save()
     if not pending:
         print("全部已完成！")
         return
 
+    api_key = os.environ.get("DEEPSEEK_API_KEY")
+    if not api_key:
+        print("错误：请设置 DEEPSEEK_API_KEY 环境变量")
+        sys.exit(1)
+
+    def make_client():
+        return OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+
     # ── 并发处理 ──────────────────────────────────────────
     lock = threading.Lock()
     ok = fail = saved_count = 0
 
-    def save():
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(atoms, f, ensure_ascii=False, indent=2)
-
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {
             executor.submit(process_one, make_client(), entry, i + 1, total): entry
@@ -5,7 +5,8 @@
 用法:
   python 01_find_companies.py HK
   python 01_find_companies.py SG
-  python 01_find_companies.py ALL
+  python 01_find_companies.py ALL          # 各市场并发，日志写入 data/logs/
+  python 01_find_companies.py HK --fresh   # 丢弃断点，全部重跑
 
 流程:
   监管机构官网（IA / MAS）
@@ -14,6 +15,10 @@
     → LLM 提取公司名 + 官网地址（仅提取原文中出现的内容）
     → 输出 data/companies_{MARKET}.json
 
+断点续跑:
+  监管页面原文和每个分段的 LLM 结果完成即写入 data/checkpoints/01_{MARKET}/，
+  中断后重跑直接复用，只补未完成的分段（分段以内容哈希为 key）。
+
 输出字段:
   company_name      英文全名（原文）
   company_name_zh   中文名（原文中有则填，否则 null）
@@ -29,12 +34,15 @@
 import sys
 import json
 import time
+import hashlib
 import requests
 from datetime import datetime, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 from config import MARKETS, JINA_BASE_URL, JINA_API_KEY, LLM_API_URL, LLM_API_KEY, LLM_MODEL, DATA_DIR, RAW_DIR
+from checkpoint import StageCheckpoint
+from parallel import throttle, run_markets
 
 TODAY = datetime.now(timezone.utc).strftime("%Y%m%d")
 
@@ -48,6 +56,7 @@ def jina_fetch(url: str) -> str:
     if JINA_API_KEY:
         headers["Authorization"] = f"Bearer {JINA_API_KEY}"
     print(f"  [Jina] 抓取: {url}")
+    throttle("jina")
     resp = requests.get(jina_url, headers=headers, timeout=90)
     resp.raise_for_status()
     return resp.text
@@ -57,6 +66,7 @@ def llm_call(prompt: str) -> str:
     """调用 LLM（DeepSeek / OpenAI 兼容），temperature=0 消除随机性。"""
     if not LLM_API_KEY:
         raise ValueError("请设置环境变量 LLM_API_KEY")
+    throttle("llm")
     resp = requests.post(
         f"{LLM_API_URL}/chat/completions",
         headers={
@@ -120,11 +130,12 @@ EXTRACT_COMPANIES_PROMPT = """你是数据提取助手。请从以下监管机
 
 # ===================== 主流程 =====================
 
-def process_market(market_code: str):
+def process_market(market_code: str, fresh: bool = False) -> dict:
+    """处理单个市场，返回摘要（ALL 模式汇总用）。"""
     config = MARKETS.get(market_code)
     if not config:
         print(f"❌ 未知市场: {market_code}，可用: {list(MARKETS.keys())}")
-        return
+        return {"error": "未知市场"}
 
     print(f"\n{'='*60}")
     print(f"📍 市场: {config['name']} ({market_code})")
@@ -132,26 +143,43 @@ def process_market(market_code: str):
     print(f"🔗 来源: {config['regulator_url']}")
     print(f"{'='*60}")
 
-    # Step 1: Jina 抓取监管机构注册名单页面
-    try:
-        raw_text = jina_fetch(config["regulator_url"])
-    except Exception as e:
-        print(f"❌ 抓取失败: {e}")
-        return
+    ckpt = StageCheckpoint("01", market_code, fresh=fresh)
+    if ckpt.resumed:
+        print(f"  [断点] 复用 {ckpt.resumed} 个已完成单元")
+
+    # Step 1: Jina 抓取监管机构注册名单页面（断点中已有原文则直接复用）
+    raw_file = None
+    if ckpt.done("regulator_page"):
+        raw_file = RAW_DIR / ckpt.load("regulator_page")
+    if raw_file and raw_file.exists():
+        raw_text = raw_file.read_text(encoding="utf-8")
+        print(f"  [断点] 复用原始文本 ← {raw_file.name}")
+    else:
+        try:
+            raw_text = jina_fetch(config["regulator_url"])
+        except Exception as e:
+            print(f"❌ 抓取失败: {e}")
+            return {"error": f"抓取失败: {e}"}
 
-    # Step 2: 保存原始文本 (L1 留档)
-    raw_file = RAW_DIR / f"{market_code}_regulator_{TODAY}.txt"
-    raw_file.write_text(raw_text, encoding="utf-8")
-    print(f"  [L1] 原始文本已保存 → {raw_file.name} ({len(raw_text):,} 字符)")
+        # Step 2: 保存原始文本 (L1 留档)
+        raw_file = RAW_DIR / f"{market_code}_regulator_{TODAY}.txt"
+        raw_file.write_text(raw_text, encoding="utf-8")
+        ckpt.save("regulator_page", raw_file.name)
+        print(f"  [L1] 原始文本已保存 → {raw_file.name} ({len(raw_text):,} 字符)")
 
     # Step 3: LLM 提取公司列表
     # 如果页面过长，分段处理（每段 12000 字符）
     chunk_size = 12000
-    all_companies = []
     chunks = [raw_text[i:i+chunk_size] for i in range(0, len(raw_text), chunk_size)]
+    # 分段单元 key 含内容哈希：原文变化后旧分段结果自然失效
+    units = [f"chunk{idx}_{hashlib.sha1(chunk.encode('utf-8')).hexdigest()[:12]}"
+             for idx, chunk in enumerate(chunks, 1)]
 
     print(f"  [LLM] 分 {len(chunks)} 段提取公司列表...")
-    for idx, chunk in enumerate(chunks, 1):
+    for idx, (unit, chunk) in enumerate(zip(units, chunks), 1):
+        if ckpt.done(unit):
+            print(f"    段 {idx}/{len(chunks)}: 断点已完成，跳过")
+            continue
         prompt = EXTRACT_COMPANIES_PROMPT.format(
             market=market_code,
             regulator=config["regulator_name"],
@@ -163,7 +191,7 @@ def process_market(market_code: str):
             llm_response = llm_call(prompt)
             cleaned = clean_json_response(llm_response)
             companies_chunk = json.loads(cleaned)
-            all_companies.extend(companies_chunk)
+            ckpt.save(unit, companies_chunk)
             print(f"    段 {idx}/{len(chunks)}: 提取 {len(companies_chunk)} 家")
         except Exception as e:
             print(f"    段 {idx} 解析失败: {e}")
@@ -171,6 +199,9 @@ def process_market(market_code: str):
                 print(f"    LLM 原始输出: {llm_response[:300]}")
         time.sleep(1)
 
+    all_companies = ckpt.merge(units)
+    failed_chunks = len(ckpt.missing(units))
+
     # Step 4: 去重（按 company_name）
     seen = set()
     unique = []
@@ -192,6 +223,8 @@ def process_market(market_code: str):
     # Step 6: 保存结果
     out_file = DATA_DIR / f"companies_{market_code}.json"
     out_file.write_text(json.dumps(all_companies, ensure_ascii=False, indent=2), encoding="utf-8")
+    if not ckpt.finish(units):
+        print(f"\n⚠️  {failed_chunks} 段未完成，断点已保留，重跑将只补这些分段")
 
     print(f"\n✅ 完成！共找到 {len(all_companies)} 家持牌保险公司 → {out_file.name}")
     print("\n前 10 家预览：")
@@ -200,17 +233,18 @@ def process_market(market_code: str):
         print(f"  • {c['company_name']} | {website_str}")
     if len(all_companies) > 10:
         print(f"  ... 共 {len(all_companies)} 家")
+    return {"companies": len(all_companies), "failed_chunks": failed_chunks}
 
 
 def main():
-    market_arg = sys.argv[1].upper() if len(sys.argv) > 1 else "ALL"
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    market_arg = args[0].upper() if args else "ALL"
+    fresh = "--fresh" in sys.argv
 
     if market_arg == "ALL":
-        for code in MARKETS:
-            process_market(code)
-            time.sleep(3)
+        run_markets("01", process_market, list(MARKETS), fresh=fresh)
     else:
-        process_market(market_arg)
+        process_market(market_arg, fresh=fresh)
 
 
 if __name__ == "__main__":
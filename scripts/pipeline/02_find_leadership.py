@@ -5,7 +5,8 @@
 用法:
   python 02_find_leadership.py HK
   python 02_find_leadership.py SG
-  python 02_find_leadership.py ALL
+  python 02_find_leadership.py ALL          # 各市场并发，日志写入 data/logs/
+  python 02_find_leadership.py HK --fresh   # 丢弃断点，全部重跑
 
 策略（按优先级，均使用现成工具，不调用 LLM）:
   1. sitemap.xml   → 用 Jina 抓取 sitemap，过滤含 leadership/management/team 的 URL
@@ -14,6 +15,8 @@
 
 输入: data/companies_{MARKET}.json
 输出: data/leadership_urls_{MARKET}.json
+
+断点续跑: 每家公司完成即写入 data/checkpoints/02_{MARKET}/，中断后重跑跳过已完成公司。
 """
 
 import sys
@@ -31,6 +34,8 @@ from config import (
     MARKETS,
     LEADERSHIP_NAV_KEYWORDS, LEADERSHIP_URL_PATTERNS,
 )
+from checkpoint import StageCheckpoint
+from parallel import throttle, run_markets
 
 TODAY = datetime.now(timezone.utc).strftime("%Y%m%d")
 
@@ -47,6 +52,7 @@ def jina_fetch(url: str, timeout: int = 60) -> tuple[str, bool]:
         headers = {"Accept": "text/plain"}
         if JINA_API_KEY:
             headers["Authorization"] = f"Bearer {JINA_API_KEY}"
+        throttle("jina")
         resp = SESSION.get(jina_url, headers=headers, timeout=timeout)
         resp.raise_for_status()
         return resp.text, True
@@ -118,28 +124,40 @@ def find_via_path_probe(base_url: str) -> str | None:
 
 # ===================== 主流程 =====================
 
-def process_market(market_code: str):
+def company_unit(company: dict) -> str:
+    """断点单元 key：公司名 + 官网（官网变更后重新查找）。"""
+    return f"{company.get('company_name', 'unknown')}|{company.get('website') or ''}"
+
+
+def process_market(market_code: str, fresh: bool = False) -> dict:
+    """处理单个市场，返回摘要（ALL 模式汇总用）。"""
     companies_file = DATA_DIR / f"companies_{market_code}.json"
     if not companies_file.exists():
         print(f"❌ 找不到 {companies_file}，请先运行 01_find_companies.py")
-        return
+        return {"error": f"缺少 {companies_file.name}"}
 
     companies = json.loads(companies_file.read_text(encoding="utf-8"))
     print(f"\n{'='*60}")
     print(f"📍 市场: {market_code} — 共 {len(companies)} 家公司")
     print(f"{'='*60}")
 
-    results = []
+    ckpt  = StageCheckpoint("02", market_code, fresh=fresh)
+    units = [company_unit(c) for c in companies]
+    if ckpt.resumed:
+        print(f"  [断点] 复用 {ckpt.resumed} 家已完成公司")
 
-    for i, company in enumerate(companies, 1):
+    for i, (unit, company) in enumerate(zip(units, companies), 1):
         name = company.get("company_name", "unknown")
         website = company.get("website")
 
+        if ckpt.done(unit):
+            continue
+
         print(f"\n[{i}/{len(companies)}] {name}")
 
         if not website:
             print(f"  ⚠️  无官网地址，标记 manual_needed")
-            results.append({
+            ckpt.save(unit, {
                 **company,
                 "leadership_url": None,
                 "find_method": "no_website",
@@ -171,7 +189,7 @@ def process_market(market_code: str):
             print(f"  ❌ 自动查找失败，标记 manual_needed")
             find_method = "not_found"
 
-        results.append({
+        ckpt.save(unit, {
             **company,
             "leadership_url": leadership_url,
             "find_method": find_method,
@@ -181,9 +199,11 @@ def process_market(market_code: str):
 
         time.sleep(1)
 
-    # 保存结果
+    # 合并断点并保存结果
+    results = ckpt.merge(units)
     out_file = DATA_DIR / f"leadership_urls_{market_code}.json"
     out_file.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    ckpt.finish(units)
 
     found = sum(1 for r in results if r["leadership_url"])
     manual = sum(1 for r in results if r.get("manual_needed"))
@@ -200,16 +220,18 @@ def process_market(market_code: str):
             if r.get("manual_needed"):
                 print(f"  • {r['company_name']} | 官网: {r.get('website', '无')}")
 
+    return {"companies": len(results), "found": found, "manual": manual}
+
 
 def main():
-    market_arg = sys.argv[1].upper() if len(sys.argv) > 1 else "ALL"
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    market_arg = args[0].upper() if args else "ALL"
+    fresh = "--fresh" in sys.argv
 
     if market_arg == "ALL":
-        for code in MARKETS:
-            process_market(code)
-            time.sleep(3)
+        run_markets("02", process_market, list(MARKETS), fresh=fresh)
     else:
-        process_market(market_arg)
+        process_market(market_arg, fresh=fresh)
 
 
 if __name__ == "__main__":
@@ -5,7 +5,8 @@
 用法:
   python 03_scrape_bios.py HK
   python 03_scrape_bios.py SG
-  python 03_scrape_bios.py ALL
+  python 03_scrape_bios.py ALL          # 各市场并发，日志写入 data/logs/
+  python 03_scrape_bios.py HK --fresh   # 丢弃断点，全部重跑
 
 流程:
   leadership_url
@@ -14,12 +15,14 @@
     → [LLM 提取，temperature=0]   ← 严格逐字复制，必须附 _source_sentence
     → 程序校验 _source_sentence    ← L3: 字符串匹配，自动打假
     → Bio 资格检查                 ← 职位范围 + ≥2句 + 含背景信息
+    → 断点 checkpoints/03_{MARKET}/ ← 每家公司完成即落盘，中断后重跑跳过
     → 输出 scraped_{MARKET}.json   ← 供 04_upload.py 直接上传
 
 防幻觉三层:
   L1  保存 raw_text 原始全文（可随时回溯）
   L2  LLM Prompt 强制要求 _source_sentence（原文对应句）
   L3  程序自动校验：_source_sentence[:60] in raw_text → 不通过则 bio=null
+      （每页只规范化一次，全部高管的句子一遍扫描校验并记录原文位置，见 source_index.py）
 
 Bio 判断标准（用户确认）:
   - 职位: C-suite + VP 及以上（见 config.BIO_CRITERIA）
@@ -46,6 +49,9 @@ from config import (
     LLM_API_URL, LLM_API_KEY, LLM_MODEL,
     DATA_DIR, RAW_DIR, BIO_CRITERIA, MARKETS,
 )
+from checkpoint import StageCheckpoint
+from source_index import PageIndex
+from parallel import throttle, run_markets
 
 TODAY = datetime.now(timezone.utc).strftime("%Y%m%d")
 SCRAPED_AT = datetime.now(timezone.utc).isoformat()
@@ -59,6 +65,7 @@ def jina_fetch(url: str) -> str:
     headers = {"Accept": "text/plain"}
     if JINA_API_KEY:
         headers["Authorization"] = f"Bearer {JINA_API_KEY}"
+    throttle("jina")
     resp = requests.get(jina_url, headers=headers, timeout=90)
     resp.raise_for_status()
     return resp.text
@@ -70,6 +77,7 @@ def llm_call(prompt: str) -> str:
     """DeepSeek / OpenAI 兼容接口，temperature=0 确保无随机性。"""
     if not LLM_API_KEY:
         raise ValueError("请设置环境变量 LLM_API_KEY")
+    throttle("llm")
     resp = requests.post(
         f"{LLM_API_URL}/chat/completions",
         headers={
@@ -138,16 +146,15 @@ EXTRACT_BIOS_PROMPT = """你是数据提取助手。请从以下保险公司领
 
 def validate_source_in_raw(source_sentence: str, raw_text: str) -> bool:
     """
-    L3 校验：检查 _source_sentence 前60字符是否出现在 raw_text 中。
-    取前60字而非全句，避免末尾空白差异导致误判。
+    L3 校验：检查 _source_sentence 前60字符是否出现在 raw_text 中（均规范化空白）。
+    取前60字而非全句，避免末尾空白差异导致误判。单条校验用；整页请用 locate_sources。
     """
-    if not source_sentence or not raw_text:
-        return False
-    # 规范化空白后比较
-    norm_raw = " ".join(raw_text.split())
-    norm_src = " ".join(source_sentence.split())
-    search_key = norm_src[:60] if len(norm_src) >= 60 else norm_src
-    return bool(search_key) and search_key in norm_raw
+    return PageIndex(raw_text).find(source_sentence) is not None
+
+
+def locate_sources(executives: list[dict], raw_text: str) -> list[tuple[int, int] | None]:
+    """L3 整页校验：各高管 _source_sentence 在原文中的位置 (起点, 终点)，未找到为 None。"""
+    return PageIndex(raw_text).find_all([e.get("_source_sentence") or "" for e in executives])
 
 
 # ===================== Bio 资格检查 =====================
@@ -181,18 +188,18 @@ def is_title_in_scope(title: str) -> bool:
     return any(inc in title_lower for inc in BIO_CRITERIA["included_titles"])
 
 
-def run_bio_checks(exec_data: dict, raw_text: str) -> dict:
+def run_bio_checks(exec_data: dict, source_span: tuple[int, int] | None) -> dict:
     """
     对单条高管记录执行全部校验，返回含检查结果的记录。
+    source_span：locate_sources 给出的 _source_sentence 原文位置（None 表示未找到）。
     verified_auto=True 表示通过所有程序校验。
     """
     bio = exec_data.get("bio_verbatim") or ""
-    source_sentence = exec_data.get("_source_sentence") or ""
     title = exec_data.get("title") or ""
 
     checks = {
         # L3: _source_sentence 必须出现在原文中（防幻觉核心）
-        "source_in_raw":   validate_source_in_raw(source_sentence, raw_text),
+        "source_in_raw":   source_span is not None,
         # Bio 资格
         "title_in_scope":  is_title_in_scope(title),
         "min_sentences":   count_sentences(bio) >= BIO_CRITERIA["min_sentences"],
@@ -205,6 +212,7 @@ def run_bio_checks(exec_data: dict, raw_text: str) -> dict:
         **exec_data,
         "verified_auto":  all_pass,
         "check_details":  checks,
+        "source_span":    list(source_span) if source_span else None,
         # L3 校验失败 → bio 置 null，不写入数据库
         "bio_verbatim":   bio if checks["source_in_raw"] else None,
     }
@@ -212,11 +220,12 @@ def run_bio_checks(exec_data: dict, raw_text: str) -> dict:
 
 # ===================== 主流程 =====================
 
-def process_market(market_code: str):
+def process_market(market_code: str, fresh: bool = False) -> dict:
+    """处理单个市场，返回摘要（ALL 模式汇总用）。"""
     urls_file = DATA_DIR / f"leadership_urls_{market_code}.json"
     if not urls_file.exists():
         print(f"❌ 找不到 {urls_file}，请先运行 02_find_leadership.py")
-        return
+        return {"error": f"缺少 {urls_file.name}"}
 
     companies = json.loads(urls_file.read_text(encoding="utf-8"))
     with_url = [c for c in companies if c.get("leadership_url")]
@@ -225,11 +234,17 @@ def process_market(market_code: str):
     print(f"📍 市场: {market_code} — {len(with_url)}/{len(companies)} 家有领导层页面")
     print(f"{'='*60}")
 
-    all_results = []
+    # 断点单元 key：公司名 + 领导层 URL（URL 变更后重新抓取）
+    ckpt  = StageCheckpoint("03", market_code, fresh=fresh)
+    units = [f"{c['company_name']}|{c['leadership_url']}" for c in with_url]
+    if ckpt.resumed:
+        print(f"  [断点] 复用 {ckpt.resumed} 家已完成公司")
 
-    for i, company in enumerate(with_url, 1):
+    for i, (unit, company) in enumerate(zip(units, with_url), 1):
         name = company["company_name"]
         url  = company["leadership_url"]
+        if ckpt.done(unit):
+            continue
         print(f"\n[{i}/{len(with_url)}] {name}")
         print(f"  URL: {url}")
 
@@ -263,8 +278,10 @@ def process_market(market_code: str):
         print(f"  [LLM] 提取到 {len(executives)} 名高管")
 
         # ── L3 校验 + Bio 资格检查 ────────────────────────────────
-        for exec_data in executives:
-            result = run_bio_checks(exec_data, raw_text)
+        company_results = []
+        spans = locate_sources(executives, raw_text)
+        for exec_data, span in zip(executives, spans):
+            result = run_bio_checks(exec_data, span)
             result.update({
                 "company":     name,
                 "company_zh":  company.get("company_name_zh"),
@@ -273,7 +290,7 @@ def process_market(market_code: str):
                 "raw_file":    raw_file.name,
                 "scraped_at":  SCRAPED_AT,
             })
-            all_results.append(result)
+            company_results.append(result)
 
             checks = result["check_details"]
             icon = "✅" if result["verified_auto"] else "⚠️ "
@@ -282,12 +299,17 @@ def process_market(market_code: str):
                 failed = [k for k, v in checks.items() if not v]
                 print(f"     校验未通过: {failed}")
 
+        ckpt.save(unit, company_results)
         time.sleep(2)
 
-    # ── 输出 JSON ──────────────────────────────────────────────────
+    # ── 合并断点，输出 JSON ─────────────────────────────────────────
+    all_results = ckpt.merge(units)
+    failed_companies = len(ckpt.missing(units))
     out_json = DATA_DIR / f"scraped_{market_code}.json"
     out_json.write_text(json.dumps(all_results, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"\n📄 JSON → {out_json.name}")
+    if not ckpt.finish(units):
+        print(f"⚠️  {failed_companies} 家公司下载/解析失败，断点已保留，重跑将只补这些公司")
 
     # ── 输出校验日志 CSV（仅供审计参考，无需操作）────────────────
     out_csv = DATA_DIR / f"review_{market_code}.csv"
@@ -298,6 +320,7 @@ def process_market(market_code: str):
         "来源URL",
         "原文句子（_source_sentence）",
         "raw文件",
+        "原文位置",
         "程序自动通过",
         "人工核验(Y/N/DEL)",
         "备注",
@@ -320,6 +343,7 @@ def process_market(market_code: str):
                 "来源URL":                 r.get("source_url", ""),
                 "原文句子（_source_sentence）": r.get("_source_sentence", ""),
                 "raw文件":                 r.get("raw_file", ""),
+                "原文位置":                "{}-{}".format(*r["source_span"]) if r.get("source_span") else "",
                 "程序自动通过":             "Y" if r.get("verified_auto") else "N",
                 "人工核验(Y/N/DEL)":       "",   # ← 人工填写
                 "备注":                    "",
@@ -331,17 +355,23 @@ def process_market(market_code: str):
     print(f"校验未通过（bio已置null）: {len(all_results) - auto_pass}")
     print(f"\n下一步: python 04_upload.py {market_code}")
     print(f"（仅 verified_auto=True 的记录会上传，校验未通过的记录跳过）")
+    return {
+        "companies":        len(with_url),
+        "executives":       len(all_results),
+        "auto_pass":        auto_pass,
+        "failed_companies": failed_companies,
+    }
 
 
 def main():
-    market_arg = sys.argv[1].upper() if len(sys.argv) > 1 else "ALL"
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    market_arg = args[0].upper() if args else "ALL"
+    fresh = "--fresh" in sys.argv
 
     if market_arg == "ALL":
-        for code in MARKETS:
-            process_market(code)
-            time.sleep(5)
+        run_markets("03", process_market, list(MARKETS), fresh=fresh)
     else:
-        process_market(market_arg)
+        process_market(market_arg, fresh=fresh)
 
 
 if __name__ == "__main__":
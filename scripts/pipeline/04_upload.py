@@ -5,7 +5,7 @@
 用法:
   python 04_upload.py HK
   python 04_upload.py SG
-  python 04_upload.py ALL
+  python 04_upload.py ALL          # 各市场并发，日志写入 data/logs/
 
 上传规则:
   - 只上传 verified_auto=True 的记录（通过全部三层程序校验）
@@ -34,6 +34,7 @@ from urllib.parse import quote
 
 sys.path.insert(0, str(Path(__file__).parent))
 from config import DATA_DIR, SUPABASE_URL, SUPABASE_SERVICE_KEY, MARKETS
+from parallel import throttle, run_markets
 
 
 # ===================== Supabase 工具 =====================
@@ -49,6 +50,7 @@ def sb_headers() -> dict:
 
 def sb_upsert(table: str, data: list, on_conflict: str) -> list:
     url  = f"{SUPABASE_URL}/rest/v1/{table}?on_conflict={on_conflict}"
+    throttle("supabase")
     resp = requests.post(url, headers=sb_headers(), json=data, timeout=30)
     if not resp.ok:
         raise RuntimeError(f"upsert {table} 失败: {resp.status_code}\n{resp.text[:400]}")
@@ -58,6 +60,7 @@ def sb_upsert(table: str, data: list, on_conflict: str) -> list:
 def sb_select(table: str, filters: dict) -> list:
     params = "&".join(f"{k}=eq.{quote(str(v))}" for k, v in filters.items())
     url    = f"{SUPABASE_URL}/rest/v1/{table}?{params}"
+    throttle("supabase")
     resp   = requests.get(url, headers=sb_headers(), timeout=15)
     resp.raise_for_status()
     return resp.json()
@@ -85,15 +88,16 @@ def get_or_create_company(name: str, market_id: int, website: Optional[str]) ->
 
 # ===================== 主流程 =====================
 
-def process_market(market_code: str):
+def process_market(market_code: str) -> dict:
+    """上传单个市场，返回摘要（ALL 模式汇总用）。"""
     scraped_file = DATA_DIR / f"scraped_{market_code}.json"
     if not scraped_file.exists():
         print(f"❌ 找不到 {scraped_file}，请先运行 03_scrape_bios.py")
-        return
+        return {"error": f"缺少 {scraped_file.name}"}
 
     if not SUPABASE_SERVICE_KEY:
         print("❌ 请设置环境变量 SUPABASE_SERVICE_KEY")
-        return
+        return {"error": "未设置 SUPABASE_SERVICE_KEY"}
 
     all_records = json.loads(scraped_file.read_text(encoding="utf-8"))
 
@@ -110,7 +114,7 @@ def process_market(market_code: str):
 
     if not to_upload:
         print("⚠️  没有通过校验的记录，请检查 03_scrape_bios.py 的输出。")
-        return
+        return {"uploaded": 0, "failed": 0, "skipped": skipped}
 
     market_id = get_market_id(market_code)
     print(f"  market_id = {market_id}\n")
@@ -162,15 +166,14 @@ def process_market(market_code: str):
 
     print(f"\n{'='*60}")
     print(f"✅ 上传完成: {success} 成功, {failed} 失败")
+    return {"uploaded": success, "failed": failed, "skipped": skipped}
 
 
 def main():
     market_arg = sys.argv[1].upper() if len(sys.argv) > 1 else "ALL"
 
     if market_arg == "ALL":
-        for code in MARKETS:
-            process_market(code)
-            time.sleep(2)
+        run_markets("04", process_market, list(MARKETS))
     else:
         process_market(market_arg)
 
@@ -0,0 +1,77 @@
+"""
+checkpoint.py — 管道阶段的逐单元断点（01 / 02 / 03 共用）
+
+每完成一个单元（一家公司 / 一个分段）立即写入
+  data/checkpoints/{stage}_{market}/{unit}.json
+重启后跳过已完成单元，最后按原顺序合并为阶段输出。
+
+  · 单文件原子写入（先写 .tmp 再 rename），进程在任意时刻崩溃都不会留下半截文件
+  · 失败的单元不写断点，下次运行自动重试
+  · 全部单元成功后清空断点目录；有失败时保留，重跑只补失败的单元
+  · 命令行加 --fresh 丢弃旧断点，全部重跑
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from config import DATA_DIR
+
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
+
+
+class StageCheckpoint:
+    def __init__(self, stage: str, market: str, fresh: bool = False):
+        self.dir = CHECKPOINT_DIR / f"{stage}_{market}"
+        if fresh:
+            self.clear()
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.resumed = sum(1 for _ in self.dir.glob("*.json"))
+
+    def _path(self, unit: str):
+        # 文件名 = 可读前缀 + 哈希（避免公司名中的特殊字符和截断后重名）
+        slug = re.sub(r'[^A-Za-z0-9]', '_', unit)[:40]
+        digest = hashlib.sha1(unit.encode("utf-8")).hexdigest()[:10]
+        return self.dir / f"{slug}_{digest}.json"
+
+    def done(self, unit: str) -> bool:
+        return self._path(unit).exists()
+
+    def load(self, unit: str):
+        data = json.loads(self._path(unit).read_text(encoding="utf-8"))
+        return data["result"]
+
+    def save(self, unit: str, result):
+        path = self._path(unit)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"unit": unit, "result": result},
+                                  ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def merge(self, units: list[str]) -> list:
+        """按 units 顺序合并已完成单元；结果为列表的单元展开拼接。"""
+        merged = []
+        for unit in units:
+            if not self.done(unit):
+                continue
+            result = self.load(unit)
+            if isinstance(result, list):
+                merged.extend(result)
+            else:
+                merged.append(result)
+        return merged
+
+    def missing(self, units: list[str]) -> list[str]:
+        return [u for u in units if not self.done(u)]
+
+    def finish(self, units: list[str]) -> bool:
+        """全部单元完成则清空断点并返回 True；否则保留断点供下次续跑。"""
+        if self.missing(units):
+            return False
+        self.clear()
+        return True
+
+    def clear(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
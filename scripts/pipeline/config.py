@@ -32,6 +32,15 @@ LLM_MODEL   = os.environ.get("LLM_MODEL", "deepseek-chat")
 SUPABASE_URL         = os.environ.get("SUPABASE_URL", "https://czzdtudtuiauhfvjdqpk.supabase.co")
 SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
 
+# ==================== 全局限速 ====================
+# 同一外部服务的最小请求间隔（秒），ALL 模式下所有市场进程共享（见 parallel.throttle）
+# Jina 免费额度约 20 RPM，有 Key 约 200 RPM
+RATE_LIMITS = {
+    "jina":     0.3 if JINA_API_KEY else 3.0,
+    "llm":      0.2,
+    "supabase": 0.05,
+}
+
 # ==================== 市场配置 ====================
 # 每个市场的监管机构官网，作为「找所有保司」的权威来源
 MARKETS = {
@@ -0,0 +1,159 @@
+"""
+parallel.py — ALL 模式多市场并发执行 + 跨进程全局限速（01–04 共用）
+
+run_markets(stage, process_market, markets, **kwargs)
+  每个市场一个子进程（ProcessPoolExecutor），子进程输出写入
+  data/logs/{stage}_{MARKET}_{date}.log；各市场 process_market 返回的摘要
+  dict 在结束时汇总打印。总耗时 ≈ 最慢的市场，而不是所有市场之和。
+
+throttle(service)
+  同一外部服务（jina / llm / supabase）在所有市场进程之间共享最小请求间隔
+  （config.RATE_LIMITS）。并发时用 multiprocessing.Manager 的共享字典 + 锁；
+  由 run_pipeline.py 分别启动的各阶段进程通过环境变量 PIPELINE_RATE_FILE
+  指向的状态文件（flock 加锁）共享；单独运行时（或没有 fcntl 的 Windows 上）退化为进程内锁。
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 flock：各阶段进程之间不共享限速，只在进程内 / Manager 内限速
+    fcntl = None
+
+from config import DATA_DIR, RATE_LIMITS
+
+LOG_DIR = DATA_DIR / "logs"
+RATE_FILE_ENV = "PIPELINE_RATE_FILE"
+
+# (锁, {service: 下一个可用时间点})；子进程由 _init_worker 替换为跨进程共享对象
+_limiter = (threading.Lock(), {})
+_shared  = False
+
+
+# ===================== 全局限速 =====================
+
+def throttle(service: str):
+    """按 RATE_LIMITS[service] 预约下一个请求时间点，必要时等待。"""
+    interval = RATE_LIMITS.get(service, 0)
+    if not interval:
+        return
+    now = time.time()
+    rate_file = os.environ.get(RATE_FILE_ENV)
+    if rate_file and not _shared and fcntl is not None:
+        slot = _reserve_in_file(rate_file, service, interval, now)
+    else:
+        lock, next_slot = _limiter
+        with lock:
+            slot = max(now, next_slot.get(service, 0.0))
+            next_slot[service] = slot + interval
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _reserve_in_file(path: str, service: str, interval: float, now: float) -> float:
+    """跨独立进程的预约：状态文件 {service: 下一个可用时间点}，flock 互斥。"""
+    with open(path, "a+", encoding="utf-8") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
+            text = f.read()
+            next_slot = json.loads(text) if text.strip() else {}
+            slot = max(now, next_slot.get(service, 0.0))
+            next_slot[service] = slot + interval
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(next_slot))
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+    return slot
+
+
+# ===================== 子进程 =====================
+
+def _init_worker(lock, next_slot):
+    global _limiter, _shared
+    _limiter = (lock, next_slot)
+    _shared  = True
+
+
+def _run_one(stage: str, market: str, process_market, kwargs: dict) -> dict:
+    """在子进程中运行单个市场，输出重定向到该市场的日志文件。"""
+    LOG_DIR.mkdir(exist_ok=True)
+    today = datetime.now(timezone.utc).strftime("%Y%m%d")
+    log_file = LOG_DIR / f"{stage}_{market}_{today}.log"
+    started = time.time()
+    stdout, stderr = sys.stdout, sys.stderr
+    with log_file.open("a", encoding="utf-8", buffering=1) as log:
+        sys.stdout = sys.stderr = log
+        try:
+            summary = process_market(market, **kwargs) or {}
+        except Exception as e:
+            traceback.print_exc()
+            summary = {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+    return {
+        "market":  market,
+        "seconds": round(time.time() - started, 1),
+        "log":     log_file.name,
+        **summary,
+    }
+
+
+# ===================== ALL 模式 =====================
+
+def run_markets(stage: str, process_market, markets: list[str], **kwargs) -> list[dict]:
+    """并发运行所有市场，返回各市场摘要（按 markets 顺序）。"""
+    print(f"\n🚀 [{stage}] 并发运行 {len(markets)} 个市场: {', '.join(markets)}")
+    print(f"   日志目录: {LOG_DIR}")
+    started = time.time()
+
+    with multiprocessing.Manager() as manager:
+        lock, next_slot = manager.Lock(), manager.dict()
+        with ProcessPoolExecutor(max_workers=len(markets),
+                                 initializer=_init_worker,
+                                 initargs=(lock, next_slot)) as pool:
+            futures = {
+                pool.submit(_run_one, stage, code, process_market, kwargs): code
+                for code in markets
+            }
+            summaries = {}
+            for future in as_completed(futures):
+                code = futures[future]
+                try:
+                    summaries[code] = future.result()
+                except Exception as e:  # 子进程异常退出
+                    summaries[code] = {"market": code, "error": str(e)}
+                s = summaries[code]
+                icon = "❌" if s.get("error") else "✅"
+                print(f"  {icon} {code} 完成（{s.get('seconds', '?')}s）→ {s.get('log', '')}")
+
+    results = [summaries[code] for code in markets]
+    print_summary(stage, results, time.time() - started)
+    return results
+
+
+def print_summary(stage: str, results: list[dict], elapsed: float):
+    print(f"\n{'='*60}")
+    print(f"📊 [{stage}] 汇总（总耗时 {elapsed:.1f}s）")
+    print(f"{'='*60}")
+    for r in results:
+        extras = "  ".join(f"{k}={v}" for k, v in r.items()
+                           if k not in ("market", "seconds", "log", "error"))
+        status = f"❌ {r['error']}" if r.get("error") else "✅"
+        print(f"  {r['market']:<4} {r.get('seconds', '?'):>7}s  {status}  {extras}")
+    totals: dict[str, int] = {}
+    for r in results:
+        for k, v in r.items():
+            if k != "seconds" and isinstance(v, int) and not isinstance(v, bool):
+                totals[k] = totals.get(k, 0) + v
+    if totals:
+        print("  合计  " + "  ".join(f"{k}={v}" for k, v in totals.items()))
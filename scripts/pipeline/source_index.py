@@ -0,0 +1,114 @@
+"""
+source_index.py — L3 原文句校验的页面索引（03 用）
+
+原实现对页面上的每位高管都重新做一遍 " ".join(raw_text.split())，再线性查找子串，
+一页 n 位高管的校验代价是 O(n × 页面长度)。PageIndex 对每个页面只规范化一次空白
+（同时记录规范化位置 → 原文位置的映射），再把全部高管的查找键编成 Aho-Corasick 自动机，
+扫描页面一遍即可得到每个键首次出现的位置：
+
+    page = PageIndex(raw_text)
+    spans = page.find_all([e.get("_source_sentence") for e in executives])
+    # spans[i] = (原文起点, 原文终点) 或 None
+
+查找键与原实现相同：_source_sentence 规范化空白后的前 KEY_LEN 个字符，
+校验结果与 validate_source_in_raw 逐条一致。
+"""
+
+import re
+from array import array
+from collections import deque
+
+KEY_LEN = 60
+_TOKEN_RE = re.compile(r"\S+")
+
+
+def normalize_ws(text: str) -> str:
+    return " ".join(text.split())
+
+
+def search_key(source_sentence: str) -> str:
+    """_source_sentence 的查找键：规范化空白后的前 KEY_LEN 个字符。"""
+    return normalize_ws(source_sentence or "")[:KEY_LEN]
+
+
+class PageIndex:
+    """一个页面的规范化文本 + 位置映射；find_all 一遍扫描校验多个句子。"""
+
+    def __init__(self, raw_text: str):
+        parts, offsets = [], array("l")
+        for m in _TOKEN_RE.finditer(raw_text or ""):
+            if parts:
+                parts.append(" ")
+                offsets.append(m.start() - 1)   # 空白串折叠成的空格对应其最后一个空白字符
+            parts.append(m.group())
+            offsets.extend(range(m.start(), m.end()))
+        self.text = "".join(parts)      # == " ".join(raw_text.split())
+        self.offsets = offsets
+
+    def span(self, start: int, end: int) -> tuple[int, int]:
+        """规范化文本中的 [start, end) → 原文中的 [start, end)。"""
+        return self.offsets[start], self.offsets[end - 1] + 1
+
+    def find_all(self, sentences: list[str]) -> list[tuple[int, int] | None]:
+        """各句查找键在页面中首次出现的原文区间；键为空或未出现时为 None。"""
+        keys = [search_key(s) for s in sentences]
+        wanted = {k for k in keys if k}
+        found: dict[str, tuple[int, int]] = {}
+        if wanted and self.text:
+            automaton = _Automaton(wanted)
+            for start, end, key in automaton.scan(self.text):
+                if key not in found:
+                    found[key] = self.span(start, end)
+                    if len(found) == len(wanted):
+                        break
+        return [found.get(k) for k in keys]
+
+    def find(self, sentence: str) -> tuple[int, int] | None:
+        return self.find_all([sentence])[0]
+
+
+class _Automaton:
+    """Aho-Corasick：状态转移表 + 失败指针 + 输出链。"""
+
+    def __init__(self, keys):
+        self.goto: list[dict[str, int]] = [{}]
+        self.out: list[str | None] = [None]
+        self.fail: list[int] = [0]
+        self.dict_link: list[int] = [0]
+        for key in keys:
+            node = 0
+            for c in key:
+                nxt = self.goto[node].get(c)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][c] = nxt
+                    self.goto.append({})
+                    self.out.append(None)
+                    self.fail.append(0)
+                    self.dict_link.append(0)
+                node = nxt
+            self.out[node] = key
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, nxt in self.goto[node].items():
+                f = self.fail[node]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                link = self.fail[nxt] = self.goto[f].get(c, 0)
+                self.dict_link[nxt] = link if self.out[link] is not None else self.dict_link[link]
+                queue.append(nxt)
+
+    def scan(self, text: str):
+        """按终点顺序产出 (起点, 终点, 键)。"""
+        goto, fail, out, dict_link = self.goto, self.fail, self.out, self.dict_link
+        node = 0
+        for i, c in enumerate(text):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            hit = node if out[node] is not None else dict_link[node]
+            while hit:
+                key = out[hit]
+                yield i + 1 - len(key), i + 1, key
+                hit = dict_link[hit]
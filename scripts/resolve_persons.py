@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+resolve_persons.py — 跨公司的同一人识别（管道中 parse_bios 之前的 persons 阶段）
+
+高管以「姓名|公司」为键：同一人在集团和子公司都有职务、或同时出现在 HK / CN 两地时，
+会变成多个节点，也会被 LLM 重复解析。本阶段把这些键归并为人员，输出 person_ids.json：
+
+  {"version": 1, "persons": [{"id": 0, "keys": ["姓名|公司", ...]}, ...]}
+
+keys 的第一个是代表键（简介最长的一条）：parse_bios_llm.py 只解析代表键，
+mine_relationships.py 的同一人各节点共用代表键的 atom，并记录相同的 person_id。
+
+分块（blocking）：只有规范化姓名相同的键才会比较（繁简折叠、去空白和标点、拉丁字母转小写并按词排序），
+块内两两打分，不做全体两两比较：
+  出生年份   双方都能确定且不同 → 直接排除；相同 +2
+  任职交叉   一方简介提到另一方的公司（全称、canonical_names.json 中的简称、去掉「有限公司」等后缀）+2
+  共同履历   双方简介都提到的其他公司 +1 / 共同院校（--atoms 时）+1
+  简介相似   字符 bigram Jaccard ≥ 0.5 +2
+总分 ≥ MATCH_SCORE 的键按分数从高到低并入同一人（并查集）。合并前按整个集合检查：
+同一公司的两个键、出生年份不同的两个键不会经由第三个键间接并到一起。
+
+id 稳定：沿用上次 person_ids.json 中的 id（人员的各键中多数所属的旧 id，相同取小），
+新增人员从最大 id 往后编号。
+
+使用：
+    python3 scripts/resolve_persons.py            # 只用源数据简介中的信息
+    python3 scripts/resolve_persons.py --atoms    # 另用 bio_atoms.json 的出生年份和院校
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import combinations
+
+from mining.textkey import fold_text
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FILE = os.path.join(SCRIPT_DIR, "..", "..", "Actuary60", "00_全部数据.json")
+BIO_ATOMS_FILE = os.path.join(SCRIPT_DIR, "bio_atoms.json")
+CANONICAL_FILE = os.path.join(SCRIPT_DIR, "canonical_names.json")
+PERSONS_FILE = os.path.join(SCRIPT_DIR, "person_ids.json")
+
+MATCH_SCORE = 2
+BIO_SIMILARITY = 0.5
+COMPANY_SUFFIXES = ("股份有限公司", "有限责任公司", "有限公司", "公司", " Limited", " Ltd.", " Ltd")
+
+_BIRTH_PATTERNS = [
+    re.compile(r"(19[2-9]\d|200\d)\s*年\s*(?:\d{1,2}\s*月\s*)?(?:出生|生)"),
+    re.compile(r"(?:出生于|生于)\s*(19[2-9]\d|200\d)"),
+    re.compile(r"[Bb]orn\s+in\s+(19[2-9]\d|200\d)"),
+]
+_PUNCT = re.compile(r"[\s\.,·•・‧\-_'’()（）]+")
+
+
+def person_key(name: str, company: str) -> str:
+    return f"{name}|{company}"
+
+
+def normalize_name(name: str) -> str:
+    """分块用的规范化姓名（繁简折叠）：中文去空白和间隔号；拉丁字母转小写、按词排序（Wong Kam Fai = Kam Fai Wong）。"""
+    name = unicodedata.normalize("NFKC", fold_text(name or "")).strip()
+    if name.isascii():
+        return " ".join(sorted(t for t in _PUNCT.split(name.casefold()) if t))
+    return _PUNCT.sub("", name)
+
+
+def birth_year(bio: str) -> int | None:
+    for pattern in _BIRTH_PATTERNS:
+        m = pattern.search(bio)
+        if m:
+            return int(m.group(1))
+    return None
+
+
+def bigrams(text: str) -> set[str]:
+    text = _PUNCT.sub("", text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def company_aliases(companies, variant_map: dict[str, str]) -> dict[str, set[str]]:
+    """标准公司名 → 简介中可能出现的写法（全称、变体表简称、去掉后缀的名字）。"""
+    aliases = {c: {c} for c in companies}
+    for variant, canonical in variant_map.items():
+        if canonical in aliases and len(variant) >= 4:
+            aliases[canonical].add(variant)
+    for c in aliases:
+        for suffix in COMPANY_SUFFIXES:
+            if c.endswith(suffix) and len(c) - len(suffix) >= 4:
+                aliases[c].add(c[:-len(suffix)])
+                break
+    return aliases
+
+
+class _Candidate:
+    __slots__ = ("key", "name", "company", "bio", "order", "birth", "schools", "mentions", "grams")
+
+    def __init__(self, key, name, company, bio, order):
+        self.key, self.name, self.company, self.bio, self.order = key, name, company, bio, order
+        self.birth = None
+        self.schools: set[str] = set()
+        self.mentions: set[str] = set()
+        self.grams: set[str] = set()
+
+
+class PersonResolver:
+    """源数据 → 候选键 → 按规范化姓名分块 → 块内打分合并。"""
+
+    def __init__(self, raw: list, bio_atoms: dict | None = None, variant_map: dict | None = None):
+        self.bio_atoms = bio_atoms or {}
+        self.candidates: dict[str, _Candidate] = {}
+        for company in raw:
+            for e in company.get("executives", []):
+                name = (e.get("name") or "").strip()
+                if not name:
+                    continue
+                key = person_key(name, company["name"])
+                if key not in self.candidates:  # 同一公司重名条目与 parse_bios_llm 一致，以首条为准
+                    self.candidates[key] = _Candidate(key, name, company["name"],
+                                                      (e.get("bio") or "").strip(), len(self.candidates))
+        self.aliases = company_aliases({c.company for c in self.candidates.values()}, variant_map or {})
+        self.compared = 0
+
+    def blocks(self) -> list[list[_Candidate]]:
+        by_name = defaultdict(list)
+        for c in self.candidates.values():
+            by_name[normalize_name(c.name)].append(c)
+        return [block for block in by_name.values() if len({c.company for c in block}) > 1]
+
+    def _features(self, c: _Candidate, companies: set[str]):
+        atom = self.bio_atoms.get(c.key, {})
+        c.birth = (atom.get("identity") or {}).get("birth_year")
+        if not isinstance(c.birth, int):
+            c.birth = birth_year(c.bio)
+        c.schools = {edu["school"] for edu in atom.get("education", []) if edu.get("school")}
+        c.mentions = {other for other in companies
+                      if other != c.company and any(a in c.bio for a in self.aliases[other])}
+        c.grams = bigrams(c.bio)
+
+    def score(self, a: _Candidate, b: _Candidate) -> int:
+        """两个候选键为同一人的证据分；出生年份冲突返回 -1。"""
+        self.compared += 1
+        if a.birth and b.birth and a.birth != b.birth:
+            return -1
+        score = 2 if a.birth and a.birth == b.birth else 0
+        if b.company in a.mentions or a.company in b.mentions:
+            score += 2
+        if (a.mentions & b.mentions) - {a.company, b.company}:
+            score += 1
+        if a.schools & b.schools:
+            score += 1
+        if a.grams and b.grams and len(a.grams & b.grams) / len(a.grams | b.grams) >= BIO_SIMILARITY:
+            score += 2
+        return score
+
+    def resolve(self) -> list[list[str]]:
+        """返回人员列表（每人为键列表，代表键在前），按各人首个键的源数据顺序排列。"""
+        parent = {key: key for key in self.candidates}
+        # 各集合（以根为键）的公司与出生年份：合并是传递的，约束要按整个集合检查
+        companies = {key: {c.company} for key, c in self.candidates.items()}
+        births: dict[str, set[int]] = {key: set() for key in self.candidates}
+
+        def find(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        all_companies = set(self.aliases)
+        for block in self.blocks():
+            for c in block:
+                self._features(c, all_companies)
+                if c.birth:
+                    births[c.key] = {c.birth}
+            scored = []
+            for a, b in combinations(block, 2):
+                if a.company != b.company:
+                    score = self.score(a, b)
+                    if score >= MATCH_SCORE:
+                        scored.append((score, a.order, b.order, a.key, b.key))
+            # 证据强的先合并；两个集合含同一公司或出生年份冲突时不合并（A@X≈B@Y≈C@X 不会把 A、C 并成一人）
+            for *_, ka, kb in sorted(scored, key=lambda t: (-t[0], t[1], t[2])):
+                ra, rb = find(ka), find(kb)
+                if ra == rb or companies[ra] & companies[rb] or len(births[ra] | births[rb]) > 1:
+                    continue
+                parent[ra] = rb
+                companies[rb] |= companies.pop(ra)
+                births[rb] |= births.pop(ra)
+
+        members = defaultdict(list)
+        for key in self.candidates:
+            members[find(key)].append(self.candidates[key])
+        persons = []
+        for group in sorted(members.values(), key=lambda g: min(c.order for c in g)):
+            group.sort(key=lambda c: (-len(c.bio), c.order))
+            persons.append([c.key for c in group])
+        return persons
+
+
+def assign_ids(persons: list[list[str]], previous: dict[str, int]) -> list[dict]:
+    """沿用旧 id：各人取其键中多数所属的旧 id（相同取小），已被占用或没有旧 id 的新编号。"""
+    next_id = 1 + max(previous.values(), default=-1)
+    used, result = set(), []
+    for keys in persons:
+        votes = Counter(previous[k] for k in keys if k in previous)
+        pid = None
+        for old, _ in sorted(votes.items(), key=lambda kv: (-kv[1], kv[0])):
+            if old not in used:
+                pid = old
+                break
+        if pid is None:
+            pid, next_id = next_id, next_id + 1
+        used.add(pid)
+        result.append({"id": pid, "keys": keys})
+    return result
+
+
+class PersonIndex:
+    """person_ids.json 的读取端：「姓名|公司」→ 人员 id / 代表键。文件不存在时每个键自成一人。"""
+
+    def __init__(self, persons: list[dict] | None = None):
+        self.persons = persons or []
+        self.person_of: dict[str, int] = {}
+        self.representative_of: dict[str, str] = {}
+        for p in self.persons:
+            for key in p["keys"]:
+                self.person_of[key] = p["id"]
+                self.representative_of[key] = p["keys"][0]
+
+    @classmethod
+    def load(cls, path: str = PERSONS_FILE) -> "PersonIndex":
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f).get("persons", []))
+
+    def __len__(self) -> int:
+        return len(self.persons)
+
+    def person_id(self, key: str) -> int | None:
+        return self.person_of.get(key)
+
+    def representative(self, key: str) -> str:
+        return self.representative_of.get(key, key)
+
+    def is_alias(self, key: str) -> bool:
+        return self.representative(key) != key
+
+
+def main():
+    parser = argparse.ArgumentParser(description="跨公司同一人识别")
+    parser.add_argument("--source", default=SOURCE_FILE, help="源数据 00_全部数据.json")
+    parser.add_argument("--atoms", nargs="?", const=BIO_ATOMS_FILE, default=None,
+                        help="另用 bio_atoms.json 中的出生年份和院校（默认只用简介原文）")
+    parser.add_argument("--canonical", default=CANONICAL_FILE, help="canonical_names.json")
+    parser.add_argument("--out", default=PERSONS_FILE, help="输出 person_ids.json")
+    args = parser.parse_args()
+
+    with open(args.source, encoding="utf-8") as f:
+        raw = json.load(f)
+    bio_atoms = {}
+    if args.atoms and os.path.exists(args.atoms):
+        with open(args.atoms, encoding="utf-8") as f:
+            bio_atoms = json.load(f)
+    variant_map = {}
+    if os.path.exists(args.canonical):
+        with open(args.canonical, encoding="utf-8") as f:
+            variant_map = {k: v for k, v in json.load(f).get("companies", {}).items()
+                           if not k.startswith("_") and k != "说明"}
+
+    started = time.perf_counter()
+    resolver = PersonResolver(raw, bio_atoms, variant_map)
+    blocks = resolver.blocks()
+    persons = resolver.resolve()
+    previous = {key: p["id"] for p in PersonIndex.load(args.out).persons for key in p["keys"]}
+    doc = {"version": 1, "persons": assign_ids(persons, previous)}
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=1)
+
+    n = len(resolver.candidates)
+    merged = [p for p in doc["persons"] if len(p["keys"]) > 1]
+    all_pairs = n * (n - 1) // 2
+    print(f"候选键: {n}  分块: {len(blocks)} 个（{sum(len(b) for b in blocks)} 个键）  "
+          f"块内打分 {resolver.compared} 对（全体两两 {all_pairs} 对）")
+    print(f"人员: {len(doc['persons'])}  多节点人员: {len(merged)}（合并 {sum(len(p['keys']) for p in merged)} 个键）  "
+          f"{(time.perf_counter() - started)*1000:.0f}ms")
+    for p in merged[:10]:
+        print(f"  · #{p['id']}: {' / '.join(p['keys'])}")
+    print(f"已写出: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
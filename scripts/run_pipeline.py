@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+run_pipeline.py — 增量管道执行器（类 make）
+
+把 pipeline/01–04、resolve_persons.py、parse_bios_llm.py、mine_relationships.py、compute_layout.py 串成一张依赖图，
+每个阶段声明输入 / 输出文件，按输入指纹判断是否需要重跑：
+
+  · 输入文件（含阶段脚本本身）内容指纹与上次成功运行时一致、且输出齐全 → 跳过
+  · 否则重跑；上游重跑后下游在上游完成时重新比对指纹
+  · 各市场（HK / SG）的 01→02→03→04 链条、简介解析→关系挖掘链条互不依赖，并发执行
+  · 并发的各阶段进程共享 config.RATE_LIMITS 全局限速（PIPELINE_RATE_FILE）
+
+没有上游变化时整个刷新只需几秒（只做指纹比对，大文件按 size+mtime 缓存哈希）。
+
+用法:
+  python3 scripts/run_pipeline.py                  # 全部阶段，只跑有变化的
+  python3 scripts/run_pipeline.py --dry-run        # 只显示计划
+  python3 scripts/run_pipeline.py --market HK      # 只跑 HK 链条（及全局阶段）
+  python3 scripts/run_pipeline.py mine             # 只跑指定阶段（及其上游）
+  python3 scripts/run_pipeline.py --force 01       # 强制重跑匹配的阶段（前缀匹配）
+  python3 scripts/run_pipeline.py -j 2             # 最多 2 个阶段并行
+
+阶段日志: data/logs/run_{阶段}_{date}.log
+运行状态: data/pipeline_state.json
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR / "pipeline"))
+from config import DATA_DIR, MARKETS
+
+PIPELINE_DIR = SCRIPT_DIR / "pipeline"
+PUBLIC_DATA  = SCRIPT_DIR.parent / "public" / "data"
+SOURCE_FILE  = SCRIPT_DIR.parent.parent / "Actuary60" / "00_全部数据.json"
+STATE_FILE   = DATA_DIR / "pipeline_state.json"
+LOG_DIR      = DATA_DIR / "logs"
+RATE_FILE    = DATA_DIR / ".rate_limits.json"
+
+
+# ===================== 阶段定义 =====================
+# inputs 含阶段脚本及其依赖的本地模块：代码变化同样触发重跑。
+# 启动时按 import 语句核对（missing_inputs），漏列的本地模块直接报错退出。
+# 阶段间依赖由「A 的输入是 B 的输出」自动推导。
+
+def build_stages() -> list[dict]:
+    py = sys.executable
+    config = PIPELINE_DIR / "config.py"
+    parallel = PIPELINE_DIR / "parallel.py"
+    textkey = [SCRIPT_DIR / "mining" / "__init__.py", SCRIPT_DIR / "mining" / "textkey.py"]  # resolve_persons 用
+    stages = []
+    for m in MARKETS:
+        companies  = DATA_DIR / f"companies_{m}.json"
+        leadership = DATA_DIR / f"leadership_urls_{m}.json"
+        scraped    = DATA_DIR / f"scraped_{m}.json"
+        stages += [
+            {
+                # 源头阶段：监管机构页面在远端，只在首次 / 代码变化 / --force 时重跑
+                "name":    f"01:{m}",
+                "market":  m,
+                "cmd":     [py, PIPELINE_DIR / "01_find_companies.py", m],
+                "inputs":  [PIPELINE_DIR / "01_find_companies.py", config,
+                            PIPELINE_DIR / "checkpoint.py", parallel],
+                "outputs": [companies],
+            },
+            {
+                "name":    f"02:{m}",
+                "market":  m,
+                "cmd":     [py, PIPELINE_DIR / "02_find_leadership.py", m],
+                "inputs":  [PIPELINE_DIR / "02_find_leadership.py", config,
+                            PIPELINE_DIR / "checkpoint.py", parallel, companies],
+                "outputs": [leadership],
+            },
+            {
+                "name":    f"03:{m}",
+                "market":  m,
+                "cmd":     [py, PIPELINE_DIR / "03_scrape_bios.py", m],
+                "inputs":  [PIPELINE_DIR / "03_scrape_bios.py", config, PIPELINE_DIR / "checkpoint.py",
+                            parallel, PIPELINE_DIR / "source_index.py", leadership],
+                "outputs": [scraped, DATA_DIR / f"review_{m}.csv"],
+            },
+            {
+                # 上传没有本地输出，只靠指纹记录判断
+                "name":    f"04:{m}",
+                "market":  m,
+                "cmd":     [py, PIPELINE_DIR / "04_upload.py", m],
+                "inputs":  [PIPELINE_DIR / "04_upload.py", config, parallel, scraped],
+                "outputs": [],
+            },
+        ]
+    stages += [
+        {
+            # 同一人识别：只用源数据（不读 bio_atoms，否则与 parse_bios 成环）
+            "name":    "persons",
+            "market":  None,
+            "cmd":     [py, SCRIPT_DIR / "resolve_persons.py"],
+            "inputs":  [SCRIPT_DIR / "resolve_persons.py", *textkey, SCRIPT_DIR / "canonical_names.json",
+                        SOURCE_FILE],
+            "outputs": [SCRIPT_DIR / "person_ids.json"],
+        },
+        {
+            "name":    "parse_bios",
+            "market":  None,
+            "cmd":     [py, SCRIPT_DIR / "parse_bios_llm.py"],
+            "inputs":  [SCRIPT_DIR / "parse_bios_llm.py", SCRIPT_DIR / "incremental.py",
+                        SCRIPT_DIR / "resolve_persons.py", *textkey,
+                        SCRIPT_DIR / "person_ids.json", SOURCE_FILE],
+            "outputs": [SCRIPT_DIR / "bio_atoms.json"],
+        },
+        {
+            "name":    "mine",
+            "market":  None,
+            "cmd":     [py, SCRIPT_DIR / "mine_relationships.py"],
+            "inputs":  [SCRIPT_DIR / "mine_relationships.py", SCRIPT_DIR / "canonical_names.json",
+                        *sorted((SCRIPT_DIR / "mining").glob("*.py")),
+                        SCRIPT_DIR / "resolve_persons.py", SCRIPT_DIR / "person_ids.json",
+                        SCRIPT_DIR / "bio_atoms.json", SOURCE_FILE],
+            "outputs": [PUBLIC_DATA / "executives.json", PUBLIC_DATA / "relationships.json",
+                        PUBLIC_DATA / "relationships.mode.json", PUBLIC_DATA / "relationships.bin",
+                        PUBLIC_DATA / "groups.json",
+                        PUBLIC_DATA / "regions" / "manifest.json", PUBLIC_DATA / "ego" / "index.json",
+                        PUBLIC_DATA / "connections.bin", PUBLIC_DATA / "company_graph.json"],
+        },
+        {
+            "name":    "layout",
+            "market":  None,
+            "cmd":     [py, SCRIPT_DIR / "compute_layout.py"],
+            "inputs":  [SCRIPT_DIR / "compute_layout.py", SCRIPT_DIR / "mining" / "__init__.py",
+                        SCRIPT_DIR / "mining" / "artifacts.py", SCRIPT_DIR / "mining" / "edge_binary.py",
+                        PUBLIC_DATA / "executives.json", PUBLIC_DATA / "relationships.json"],
+            "outputs": [PUBLIC_DATA / "layout.json", PUBLIC_DATA / "layout.manifest.json",
+                        *(PUBLIC_DATA / "regions" / f"layout.{r}.json" for r in ("CN", "HK", "SG"))],
+        },
+    ]
+    # 推导依赖
+    producer = {str(out): s["name"] for s in stages for out in s["outputs"]}
+    for s in stages:
+        s["deps"] = sorted({producer[str(i)] for i in s["inputs"]
+                            if str(i) in producer and producer[str(i)] != s["name"]})
+    return stages
+
+
+def local_imports(script: Path) -> set[Path]:
+    """
+    脚本（传递地）导入的本地模块文件。模块按脚本所在目录解析（各阶段脚本都以自身目录为 sys.path[0]），
+    包模块同时计入包的 __init__.py；解析不到文件的（标准库、第三方）忽略。
+    """
+    root = script.parent
+    found, todo = set(), [script]
+    while todo:
+        tree = ast.parse(todo.pop().read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [a.name for a in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+            else:
+                continue
+            for name in names:
+                parts = name.split(".")
+                for i in range(1, len(parts) + 1):
+                    base = root.joinpath(*parts[:i])
+                    for path in (base / "__init__.py", base.with_suffix(".py")):
+                        if path.is_file() and path not in found:
+                            found.add(path)
+                            todo.append(path)
+    return found
+
+
+def missing_inputs(stages: list[dict]) -> dict[str, list[str]]:
+    """各阶段脚本导入、却未列入 inputs 的本地模块（代码变化不会触发重跑）。"""
+    result = {}
+    for s in stages:
+        script = Path(s["cmd"][1])
+        missing = local_imports(script) - {Path(p) for p in s["inputs"]}
+        if missing:
+            result[s["name"]] = sorted(str(p.relative_to(SCRIPT_DIR)) for p in missing)
+    return result
+
+
+# ===================== 指纹 =====================
+
+class Fingerprints:
+    """文件内容哈希，按 (size, mtime_ns) 缓存，未变化的大文件不重复读取。"""
+
+    def __init__(self, cache: dict):
+        self.cache = cache
+
+    def file(self, path: Path) -> str:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return "missing"
+        key = str(path)
+        stamp = [st.st_size, st.st_mtime_ns]
+        cached = self.cache.get(key)
+        if cached and cached["stamp"] == stamp:
+            return cached["sha"]
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        sha = h.hexdigest()[:16]
+        self.cache[key] = {"stamp": stamp, "sha": sha}
+        return sha
+
+    def inputs(self, stage: dict) -> str:
+        h = hashlib.sha256()
+        for p in stage["inputs"]:
+            h.update(f"{p}={self.file(Path(p))};".encode("utf-8"))
+        return h.hexdigest()[:16]
+
+
+def load_state() -> dict:
+    if STATE_FILE.exists():
+        return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    return {"stages": {}, "files": {}}
+
+
+def save_state(state: dict):
+    tmp = STATE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, STATE_FILE)
+
+
+def dirty_reason(stage: dict, state: dict, fp: Fingerprints, forced: bool) -> str | None:
+    """需要重跑的原因；最新返回 None。"""
+    if forced:
+        return "强制"
+    missing_inputs = [Path(p).name for p in stage["inputs"] if not Path(p).exists()]
+    if missing_inputs:
+        return f"缺少输入 {', '.join(missing_inputs)}"
+    if any(not Path(p).exists() for p in stage["outputs"]):
+        return "缺少输出"
+    record = state["stages"].get(stage["name"])
+    if not record:
+        return "从未运行"
+    if record["inputs"] != fp.inputs(stage):
+        return "输入变化"
+    return None
+
+
+# ===================== 执行 =====================
+
+def select_stages(stages: list[dict], targets: list[str], market: str | None) -> list[dict]:
+    by_name = {s["name"]: s for s in stages}
+    chosen = [s for s in stages if market is None or s["market"] in (None, market)]
+    if targets:
+        wanted, todo = set(), [s["name"] for s in chosen
+                               if any(s["name"].startswith(t) for t in targets)]
+        while todo:
+            name = todo.pop()
+            if name not in wanted:
+                wanted.add(name)
+                todo.extend(by_name[name]["deps"])
+        chosen = [s for s in chosen if s["name"] in wanted]
+    return chosen
+
+
+def run_stage(stage: dict) -> tuple[bool, float, Path]:
+    LOG_DIR.mkdir(exist_ok=True)
+    today = datetime.now(timezone.utc).strftime("%Y%m%d")
+    log_file = LOG_DIR / f"run_{stage['name'].replace(':', '_')}_{today}.log"
+    env = {**os.environ, "PIPELINE_RATE_FILE": str(RATE_FILE), "PYTHONUNBUFFERED": "1"}
+    started = time.time()
+    with log_file.open("a", encoding="utf-8") as log:
+        log.write(f"\n===== {datetime.now(timezone.utc).isoformat()} =====\n")
+        log.flush()
+        proc = subprocess.run([str(c) for c in stage["cmd"]], stdout=log,
+                              stderr=subprocess.STDOUT, env=env, cwd=SCRIPT_DIR)
+    return proc.returncode == 0, time.time() - started, log_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="增量管道执行器")
+    parser.add_argument("targets", nargs="*", help="只跑这些阶段（前缀匹配，如 03 / mine）及其上游")
+    parser.add_argument("--dry-run", action="store_true", help="只显示计划，不执行")
+    parser.add_argument("--market", help="只跑指定市场的链条（全局阶段照常）")
+    parser.add_argument("--force", action="append", default=[],
+                        help="强制重跑匹配的阶段（前缀匹配，可重复）")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="最多并行阶段数")
+    args = parser.parse_args()
+
+    market = args.market.upper() if args.market else None
+    all_stages = build_stages()
+    undeclared = missing_inputs(all_stages)
+    if undeclared:
+        for name, paths in undeclared.items():
+            print(f"  ❌ {name} 导入的本地模块未列入 inputs: {', '.join(paths)}")
+        sys.exit(1)
+    stages = select_stages(all_stages, args.targets, market)
+    by_name = {s["name"]: s for s in stages}
+    state = load_state()
+    fp = Fingerprints(state.setdefault("files", {}))
+
+    def forced(stage):
+        return any(stage["name"].startswith(f) for f in args.force)
+
+    # ── 计划：当前即过期的阶段 + 其下游（上游重跑后可能变化）────────
+    plan, will_run = [], set()
+    for s in stages:  # stages 已按拓扑顺序定义
+        reason = dirty_reason(s, state, fp, forced(s))
+        if reason is None and any(d in will_run for d in s["deps"]):
+            reason = "上游可能变化（届时重新比对）"
+        if reason:
+            will_run.add(s["name"])
+        plan.append((s, reason))
+
+    print(f"{'='*60}")
+    print(f"管道计划（{len(will_run)}/{len(stages)} 个阶段待运行）")
+    print(f"{'='*60}")
+    for s, reason in plan:
+        mark = "▶" if reason else "✓"
+        print(f"  {mark} {s['name']:<12} {reason or '最新，跳过'}")
+    if args.dry_run or not will_run:
+        save_state(state)
+        return
+
+    # ── 按依赖并发执行 ────────────────────────────────────
+    status: dict[str, str] = {}   # name → ok / skip / fail / blocked
+    started = time.time()
+    pending = [s["name"] for s in stages]
+    running = {}
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        while pending or running:
+            for name in list(pending):
+                s = by_name[name]
+                deps = [d for d in s["deps"] if d in by_name]
+                if any(status.get(d) in ("fail", "blocked") for d in deps):
+                    status[name] = "blocked"
+                    pending.remove(name)
+                    print(f"  ⛔ {name} 上游失败，跳过")
+                    continue
+                if any(d not in status for d in deps):
+                    continue
+                pending.remove(name)
+                # 上游完成后重新比对指纹：上游输出未变化则本阶段仍可跳过
+                reason = dirty_reason(s, state, fp, forced(s))
+                if reason is None:
+                    status[name] = "skip"
+                    continue
+                if reason.startswith("缺少输入"):
+                    status[name] = "fail"
+                    print(f"  ❌ {name} {reason}")
+                    continue
+                print(f"  ▶ {name} 开始（{reason}）")
+                running[pool.submit(run_stage, s)] = (name, fp.inputs(s))
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, inputs_fp = running.pop(future)
+                ok, seconds, log_file = future.result()
+                status[name] = "ok" if ok else "fail"
+                if ok:
+                    state["stages"][name] = {
+                        "inputs": inputs_fp,
+                        "finished_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                    save_state(state)
+                icon = "✅" if ok else "❌"
+                print(f"  {icon} {name} {seconds:.1f}s → {log_file.name}")
+
+    save_state(state)
+    counts = {k: sum(1 for v in status.values() if v == k)
+              for k in ("ok", "skip", "fail", "blocked")}
+    print(f"\n完成（{time.time() - started:.1f}s）：运行 {counts['ok']}  跳过 {counts['skip']}  "
+          f"失败 {counts['fail']}  受阻 {counts['blocked']}")
+    if counts["fail"] or counts["blocked"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+suggest_canonical.py — 发现 canonical_names.json 尚未收录的院校 / 公司名变体（MinHash + LSH）
+
+canonical_names.json 靠人工维护，漏收的变体会让 alumni / former 关系悄悄断开。本工具从
+bio_atoms.json 收集全部提取出的院校名（education[].school）和公司名（career / board_roles），
+找出彼此相似、且至少有一个尚未映射的名字簇，写出待审核的建议文件：
+
+  1. 规范化（textkey.normalize_key：繁简、全半角、大小写、标点），公司名去掉「股份有限公司」等通用后缀
+  2. 字符 shingle：含汉字的名字取 2-gram，纯拉丁字母取 3-gram；在本 section 超过 STOP_DF 比例的
+     名字中都出现的 shingle（「大学」「保险」「有限」）视为停用，不参与相似度
+  3. MinHash 签名（NUM_PERM 个哈希），LSH 分 BANDS 段，同段签名相同的名字进同一个桶
+     —— 只有同桶的名字才比较，近线性时间，不做全体两两比较
+  4. 候选对用 shingle 的精确 Jaccard 复核（≥ --threshold），得到每个名字的相似邻居
+
+每个未映射的名字在其相似邻居中选建议的规范名（不沿相似链传递，避免 A≈B≈C 把 A 指向 C）：
+已是规范名（canonical_names.json 的 value / 源数据公司名）的邻居优先，其次已映射邻居的规范名
+（相似度按变体与该规范名本身计算，经由的邻居记在 via），否则取出现次数比它多的邻居（相同取较长的）；
+它本身出现最多时不给建议（由邻居指向它）。只差开头一小段、两边各不相同的名字（南京 / 北京航空航天大学、
+首都 / 对外经济贸易大学、中国人寿 / 中国平安保险）是不同机构，不互为候选。
+
+输出 canonical_names.suggested.json，格式与 canonical_names.json 相同（可直接挑选条目合并），
+各 section 内按相似度降序、相同再按出现次数；_candidates 给出每条建议的依据（load_canonical 会忽略 _ 开头的 section）。
+经已映射邻居得到、但与规范名本身的相似度低于 --threshold 的建议不进各 section，单独列在 _below_threshold 供人工判断。
+
+使用：
+    python3 scripts/suggest_canonical.py
+    python3 scripts/suggest_canonical.py --threshold 0.6 --min-count 2
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+import zlib
+from collections import Counter, defaultdict
+from itertools import combinations
+
+from mining.textkey import normalize_key
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FILE = os.path.join(SCRIPT_DIR, "..", "..", "Actuary60", "00_全部数据.json")
+BIO_ATOMS_FILE = os.path.join(SCRIPT_DIR, "bio_atoms.json")
+CANONICAL_FILE = os.path.join(SCRIPT_DIR, "canonical_names.json")
+OUTPUT_FILE = os.path.join(SCRIPT_DIR, "canonical_names.suggested.json")
+
+NUM_PERM = 64
+BANDS = 16            # 每段 NUM_PERM / BANDS = 4 行；相似度约 (1/16)^(1/4) ≈ 0.5 起进入同一桶
+THRESHOLD = 0.5
+STOP_DF = 0.05        # shingle 出现在超过此比例的名字中即停用
+MAX_QUALIFIER = 4     # 只差开头不超过此长度的限定词（地名等）即视为不同机构
+MIN_LEN = 4           # 与 mine_relationships.py 的院校 / 公司名长度下限一致
+SEED = 42
+_PRIME = (1 << 61) - 1
+
+COMPANY_SUFFIXES = ("股份有限公司", "有限责任公司", "有限公司", "股份公司", "公司",
+                    "limited", "ltd", "co")
+
+
+def shingles(key: str) -> set[str]:
+    k = 3 if key.isascii() else 2
+    if len(key) <= k:
+        return {key}
+    return {key[i:i + k] for i in range(len(key) - k + 1)}
+
+
+def strip_suffix(key: str) -> str:
+    for suffix in COMPANY_SUFFIXES:
+        if key.endswith(suffix) and len(key) - len(suffix) >= 2:
+            return key[:-len(suffix)]
+    return key
+
+
+def name_key(name: str, is_company: bool) -> str:
+    key = normalize_key(name)
+    return strip_suffix(key) if is_company else key
+
+
+def stop_shingles(grams: dict[str, set[str]], stop_df: float = STOP_DF) -> set[str]:
+    df = Counter(g for gs in grams.values() for g in gs)
+    limit = max(2, stop_df * len(grams))
+    return {g for g, n in df.items() if n > limit}
+
+
+def drop_common(gs: set[str], stop: set[str]) -> set[str]:
+    """去掉停用 shingle；全部被停用的名字保留原 shingle。"""
+    return (gs - stop) or gs
+
+
+def different_qualifier(a: str, b: str) -> bool:
+    """两个规范化键去掉相同结尾后，剩下的开头都非空、互不相同且都不长：视为不同机构。"""
+    n = 0
+    while n < min(len(a), len(b)) and a[-1 - n] == b[-1 - n]:
+        n += 1
+    head_a, head_b = a[:len(a) - n], b[:len(b) - n]
+    return (n >= 2 and 0 < len(head_a) <= MAX_QUALIFIER and 0 < len(head_b) <= MAX_QUALIFIER
+            and not head_a.startswith(head_b) and not head_b.startswith(head_a))
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class MinHasher:
+    """NUM_PERM 个 (a·x + b) mod p 哈希；x 为 shingle 的 crc32。"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, grams: set[str]) -> tuple[int, ...]:
+        xs = [zlib.crc32(g.encode("utf-8")) for g in grams]
+        return tuple(min((a * x + b) % _PRIME for x in xs) for a, b in self.params)
+
+
+def lsh_pairs(signatures: dict[str, tuple], bands: int = BANDS):
+    """同一段签名相同的名字两两成为候选对（去重）。"""
+    rows = len(next(iter(signatures.values()))) // bands if signatures else 0
+    seen = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        lo = band * rows
+        for name, sig in signatures.items():
+            buckets[sig[lo:lo + rows]].append(name)
+        for members in buckets.values():
+            for pair in combinations(members, 2):
+                if pair not in seen:
+                    seen.add(pair)
+                    yield pair
+
+
+def collect_names(bio_atoms: dict) -> dict[str, Counter]:
+    names = {"schools": Counter(), "companies": Counter()}
+    for atom in bio_atoms.values():
+        for edu in atom.get("education", []):
+            school = (edu.get("school") or "").strip()
+            if len(school) >= MIN_LEN:
+                names["schools"][school] += 1
+        for step in atom.get("career", []) + atom.get("board_roles", []):
+            company = (step.get("company") or "").strip()
+            if len(company) >= MIN_LEN:
+                names["companies"][company] += 1
+    return names
+
+
+def suggest_section(counts: Counter, mapping: dict[str, str], canonical_names: set[str],
+                    is_company: bool, threshold: float, hasher: MinHasher) -> tuple[list[dict], list[dict], dict]:
+    """
+    返回 (建议列表, 弱建议列表, 统计)，均按相似度降序。弱建议：经已映射邻居得到、
+    但变体与规范名本身的 Jaccard 低于 threshold 的（如跨文字的「University of Singapore → 新加坡国立大学」）。
+    """
+    keys = {name: name_key(name, is_company) for name in counts}
+    grams = {name: shingles(key) for name, key in keys.items() if key}
+    stop = stop_shingles(grams)
+    grams = {name: drop_common(gs, stop) for name, gs in grams.items()}
+    signatures = {name: hasher.signature(g) for name, g in grams.items()}
+
+    n_candidates = n_verified = 0
+    neighbors: dict[str, list[tuple[float, str]]] = defaultdict(list)
+    for a, b in lsh_pairs(signatures):
+        n_candidates += 1
+        sim = jaccard(grams[a], grams[b])
+        if sim < threshold or different_qualifier(keys[a], keys[b]):
+            continue
+        n_verified += 1
+        neighbors[a].append((sim, b))
+        neighbors[b].append((sim, a))
+
+    def rank(item):
+        sim, name = item
+        return sim, counts[name], len(name), name
+
+    suggestions, weak = [], []
+    for name, near in neighbors.items():
+        if name in mapping or name in canonical_names:
+            continue
+        via = None
+        anchors = [(sim, m) for sim, m in near if m in canonical_names]
+        if anchors:
+            sim, target = max(anchors, key=rank)
+        elif any(m in mapping for _, m in near):
+            _, via = max(((sim, m) for sim, m in near if m in mapping), key=rank)
+            target = mapping[via]
+            target_key = name_key(target, is_company)
+            if not target_key or different_qualifier(keys[name], target_key):
+                continue
+            sim = jaccard(grams[name], drop_common(shingles(target_key), stop))
+        else:
+            sim, target = max(near, key=lambda item: (counts[item[1]], len(item[1]), item[0], item[1]))
+            if (counts[target], len(target)) <= (counts[name], len(name)):
+                continue
+        if target == name:
+            continue
+        (suggestions if sim >= threshold else weak).append({
+            "variant":    name,
+            "canonical":  target,
+            "similarity": round(sim, 3),
+            "count":      counts[name],
+            **({"via": via} if via else {}),
+            "neighbors":  [m for _, m in sorted(near, key=rank, reverse=True)],
+        })
+    for group in (suggestions, weak):
+        group.sort(key=lambda s: (-s["similarity"], -s["count"], s["variant"]))
+    n = len(grams)
+    stats = {"names": n, "candidates": n_candidates, "verified": n_verified,
+             "all_pairs": n * (n - 1) // 2, "suggestions": len(suggestions), "weak": len(weak)}
+    return suggestions, weak, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="发现 canonical_names.json 未收录的名称变体")
+    parser.add_argument("--atoms", default=BIO_ATOMS_FILE, help="bio_atoms.json")
+    parser.add_argument("--source", default=SOURCE_FILE, help="源数据 00_全部数据.json（公司规范名）")
+    parser.add_argument("--canonical", default=CANONICAL_FILE, help="canonical_names.json")
+    parser.add_argument("--out", default=OUTPUT_FILE, help="输出建议文件")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help=f"Jaccard 下限（默认 {THRESHOLD}）")
+    parser.add_argument("--min-count", type=int, default=1, help="变体至少出现的次数")
+    args = parser.parse_args()
+
+    with open(args.atoms, encoding="utf-8") as f:
+        bio_atoms = json.load(f)
+    canonical = {}
+    if os.path.exists(args.canonical):
+        with open(args.canonical, encoding="utf-8") as f:
+            canonical = json.load(f)
+    source_companies = set()
+    if os.path.exists(args.source):
+        with open(args.source, encoding="utf-8") as f:
+            source_companies = {c["name"] for c in json.load(f)}
+
+    started = time.perf_counter()
+    names = collect_names(bio_atoms)
+    hasher = MinHasher()
+    doc = {"_comment": "suggest_canonical.py 生成的待审核变体建议，格式同 canonical_names.json；"
+                       "确认后把条目合并进对应 section。各 section 按相似度降序、相同再按出现次数。"}
+    details, weak_details = [], []
+    for section, counts in names.items():
+        mapping = {k: v for k, v in canonical.get(section, {}).items()
+                   if not k.startswith("_") and k != "说明"}
+        canonical_names = set(mapping.values())
+        if section == "companies":
+            canonical_names |= source_companies
+        suggestions, weak, stats = suggest_section(counts, mapping, canonical_names,
+                                             section == "companies", args.threshold, hasher)
+        suggestions = [s for s in suggestions if s["count"] >= args.min_count]
+        weak = [s for s in weak if s["count"] >= args.min_count]
+        doc[section] = {"说明": f"{len(suggestions)} 条建议（key=变体, value=建议的标准名称）"}
+        doc[section].update((s["variant"], s["canonical"]) for s in suggestions)
+        details += [{"section": section, **s} for s in suggestions]
+        weak_details += [{"section": section, **s} for s in weak]
+        print(f"{section}: {stats['names']} 个不同名称，LSH 候选 {stats['candidates']} 对"
+              f"（全体两两 {stats['all_pairs']} 对），Jaccard ≥ {args.threshold} 的 {stats['verified']} 对，"
+              f"建议 {len(suggestions)} 条（另有经已映射邻居、与规范名相似度低于阈值的 {len(weak)} 条，见 _below_threshold）")
+        for s in suggestions[:8]:
+            via = f"，经 {s['via']}" if "via" in s else ""
+            print(f"  · {s['variant']} → {s['canonical']}  ({s['count']} 次，相似度 {s['similarity']}{via})")
+    doc["_candidates"] = details
+    doc["_below_threshold"] = weak_details
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=2)
+    print(f"耗时 {(time.perf_counter() - started)*1000:.0f}ms")
+    print(f"已写出: {args.out}")
+
+
+if __name__ == "__main__":
+    main()